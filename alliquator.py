@@ -71,6 +71,10 @@ import alliquator_systems as aq_sy
 System = aq_sy.System
 Sy = System
 
+import alliquator_sketches as aq_sk
+Sketch = aq_sk.Sketch
+Sk = Sketch
+
 # welcome
 print(' ')
 print('                          />')
@@ -84,7 +88,6 @@ print(' ')
 
 
 # left:
-# solve quartic
 # revise readibility
 # demo?
 
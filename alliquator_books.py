@@ -9,6 +9,9 @@ sqrt = math.sqrt
 # import plotting
 import matplotlib.pyplot as plt
 
+# import numpy
+import numpy as np
+
 # import results
 import alliquator_results as aq_re
 Re = aq_re.Result
@@ -37,7 +40,10 @@ class Book(list):
 			axis: string, independent variable
 			inputs: dictionary mapping variables to values
 			name: string, name for results
+			points: array of complex numbers, the axis points, if bound from arrays
+			residuals: two dimensional array of floats, the modulus of the equation at each result, if crisped as arrays
 			source: string, expression from which evaluation is made
+			values: two dimensional array of complex numbers, the results on each page, if bound from arrays
 
 		"""
 		
@@ -88,8 +94,61 @@ class Book(list):
 		# assign to inputs
 		self.inputs = c
 		
+		# no arrays
+		self.points = None
+		self.values = None
+		self.residuals = None
+		
 		
 	# static methods
+	@staticmethod
+	def _bind(x,p,v,n=None,s=None,u=None):
+		"""Bind arrays of points and values into a Book instance.
+		
+		Arguments:
+			x: string, independent variable
+			p: array of complex numbers, the points
+			v: array of complex numbers, the values, one row per point
+			n=None: string, name of results
+			s=None: string, expression from which evaluations were made
+			u=None: dictionary mapping variables to their values, either common numbers or arrays with one value per point
+			
+		Returns:
+			Book instance
+			
+		Notes:
+			The pages are built directly, without searching them for common attributes, and the arrays are kept in the points and values attributes.
+		"""
+		
+		# split common inputs from those varying by point
+		if u is None:
+			u = {}
+		c = {k: i for k,i in u.items() if not isinstance(i,np.ndarray)}
+		a = [(k,i.tolist()) for k,i in u.items() if isinstance(i,np.ndarray)]
+		
+		# one row per point
+		p = np.asarray(p,dtype=complex)
+		v = np.asarray(v,dtype=complex).reshape(len(p),-1)
+		
+		# make pages
+		b = Bo()
+		for m,(i,j) in enumerate(zip(p.tolist(),v.tolist())):
+			d = dict(c)
+			d[x] = Re(i)
+			for k,h in a:
+				d[k] = Re(h[m])
+			b.append(Pa(j,n,s,d))
+			
+		# attributes
+		b.axis = x
+		b.name = n
+		b.source = s
+		b.inputs = c
+		b.points = p
+		b.values = v
+		
+		return b
+	
 	@staticmethod
 	def _flatten(l):
 		"""Calculate the total flatness from a list of lists of curvatures.
@@ -118,6 +177,58 @@ class Book(list):
 			f += 1.0 / (10.0 + u.imag)
 			
 		return f
+	
+	@staticmethod
+	def _permute(g,t):
+		"""Choose the permutations of a page worth trying when sorting solutions into branches.
+		
+		Arguments:
+			g: Page instance
+			t: list of arrays of complex numbers, predictions for the page from its neighbors
+			
+		Returns:
+			list of tuples of integers, permutations, with the identity last
+			
+		Notes:
+			With three solutions or fewer, every permutation in Result.permutations is tried.  With more, trying all of them grows factorially, so the page is instead matched to each prediction, nearest pairs first, and only those matchings and the identity are tried.
+		"""
+		
+		# try every permutation of few solutions
+		l = len(g)
+		if l < len(Re.permutations):
+			p = Re.permutations[l][::-1]
+			
+			return p
+		
+		# solutions
+		r = np.array(g,dtype=complex)
+		
+		# match to each prediction
+		p = []
+		for i in t:
+			
+			# distances between all pairs, large but finite where undefined
+			d = np.abs(np.asarray(i,dtype=complex)[:,None] - r[None,:])
+			d[~np.isfinite(d)] = np.finfo(float).max
+			
+			# take nearest pair, and remove both from further matching
+			m = [0] * l
+			for n in range(l):
+				j,k = np.unravel_index(np.argmin(d),d.shape)
+				m[j] = int(k)
+				d[j,:] = np.inf
+				d[:,k] = np.inf
+				
+			# keep new matchings
+			m = tuple(m)
+			if m not in p:
+				p.append(m)
+				
+		# identity last
+		e = tuple(range(l))
+		p = [i for i in p if i != e] + [e]
+		
+		return p
 		
 	# instance methods
 	def __pos__(self):
@@ -155,6 +266,9 @@ class Book(list):
 			
 		Returns:
 			Book instance
+			
+		Notes:
+			The points, values and residuals arrays are left out, as the pages of the copy may be rearranged without them.
 		"""
 		
 		# copy each page
@@ -453,15 +567,10 @@ class Book(list):
 			
 		Notes:
 			Hone may need to be performed twice, because the first pass may make available flatter options for the second pass.
+			
+			With more than three solutions, only the permutations matching each page to its neighbors are tried, as described in _permute.
 		"""
 		
-		# pick permutation
-		p = Re.permutations[len(self[0])]
-		p = p[:]
-		
-		# reverse to restore on last permutation
-		p.reverse()
-		
 		# copy the book
 		c = self.copy()
 		
@@ -479,6 +588,14 @@ class Book(list):
 			if n < l - 1:
 				h = c[n + 1].copy()
 				
+			# predict page from the one before, and from the line through the two before
+			t = [np.array(c[n - 1],dtype=complex)]
+			if n > 1:
+				t.append(2 * t[0] - np.array(c[n - 2],dtype=complex))
+				
+			# pick permutations, the identity last to restore the page
+			p = Bo._permute(g,t)
+				
 			# for every permutation
 			q = []
 			for j in p:
@@ -531,6 +648,10 @@ class Book(list):
 			# store page at index
 			g = c[n].copy()
 				
+			# predict page from the midpoint of its neighbors
+			t = [(np.array(c[n - 1],dtype=complex) + np.array(c[n + 1],dtype=complex)) / 2]
+			p = Bo._permute(g,t)
+				
 			# for every permutation
 			q = []
 			for j in p:
@@ -581,6 +702,9 @@ class Book(list):
 			
 		Returns:
 			Page instance
+			
+		Notes:
+			The pages are taken to be at the midpoints of evenly spaced steps, as made by draw, so that dx is the distance from the first point to the last divided by one less than the number of points.
 		"""
 		
 		# get axis
@@ -589,14 +713,20 @@ class Book(list):
 			print('No dependent variable defined.  Integration aborted.\n')
 			
 			return None
+			
+		# need two points for dx
+		l = len(self)
+		if l < 2:
+			print('Too few points to find dx.  Integration aborted.\n')
+			
+			return None
 		
 		# calculate dx from beginning and end
 		z = Re(0)
 		p = [i.inputs.get(a,z) for i in self]
 		b = Re(p[0])
 		e = Re(p[-1])
-		l = len(self)
-		d = b.subtract(e).divide(l)
+		d = e.subtract(b).divide(l - 1)
 		
 		# transpose data
 		t = [i for i in zip(*self)]
@@ -41,6 +41,10 @@ Eq = aq_eq.Equation
 import alliquator_groups as aq_gr
 Gr = aq_gr.Group
 
+# import sketches
+import alliquator_sketches as aq_sk
+Sk = aq_sk.Sketch
+
 
 # Chain, a specialized group 
 class Chain(Gr):
@@ -194,7 +198,7 @@ class Chain(Gr):
 		
 		return r
 		
-	def integrate(self,*g,**f):
+	def integrate(self,*g,_tolerance=None,**f):
 		"""Integrate a plot of the expressions after solving.
 		
 		Arguments:
@@ -207,19 +211,72 @@ class Chain(Gr):
 				5) boolean, view graph?, defaults to True.
 				6) boolean, crisp solutions?, defaults to False
 				
+			_tolerance=None: float, tolerance for adaptive integration, named apart from the variables as for Expression.integrate
+			
 			**f: unpacked dictionary variables mapped to numbers or function objects
 			
 		Returns:
 			Book instance
+			
+		Notes:
+			Given a tolerance, every branch of every expression is integrated adaptively by Gauss-Kronrod quadrature, sampling the chain at the quadrature points, and no graph is drawn.  The estimated errors are kept in the errors attribute of each page.
 		"""
 		
-		# perform draw
-		d = self.draw(*g,**f)
+		# distil booleans
+		o = g
+		g,u = Ex._distil(g)
+		
+		# check for solving variable
+		v = None
+		x = g[0]
+		if len(g) > 1 and isinstance(g[1],str):
+			v = g[0]
+			x = g[1]
+			g = g[1:]
+			
+		# get limits and tolerance
+		a,b,n = Ex._bounds(g[1:])
+		t = _tolerance
+		
+		# without tolerance or solving variable, perform draw
+		if t is None or not v:
+			d = self.draw(*o,**f)
+			
+			# integrate
+			t = d.integrate()
+			
+			return t
+			
+		# sample at the left limit for the names and branches of each book
+		c = (True,) if True in u else ()
+		s = self.sample(v,x,[a],*c,**f)
+		m = [len(i[0]) for i in s]
+		
+		# sample at an array of points, with all branches side by side
+		def h(p):
+			r = self.sample(v,x,p.tolist(),*c,**f)
+			
+			return [[complex(k) for i in r for k in i[j]] for j in range(len(p))]
+			
+		# integrate adaptively
+		p = Ex._quadrature(h,a,b,t,f)
 		
-		# integrate
-		t = d.integrate()
+		# split into a page for each book
+		r = []
+		j = 0
+		for i,k in zip(s,m):
+			q = p.slash(*range(j,j + k))
+			j += k
+			
+			# attributes
+			n = i.name
+			if n:
+				n = 'I (' + n + ') d' + x
+			q.name = n
+			q.source = i.source
+			r.append(q)
 		
-		return t
+		return Bo(r,x)
 	
 	def sample(self,*a,**f):
 		"""Sample the chain at every point given, first solving the top equation and propagating the solutions through the rest of the expressions.
@@ -300,6 +357,9 @@ class Chain(Gr):
 		# go through all other expressions
 		for i in self[1:]:
 			
+			# binding plan, made at first point
+			r = None
+			
 			# for each page in first book
 			b = []
 			for m,j in enumerate(t):
@@ -318,7 +378,9 @@ class Chain(Gr):
 						f[e] = l[m][n]
 						
 					# evaluate
-					d = Ex._reckon(f,x,p[m],y,q)
+					if r is None:
+						r = Ex._plan(f,x,p[m],y,q)
+					d = Ex._apply(r,f,x,p[m],y,q)
 					u = i.evaluate(**d)
 					g.append(u)
 					
@@ -429,6 +491,9 @@ class Chain(Gr):
 		# for each expression thereafter
 		for i in self[1:]:
 			
+			# binding plan, made at first point
+			r = None
+			
 			# calculate a new shelf from each book
 			h = []
 			for m,j in enumerate(t):
@@ -455,7 +520,9 @@ class Chain(Gr):
 							f[e.name] = e[m][n][o]
 						
 						# evaluate
-						d = Ex._reckon(f,x,a,y,w)
+						if r is None:
+							r = Ex._plan(f,x,a,y,w)
+						d = Ex._apply(r,f,x,a,y,w)
 						d = i.evaluate(**d)
 						p.append(d)
 					
@@ -493,6 +560,42 @@ class Chain(Gr):
 					
 		return c
 		
+	def sketch(self):
+		"""Sketch each expression in the chain, with the expressions above it substituted for their names.
+		
+		Arguments:
+			None
+			
+		Returns:
+			list of Sketch instances
+			
+		Notes:
+			Each substitution is recorded rather than expanded, so an expression far down a long chain is described in terms of the variables of the top equation without multiplying out the ones above it.  Parts shared between expressions are sketched once.
+			
+			The sketches may be compiled or sampled directly, or expanded into Expressions when needed.  Expressions without a name are not substituted.
+			
+		Examples:
+			If the chain holds (a^2 x - 1) = 0, then b = a + x, then c = b^2:
+				
+				s = chain.sketch()
+				
+			s[2] records (b^2)[b = (a + x)], and s[2].sample('x',[1,2],a=1) evaluates it without expanding.
+		"""
+		
+		# sketch each expression in turn
+		s = []
+		for i in self:
+			k = Sk(i)
+			
+			# substitute sketches above for their names
+			for e,j in zip(self[1:],s[1:]):
+				if e.name:
+					k = k.substitute(j,e.name)
+					
+			s.append(k)
+					
+		return s
+		
 		
 # Abbreviation
 Ch = Chain
@@ -1,6 +1,9 @@
 # alliquator_equations.py
 # classes to manipulate algebraic expressions
 
+# import numpy
+import numpy as np
+
 # import results
 import alliquator_results as aq_re
 Re = aq_re.Result
@@ -93,6 +96,138 @@ class Equation(Ex):
 
 
 	# static methods
+	@staticmethod
+	def _aberth(c,z=None,w=False,n=64,r=1e-14):
+		"""Solve arrays of polynomial equations of any degree by the aberth-ehrlich method, converging all roots of each at once.
+		
+		Arguments:
+			c: list of arrays of complex numbers, the coefficients from the highest power down
+			z=None: two dimensional array of complex numbers, starting roots with one row per equation
+			w=False: boolean, warm start from neighboring equations?
+			n=64: integer, most iterations
+			r=1e-14: float, relative tolerance
+			
+		Returns:
+			two dimensional array of complex numbers, one row of arranged roots per equation
+			
+		Notes:
+			Each root z is stepped by w / (1 - w s), where w is the newton step p / p' and s is the sum of 1 / (z - y) over the other roots y.  The roots repel each other, so all converge together without deflation, and multiple roots are approached as closely as the precision allows.
+			
+			All equations are iterated at once, and each is dropped from the iteration once all its steps are finite and within the relative tolerance or the absolute tolerance of Result.  Equations still unconverged after the most iterations are solved instead as the eigenvalues of their companion matrices.
+			
+			Without starting roots, each equation is started cold on a circle around the centroid of its roots.  If warm starting is chosen, the equations are assumed to follow each other in order, as along sampling points: every few equations are started cold, and the rest are started from the roots of their neighbor halfway back to the last solved one, halving the spacing each round.  Only neighbors that converged are used, and the others are started cold.
+		"""
+		
+		# divide through by leading coefficient
+		c = np.array(c,dtype=complex)
+		m = len(c) - 1
+		with np.errstate(all='ignore'):
+			k = c[1:] / c[0]
+			
+		# no unknowns
+		x = np.full((c.shape[1],m),np.nan,dtype=complex)
+		if m < 1:
+			
+			return x
+			
+		# equations able to be solved
+		f = np.isfinite(k).all(axis=0)
+		
+		# angles around circle, offset to avoid symmetry with the coefficients
+		a = np.exp(1j * (2 * np.pi * np.arange(m) / m + 0.4))
+		
+		# iterate the given equations from the given starting roots
+		def iterate(j,x):
+			
+			# coefficients of equations
+			e = k[:,j]
+			
+			# nudge coincident starting roots apart
+			for i in range(1,m):
+				d = np.abs(x[:,i:] - x[:,:-i]) <= Re.tolerance * (1 + np.abs(x[:,i:]))
+				x[:,i:] = np.where(d,x[:,i:] + 1e-6 * (1 + np.abs(x[:,i:])) * a[i:],x[:,i:])
+				
+			# iterate equations still active
+			b = np.arange(len(j))
+			u = np.zeros(len(j),dtype=bool)
+			for h in range(n):
+				y = x[b]
+				
+				# evaluate monic polynomial and derivative by horner's method
+				p = np.ones(y.shape,dtype=complex)
+				q = np.zeros(y.shape,dtype=complex)
+				for g in e[:,b]:
+					q = q * y + p
+					p = p * y + g[:,None]
+					
+				# aberth step
+				with np.errstate(all='ignore'):
+					w = p / q
+					d = y[:,:,None] - y[:,None,:]
+					d[:,np.arange(m),np.arange(m)] = np.inf
+					s = (1 / d).sum(axis=2)
+					t = w / (1 - w * s)
+					t = np.where(p == 0,0,t)
+				f = np.isfinite(t)
+				x[b] = y - np.where(f,t,0)
+				
+				# drop converged equations
+				o = (f & (np.abs(t) <= Re.tolerance + r * np.abs(y))).all(axis=1)
+				u[b[o]] = True
+				b = b[~o]
+				if len(b) < 1:
+					break
+					
+			return x,u
+			
+		# cold start on circle of radius max |k_i|^(1/i) about centroid
+		def cold(j):
+			e = k[:,j]
+			u = -e[0] / m
+			with np.errstate(all='ignore'):
+				l = np.abs(e) ** (1 / np.arange(1,m + 1)[:,None])
+			l = l.max(axis=0) + 1
+			
+			return u[:,None] + l[:,None] * a
+			
+		# equations to solve, and whether each converged
+		i = np.arange(c.shape[1])[f]
+		g = np.zeros(c.shape[1],dtype=bool)
+		
+		# solve from given starting roots
+		if z is not None:
+			z = np.array(np.broadcast_to(z,x.shape),dtype=complex)
+			x[i],g[i] = iterate(i,z[i])
+			
+		# or cold start each equation
+		elif not w:
+			x[i],g[i] = iterate(i,cold(i))
+			
+		# or cold start every few equations
+		else:
+			v = 1
+			while v * 16 < len(i):
+				v *= 2
+			x[i[::v]],g[i[::v]] = iterate(i[::v],cold(i[::v]))
+			
+			# then warm start the rest from converged neighbors, halving spacing
+			while v > 1:
+				v //= 2
+				j = i[np.arange(v,len(i),2 * v)]
+				q = i[np.arange(0,len(i) - v,2 * v)]
+				s = np.where(g[q][:,None],x[q],cold(j))
+				x[j],g[j] = iterate(j,s)
+				
+		# solve unconverged equations by companion matrices
+		e = i[~g[i]]
+		if len(e) > 0:
+			x[e] = Eq._companions(list(c[:,e]))
+			
+		# arrange roots
+		x = Eq._rank(x)
+		
+		return x
+	
 	@staticmethod
 	def _arrange(s):
 		"""Arrange list of solutions in order of highest real part, or highest imaginary part for equal real parts.
@@ -141,6 +276,64 @@ class Equation(Ex):
 		
 		return l
 	
+	@staticmethod
+	def _companions(c,n=2):
+		"""Solve arrays of polynomial equations of any degree as the eigenvalues of their companion matrices.
+		
+		Arguments:
+			c: list of arrays of complex numbers, the coefficients from the highest power down
+			n=2: integer, number of newton steps to polish the roots
+			
+		Returns:
+			two dimensional array of complex numbers, one row of arranged roots per equation
+			
+		Notes:
+			The coefficients are divided by the leading one, and the companion matrices of all equations are stacked into one array, so that numpy solves them together.
+			
+			Each newton step is kept only where it lowers the modulus of the polynomial.
+		"""
+		
+		# divide through by leading coefficient
+		c = np.array(c,dtype=complex)
+		m = len(c) - 1
+		with np.errstate(all='ignore'):
+			k = c[1:] / c[0]
+			
+		# stack companion matrices, with ones below the diagonal and the negative coefficients along the top
+		a = np.zeros((c.shape[1],m,m),dtype=complex)
+		a[:,np.arange(1,m),np.arange(m - 1)] = 1
+		a[:,0,:] = -k.T
+		
+		# find eigenvalues where finite
+		x = np.full((c.shape[1],m),np.nan,dtype=complex)
+		f = np.isfinite(a).all(axis=(1,2))
+		x[f] = np.linalg.eigvals(a[f])
+		
+		# polish by newton's method
+		with np.errstate(all='ignore'):
+			for i in range(n):
+				
+				# evaluate polynomial and derivative by horner's method
+				p = np.zeros(x.shape,dtype=complex)
+				d = np.zeros(x.shape,dtype=complex)
+				for j in c:
+					d = d * x + p
+					p = p * x + j[:,None]
+					
+				# step where the derivative allows
+				y = np.where(d != 0,x - p / d,x)
+				
+				# keep improvements
+				q = np.zeros(x.shape,dtype=complex)
+				for j in c:
+					q = q * y + j[:,None]
+				x = np.where(np.abs(q) < np.abs(p),y,x)
+		
+		# arrange roots
+		x = Eq._rank(x)
+		
+		return x
+	
 	@staticmethod
 	def _cubic(a,b,c,d):
 		"""Solve a cubic equation of the form ax^3 + bx^2 + cx + d = 0
@@ -152,70 +345,142 @@ class Equation(Ex):
 			d: Result instance
 			
 		Returns:
-			Page instance
+			list of Result instances
 		"""
 		
-		# intermediates
-		# f = (2b^3 - 9abc + 27da^2) / 2
-		f = Li('b3 -9/2a b c + 27/2 d a2')
-		f = f.evaluate(a=a,b=b,c=c,d=d)
+		# solve as arrays of one point
+		x = Eq._cubics(*[np.array([complex(i)]) for i in (a,b,c,d)])
+		x = [Re(i) for i in x[0]]
 		
-		# g = (b^2 - 3ac)
-		g = Li('b2 -3a c')
-		g = g.evaluate(a=a,b=b,c=c)
-		
-		# h = sqrt(f^2 - g^3)
-		h = Li('f2 - g3')
-		h = h.evaluate(f=f,g=g)
-		h = h.root(2)
+		return x
 		
-		# k = f +/- h
-		o = [1,-1]
-		k = [h.scale(i).add(f) for i in o]
+	@staticmethod
+	def _cubics(a,b,c,d):
+		"""Solve arrays of cubic equations of the form ax^3 + bx^2 + cx + d = 0.
 		
-		# take cube roots, l = rt3(k)
-		l = [i.root(3) for i in k]
+		Arguments:
+			a: array of complex numbers
+			b: array of complex numbers
+			c: array of complex numbers
+			d: array of complex numbers
+			
+		Returns:
+			two dimensional array of complex numbers, one row of arranged roots per equation
+			
+		Notes:
+			Of the two cube roots in Cardano's formula, the larger is taken directly, choosing the sign of the square root so as not to subtract nearly equal numbers.  The smaller is found from their product, so the pairs are matched for all three cube roots of unity at once.
+			
+			A triple root makes both cube roots zero, leaving -b / 3a.
+		"""
 		
-		# three cubic roots of unity
-		# u = 1, (-1 +/- sqrt(3)) / 2
-		u = [Re(1.0)]
-		z = Re(3)
-		z = z.root(2).real
-		u.append(Re(-1.0 / 2.0, z / 2.0))
-		u.append(Re(-1.0 / 2.0, -z / 2.0))
+		# intermediates
+		# f = (2b^3 - 9abc + 27da^2) / 2
+		# g = (b^2 - 3ac)
+		f = b ** 3 - 4.5 * a * b * c + 13.5 * d * a ** 2
+		g = b ** 2 - 3 * a * c
 		
-		# cycle through cube roots of unity
-		m = [l[0].multiply(i) for i in u]
-		n = [l[1].multiply(i) for i in u]
+		# h = sqrt(f^2 - g^3), signed to align with f
+		h = np.sqrt(f ** 2 - g ** 3)
+		h = np.where((f.conjugate() * h).real < 0,-h,h)
 		
-		# roots line up in opposite directions, so reverse n.
-		n.reverse()
+		# larger cube root, l = rt3(f + h)
+		l = (f + h) ** (1.0 / 3.0)
 		
-		# m * n = g for the correct combos
-		# test first three values against m[0] and pick the one closest to g
-		w = [i.multiply(m[0]) for i in n]
-		s = [g.subtract(i) for i in w]
-		s = [i.modulus() for i in s]
-		j = s.index(min(s))
+		# three cube roots of unity
+		# u = 1, (-1 +/- sqrt(3)) / 2
+		u = np.array([1.0,complex(-0.5,np.sqrt(3) / 2),complex(-0.5,-np.sqrt(3) / 2)])
 		
-		# double n to wrap sequence around, and pick three members beginning at j
-		n = n * 2
-		p = n[j:j + 3]
+		# cycle through cube roots of unity, pairing so that m * n = g
+		m = l[:,None] * u
+		with np.errstate(all='ignore'):
+			n = np.where(m == 0,0,g[:,None] / m)
 			
-		# add pairs together
-		q = [i.add(j) for i,j in zip(m,p)]
-		
 		# finish roots
-		# r = -1 / 3a
-		# x = r * (q + b)
-		r = Re(-1.0 / 3.0).divide(a)
-		x = [i.add(b).multiply(r) for i in q]
+		# x = -(m + n + b) / 3a
+		with np.errstate(all='ignore'):
+			x = -(m + n + b[:,None]) / (3 * a[:,None])
 		
 		# arrange roots
-		x = Eq._arrange(x)
+		x = Eq._rank(x)
 		
 		return x
 	
+	@staticmethod
+	def _halley(e,x,v,n=32,r=1e-14):
+		"""Make a function to crisp arrays of roots by halley's method.
+		
+		Arguments:
+			e: Expression instance
+			x: string, variable solved for
+			v: list of strings, the other variables in order of the function's arguments
+			n=32: integer, most iterations
+			r=1e-14: float, relative tolerance
+			
+		Returns:
+			function object
+			
+		Notes:
+			The expression and its first two derivatives are compiled once.  The function takes a two dimensional array of roots, one row per point, followed by one number or array of numbers per variable, and returns the crisped roots together with the modulus of the expression at each.
+			
+			All roots at all points are iterated together, and each is dropped from the iteration once its step is within the relative tolerance or the absolute tolerance of Result, or once the expression vanishes.  The root giving the smallest modulus is kept, so a root that wanders or stalls falls back on its best value.
+		"""
+		
+		# compile expression and first two derivatives, with x first
+		w = [x] + list(v)
+		d = e.derive(x)
+		f = e.compile(*w)
+		g = d.compile(*w)
+		h = d.derive(x).compile(*w)
+		
+		# crisping function
+		def crisp(s,*a):
+			
+			# flatten roots, with inputs repeated for each root at a point
+			s = np.array(s,dtype=complex)
+			z = s.ravel()
+			a = [np.broadcast_to(np.asarray(i,dtype=complex).reshape(-1,1),s.shape).ravel() for i in a]
+			
+			# best roots and their moduli
+			b = z.copy()
+			o = np.full(z.shape,np.inf)
+			
+			# iterate roots still active
+			j = np.arange(len(z))
+			for k in range(n + 1):
+				y = z[j]
+				u = [i[j] for i in a]
+				
+				# evaluate expression
+				with np.errstate(all='ignore'):
+					p = np.broadcast_to(f(y,*u),y.shape)
+				m = np.abs(p)
+				
+				# keep best
+				c = m < o[j]
+				b[j[c]] = y[c]
+				o[j[c]] = m[c]
+				
+				# stop at last evaluation
+				if k == n or len(j) < 1:
+					break
+					
+				# halley step: 2 f f' / (2 f'^2 - f f''), or newton step if that fails
+				with np.errstate(all='ignore'):
+					q = np.broadcast_to(g(y,*u),y.shape)
+					l = np.broadcast_to(h(y,*u),y.shape)
+					t = 2 * p * q / (2 * q * q - p * l)
+					t = np.where(np.isfinite(t),t,p / q)
+				t = np.where(np.isfinite(t),t,0)
+				z[j] = y - t
+				
+				# drop converged roots
+				c = (np.abs(t) <= Re.tolerance + r * np.abs(y)) | (m == 0)
+				j = j[~c]
+				
+			return b.reshape(s.shape),o.reshape(s.shape)
+			
+		return crisp
+	
 	@staticmethod
 	def _linear(a,b):
 		"""Solve a linear equation of the form ax + b = 0.
@@ -232,6 +497,50 @@ class Equation(Ex):
 		s = b.scale(-1).divide(a)
 		
 		return Pa([s])
+		
+	@staticmethod
+	def _linears(a,b):
+		"""Solve arrays of linear equations of the form ax + b = 0.
+		
+		Arguments:
+			a: array of complex numbers
+			b: array of complex numbers
+			
+		Returns:
+			two dimensional array of complex numbers, one row per equation
+		"""
+		
+		# solution: x = -B / A
+		with np.errstate(all='ignore'):
+			x = (-b / a)[:,None]
+		
+		return x
+	
+	@staticmethod
+	def _match(p,r):
+		"""Match roots to predicted roots, nearest pairs first.
+		
+		Arguments:
+			p: array of complex numbers, predicted roots
+			r: array of complex numbers, roots
+			
+		Returns:
+			array of complex numbers, the roots in order of the predictions
+		"""
+		
+		# distances between all pairs
+		d = np.abs(p[:,None] - r[None,:])
+		d[~np.isfinite(d)] = np.inf
+		
+		# take nearest pair, and remove both from further matching
+		m = np.zeros(len(p),dtype=int)
+		for i in range(len(p)):
+			j,k = np.unravel_index(np.argmin(d),d.shape)
+			m[j] = k
+			d[j,:] = np.inf
+			d[:,k] = np.inf
+			
+		return r[m]
 	
 	@staticmethod
 	def _quadratic(a,b,c):
@@ -243,30 +552,76 @@ class Equation(Ex):
 			c: Result instance
 			
 		Returns:
-			Page instance.
+			list of Result instances
 		"""
 		
-		# intermediates
-		# f = -b / 2
-		# g = f^2 -ac
-		# h = sqrt(g)
-		f = Li('-1/2b')
-		f = f.evaluate(b=b)
-		g = Li('f2 - a c')
-		g = g.evaluate(a=a,c=c,f=f)
-		h = g.root(2)
+		# solve as arrays of one point
+		x = Eq._quadratics(*[np.array([complex(i)]) for i in (a,b,c)])
+		x = [Re(i) for i in x[0]]
+			
+		return x
+		
+	@staticmethod
+	def _quadratics(a,b,c):
+		"""Solve arrays of quadratic equations of the form ax^2 + bx + c = 0.
+		
+		Arguments:
+			a: array of complex numbers
+			b: array of complex numbers
+			c: array of complex numbers
+			
+		Returns:
+			two dimensional array of complex numbers, one row of arranged roots per equation
+			
+		Notes:
+			The larger root is found from q = -(b +/- sqrt(b^2 - 4ac)) / 2, choosing the sign so as not to subtract nearly equal numbers, and the smaller from their product, c / a.
+		"""
+		
+		# h = sqrt(b^2 - 4ac), signed to align with b
+		h = np.sqrt(b ** 2 - 4 * a * c)
+		h = np.where((b.conjugate() * h).real < 0,-h,h)
+		
+		# q = -(b + h) / 2
+		q = -(b + h) / 2
 		
 		# solutions
-		# x = (f +/- h) / a
-		o = [1,-1]
-		x = [h.scale(i).add(f) for i in o]
-		x = [i.divide(a) for i in x]
+		# x = q / a, c / q
+		with np.errstate(all='ignore'):
+			x = np.stack([q / a,np.where(q == 0,0,c / q)],axis=1)
 		
 		# arrange roots
-		x = Eq._arrange(x)
+		x = Eq._rank(x)
 			
 		return x
 		
+	@staticmethod
+	def _rank(x):
+		"""Rank rows of solutions as by _arrange, highest real part first, then highest imaginary part for equal real parts.
+		
+		Arguments:
+			x: two dimensional array of complex numbers
+			
+		Returns:
+			two dimensional array of complex numbers
+		"""
+		
+		# sort each row according to real part
+		j = np.argsort(x.real,axis=1,kind='stable')
+		x = np.take_along_axis(x,j,axis=1)
+		
+		# number partials of roughly equal real parts
+		d = np.abs(np.diff(x.real,axis=1)) >= Re.tolerance
+		p = np.concatenate([np.zeros((len(x),1),dtype=int),np.cumsum(d,axis=1)],axis=1)
+		
+		# sort by partial, then imaginary part
+		j = np.lexsort((x.imag,p),axis=-1)
+		x = np.take_along_axis(x,j,axis=1)
+		
+		# reverse for largest first
+		x = x[:,::-1]
+		
+		return x
+		
 		
 	# instance methods
 	def assimilate(self,*g,**f):
@@ -305,7 +660,7 @@ class Equation(Ex):
 		return t
 	
 	def crisp(self,*a,**d):
-		"""Crisp the solutions by correcting for numerical instability using newton's method.
+		"""Crisp the solutions by correcting for numerical instability using halley's method.
 		
 		Arguments:
 			*a: unpacked tuple of *args:
@@ -315,44 +670,31 @@ class Equation(Ex):
 			
 		Returns:
 			list of Result instances, crisped solutions
+			
+		Notes:
+			All solutions are crisped together as an array, as described for _halley.
 		"""
 		
 		# unpack *args
 		x = a[0]
 		s = a[1]
 		
-		# get expression and derivative
-		e = self.detach()
-		v = e.derive(x)
+		# make crisping function from top, with other variables in order
+		v = [i for i in self.scan() if i != x]
+		g = Eq._halley(Ex(self.top()),x,v)
 		
-		# for each solution
-		for n,i in enumerate(s):
+		# crisp as one row
+		try:
+			s,e = g([[complex(i) for i in s]],*[d[k] for k in v])
 			
-			# loop until tolerance is reached
-			f = 1.0
-			g = []
-			while abs(f) > Re.tolerance:
-				
-				# evaluate the function and its derivative at the solution
-				d[x] = i
-				f = e.evaluate(**d)[0]
-				p = v.evaluate(**d)[0]
-				
-				# recalculate 
-				a = f.divide(p)
-				i = i.subtract(a)
-				
-				# if algorithm is stuck
-				if (f,i) in g:
-					g.sort(key=lambda x: abs(x[0]))
-					i = g[0][1]
-					break
-					
-				# record pair
-				g.append((f,i))
-				
-			# reinsert
-			s[n] = i
+		# catch missing variables
+		except KeyError:
+			print('Not all variables accounted for, evaluation aborted.\n')
+			
+			raise ValueError('Not all variables accounted for, evaluation aborted.\n')
+			
+		# convert back to results
+		s = [Re(i) for i in s[0]]
 				
 		return s
 		
@@ -466,7 +808,7 @@ class Equation(Ex):
 		
 		return r
 	
-	def integrate(self,*g,**f):
+	def integrate(self,*g,_tolerance=None,**f):
 		"""Integrate the expression after solving.
 		
 		Arguments:
@@ -479,6 +821,8 @@ class Equation(Ex):
 				5) boolean, view graph?, defaults to True.
 				6) boolean, crisp solutions?, defaults to False
 				
+			_tolerance=None: float, tolerance for adaptive integration, named apart from the variables as for Expression.integrate
+			
 			**f: unpacked dictionary variables mapped to numbers or function objects
 			
 		Returns:
@@ -486,15 +830,62 @@ class Equation(Ex):
 			
 		Notes:
 			If the expression is quadratic or cubic in the solving variable, there will be multiple integration results, one for each sequence of solutions.
+			
+			Given a tolerance, each sequence of solutions is integrated adaptively by Gauss-Kronrod quadrature, solving at the quadrature points, and no graph is drawn.  The estimated errors are kept in the errors attribute of the page.
 		"""
 		
-		# get lists of solutions using draw
-		s = self.draw(*g,**f)
+		# distil booleans from *args
+		o = g
+		g,w = Ex._distil(g)
 		
-		# integrate
-		t = s.integrate()
+		# check for solving variable
+		v = None
+		x = g[0]
+		if len(g) > 1 and isinstance(g[1],str):
+			v = g[0]
+			x = g[1]
+			g = g[1:]
 			
-		return t
+		# without a solving variable, integrate detached expression
+		if not v:
+			u = self.detach()
+			r = u.integrate(*o,_tolerance=_tolerance,**f)
+			
+			return r
+			
+		# get limits and tolerance
+		a,b,n = Ex._bounds(g[1:])
+		t = _tolerance
+		
+		# without tolerance, get lists of solutions using draw
+		if t is None:
+			s = self.draw(*o,**f)
+			
+			# integrate
+			t = s.integrate()
+				
+			return t
+			
+		# solve at an array of points
+		def h(p):
+			if True in w:
+				r = self.sample(v,x,p.tolist(),True,**f)
+			else:
+				r = self.sample(v,x,p.tolist(),**f)
+			
+			return [[complex(k) for k in j] for j in r]
+			
+		# integrate adaptively
+		p = Ex._quadrature(h,a,b,t,f)
+		
+		# attributes
+		n = self.name
+		if n:
+			n = 'I (' + n + ') d' + x
+		p.name = n
+		p.source = self.jot()
+			
+		return p
 	
 	def isolate(self,x):
 		"""Isolate a variable.
@@ -556,6 +947,104 @@ class Equation(Ex):
 		
 		return s
 
+	def prepare(self,x,*v):
+		"""Prepare a solver for the equation, sectioning and compiling once for use at many points.
+		
+		Arguments:
+			x: string, name of variable to solve for
+			*v: unpacked tuple of strings, the other variables in order of the solver's arguments
+			
+		Returns:
+			function object
+			
+		Notes:
+			If no variables are given, all other variables in the equation are used, in the order given by scan.
+			
+			The equation is sectioned by powers of x, and the top of each coefficient is compiled.  The bottom is shared by all coefficients, so it is left out when solving.  If the bottom holds x, though, it may vanish at roots of the top, which are then poles of the equation rather than roots.  Such roots, where the bottom is zero to within 1e-8 of the sum of the sizes of its terms, are returned as nan.
+			
+			The solver takes one number or array of numbers per variable, and returns a two dimensional array of complex numbers, one row of arranged roots per point.  All points are solved at once by the array forms of the linear, quadratic, and cubic formulas, or as the eigenvalues of companion matrices for higher degrees.
+			
+			The solver also takes the keywords m, z and w.  Passing m='aberth' solves by the aberth-ehrlich method instead, and passing an array of starting roots as z does the same from those roots.  Passing w=True as well warm starts each point from its neighbors, for points that follow each other in order.  Its degree and variables are kept in the degree and variables attributes, and a function to crisp its roots, as made by _halley, in the crisp attribute.
+			
+			If x has negative powers, the solver cannot be prepared.
+			
+		Examples:
+			Preparing (a x^2 - 1) = 0 for x:
+				
+				h = self.prepare('x')
+				
+			gives a solver of a, so that h([1,4]) gives the roots 1, -1 and 0.5, -0.5.
+		"""
+		
+		# default to all other variables
+		if not v:
+			v = [i for i in self.scan() if i != x]
+		v = list(v)
+			
+		# section into tops of coefficients by exponent
+		s = {}
+		l = len(x)
+		for i in self.section(x):
+			n = int(i.name[l:])
+			s[n] = Ex(i.top())
+			
+		# verify keys are not negative
+		if min(s) < 0:
+			print('Equation has powers of %s that are beyond the capabilities of this function.  Solve aborted.\n' % (x))
+			
+			raise ValueError('Equation has powers of %s that are beyond the capabilities of this function.  Solve aborted.\n' % (x))
+			
+		# only constant term?
+		m = max(s)
+		if m < 1:
+			print('%s is not in the equation.  Solve aborted\n.' % (x))
+			
+			raise ValueError('%s is not in the equation.  Solve aborted\n.' % (x))
+			
+		# compile coefficients from highest power down, filling in empty ones
+		c = [s.get(i,Ex([])).compile(*v) for i in range(m,-1,-1)]
+		
+		# compile terms of the bottom if it holds x, to find poles among the roots
+		t = []
+		if x in Ex(self.bottom()).scan():
+			t = [Ex(i).compile(x,*v) for i in self.bottom()]
+			
+		# solving kernel, by companion matrix beyond cubics
+		g = lambda *c: Eq._companions(c)
+		if m < 4:
+			g = {1: Eq._linears,2: Eq._quadratics,3: Eq._cubics}[m]
+		
+		# solver
+		def solver(*a,m=None,z=None,w=False):
+			
+			# evaluate coefficients, one row per coefficient
+			with np.errstate(all='ignore'):
+				e = np.broadcast_arrays(*[np.asarray(f(*a),dtype=complex) for f in c])
+			e = np.array([i.ravel() for i in e])
+			
+			# solve at all points at once, by aberth-ehrlich method if chosen
+			if m == 'aberth' or z is not None:
+				r = Eq._aberth(e,z,w)
+			else:
+				r = g(*e)
+			
+			# roots where the bottom vanishes are poles
+			if t:
+				u = [np.asarray(i,dtype=complex).ravel()[:,None] for i in a]
+				with np.errstate(all='ignore'):
+					b = [f(r,*u) for f in t]
+				q = np.abs(sum(b)) <= 1e-8 * sum([np.abs(i) for i in b])
+				r = np.where(q,np.nan,r)
+			
+			return r
+			
+		# attributes
+		solver.degree = m
+		solver.variables = v
+		solver.crisp = Eq._halley(Ex(self.top()),x,v)
+		
+		return solver
+
 	def sample(self,*a,**f):
 		"""Evaluate equation at every point given after solving.
 		
@@ -573,6 +1062,9 @@ class Equation(Ex):
 		Returns:
 			Book instance
 			
+		Notes:
+			The equation is prepared once, and the inputs are planned once at the first point.  The prepared solver is then applied to all points at once, and the Book is bound from the arrays.
+			
 		Examples:
 			If the equation is (3a^2x + 2ay - 1) = 0, solving first for 'a' will result in a quadratic, and hence two solutions per value of x.  A list of two lists of complex numbers will be returned.  An attempt is made to make the lists continuous by grouping together points with lowest overall curvature.
 		"""
@@ -621,22 +1113,47 @@ class Equation(Ex):
 			
 			return r
 			
-		# evaluate results
-		r = []
-		for i in p:
+		# prepare solver
+		h = self.prepare(v)
+		k = h.variables
+		
+		# no points
+		if len(p) < 1:
 			
-			# reckon dictionary
-			d = Ex._reckon(f,x,i,y,q)
+			return Bo([],x)
 			
-			# solve for variable v
-			if True in b:
-				s = self.solve(v,True,**d)
-			else:
-				s = self.solve(v,**d)
-			r.append(s)
+		# plan bindings at the first point, and bind inputs over all points
+		w = Ex._plan(f,x,p[0],y,q)
+		o = np.array([complex(i) for i in p],dtype=complex)
+		d,c = Ex._sweep(w,f,x,o,p,y,q)
+		
+		# solve at all points
+		try:
+			r = h(*[d[j] for j in k])
+			
+		# catch missing variables
+		except KeyError:
+			print('Not all variables accounted for, evaluation aborted.\n')
+			
+			raise ValueError('Not all variables accounted for, evaluation aborted.\n')
+			
+		# spread over points if independent of them
+		r = np.array(np.broadcast_to(r,(len(o),h.degree)),dtype=complex)
+		
+		# crisp solutions at all points at once
+		e = None
+		if True in b:
+			r,e = h.crisp(r,*[d[j] for j in k])
 				
-		# make book
-		l = Bo(r,x)
+		# inputs that vary by point
+		u = dict(c)
+		for j,i in d.items():
+			if j != x and j not in c:
+				u[j] = i
+				
+		# make book from arrays
+		l = Bo._bind(x,o,r,v,self.jot(),u)
+		l.residuals = e
 				
 		return l
 
@@ -665,6 +1182,8 @@ class Equation(Ex):
 			If only one variable is given, the equation will be plotted against the complex plane of this variable without solving.
 			
 			Function objects are limited to being functions of the first variable.
+			
+			The equation is prepared once, and the whole grid is solved at once.
 		"""
 		
 		# distil booleans
@@ -730,40 +1249,62 @@ class Equation(Ex):
 		# calculate second axis points
 		v = Ex._points(a.imag,b.imag,q)
 		
-		# loop through second axis rows
-		h = []
-		for i in v:
-			
-			# progress tracker
-			print('.', end='')
+		# prepare solver
+		c = self.prepare(z)
+		
+		# mesh into grid, one row for each second axis point
+		m,k = np.meshgrid([i.real for i in u],[i.real for i in v])
+		o = m.ravel() + 0j
+		t = k.ravel() + 0j
+		
+		# one complex variable?
+		if not y:
+			o = o + 1j * t
+			t = None
 			
-			# two real variables?
-			if y:
-				f[y] = i
-				w = u
-				
-			# one complex variable?
-			else:
-				w = [Re(j,i) for j in u]
-				
-			# assemble *args
-			if y:
-				r = (z,x,w,y,i)
-			else:
-				r = (z,x,w)
-				
-			# crisp solutions?
-			if True in e:
-				r += True,
+		# plan bindings at the first point, and bind inputs over the grid
+		l = o.tolist()
+		w = Ex._plan(f,x,l[0],y,t if t is None else t[0])
+		d,n = Ex._sweep(w,f,x,o,l,y,t)
+		
+		# solve whole grid
+		try:
+			r = c(*[d[j] for j in c.variables])
 			
-			# evaluate
-			s = self.sample(*r,**f)
+		# catch missing variables
+		except KeyError:
+			print('Not all variables accounted for, evaluation aborted.\n')
 			
-			# place into list of books
-			h.append(s)
+			raise ValueError('Not all variables accounted for, evaluation aborted.\n')
 			
-		# end tracker
-		print('\n')
+		# spread over grid if independent of it
+		r = np.array(np.broadcast_to(r,(len(o),c.degree)),dtype=complex)
+		
+		# crisp solutions at all points at once
+		m = None
+		if True in e:
+			r,m = c.crisp(r,*[d[j] for j in c.variables])
+			m = m.reshape(len(v),len(u),c.degree)
+		
+		# arrange in rows
+		o = o.reshape(len(v),len(u))
+		r = r.reshape(len(v),len(u),c.degree)
+		
+		# inputs that vary by point
+		k = {j: i.reshape(len(v),len(u)) for j,i in d.items() if j not in n and j not in (x,y)}
+		
+		# make a book for each row
+		s = self.jot()
+		h = []
+		for j in range(len(v)):
+			i = dict(n)
+			if y:
+				i[y] = Re(v[j])
+			for g in k:
+				i[g] = k[g][j]
+			h.append(Bo._bind(x,o[j],r[j],z,s,i))
+			if m is not None:
+				h[-1].residuals = m[j]
 			
 		# make Shelf
 		if y:
@@ -807,14 +1348,15 @@ class Equation(Ex):
 		Arguments:
 			*g: unpacked tuple:
 				1) string, name of variable to solve for
-				2) boolean, True to use newton's method to tighten the solutions
+				2) string, possibly 'aberth' to solve by the aberth-ehrlich method
+				3) boolean, True to use newton's method to tighten the solutions
 			**d: unpacked dictionary mapping all variables to values
 			
 		Returns:
 			Page instance
 			
 		Notes:
-			If the highest degree of x is greater than 3, this function lacks to ability to solve it.
+			Equations beyond cubics are solved numerically as the eigenvalues of the companion matrix, unless the aberth-ehrlich method is chosen, which solves equations of any degree.  Negative powers of x are beyond this function.
 		"""
 		
 		# distil booleans
@@ -823,6 +1365,12 @@ class Equation(Ex):
 		# get variable
 		x = g[0]
 		
+		# get method
+		try:
+			a = g[1]
+		except IndexError:
+			a = None
+		
 		# partition
 		p = self.section(x)
 		
@@ -834,8 +1382,8 @@ class Equation(Ex):
 			n = int(n[l:])
 			s[n] = i
 			
-		# verify keys are 0-3
-		t = [i in (0,1,2,3) for i in s]
+		# verify keys are not negative
+		t = [i >= 0 for i in s]
 		if False in t:
 			print('Equation has powers of %s that are beyond the capabilities of this function.  Solve aborted.\n' % (x))
 			
@@ -848,7 +1396,7 @@ class Equation(Ex):
 				s[i] = Ex([])
 				
 		# order by power and evaluate
-		k = s.keys()
+		k = list(s.keys())
 		k.sort()
 		k.reverse()
 		c = [s[i].evaluate(**d) for i in k]
@@ -860,20 +1408,148 @@ class Equation(Ex):
 			
 			return Pa([Re(0)])
 		
-		# solving subroutine
-		if len(c) == 2:
+		# solving subroutine, by aberth-ehrlich method if chosen
+		if a == 'aberth':
+			r = Eq._aberth([np.array([complex(i)]) for i in c])
+			r = [Re(i) for i in r[0]]
+			
+		# or by formula
+		elif len(c) == 2:
 			r = Eq._linear(*c)
-		if len(c) == 3:
+		elif len(c) == 3:
 			r = Eq._quadratic(*c)
-		if len(c) == 4:
+		elif len(c) == 4:
 			r = Eq._cubic(*c)
 			
+		# or by companion matrix
+		else:
+			r = Eq._companions([np.array([complex(i)]) for i in c])
+			r = [Re(i) for i in r[0]]
+			
 		# crisp solutions
 		if True in b:
 			r = self.crisp(x,r,**d)
 		
 		return Pa(r,x,self.jot(),d)
 
+	def trace(self,*a,**f):
+		"""Trace each solution continuously along the points given, following it from point to point.
+		
+		Arguments:
+			*a: unpacked tuple:
+				0) string, variable to solve for
+				1) string, variable to sample at
+				2) list of numbers, sampling points
+				3) string, possible second variable
+				4) number, value of second variable
+				5) boolean, crisp solutions? defaults to False
+			
+			**f: unpacked dictionary of function objects or numbers mapped to variable names to evaluate based on x
+			
+		Returns:
+			Book instance
+			
+		Notes:
+			The solutions at the first point are found by the prepared solver.  At each later point, every solution is predicted from the previous two points, extending along its slope with respect to the sampling variable, and then corrected by halley's method.
+			
+			The correction fails if a solution moves more than half the distance to its nearest neighbor, or if two solutions collide.  Only then is the point solved outright, and its solutions matched to the nearest predictions.
+			
+			The solutions therefore stay on continuous branches where roots cross, without arranging and honing afterward.
+			
+		Examples:
+			For (y^2 - x^2) = 0 sampled from x = -1 to 1, sample arranges the roots by real part, so the branches y = x and y = -x swap at x = 0.  Tracing keeps each on its line.
+		"""
+		
+		# distil booleans
+		a,b = Ex._distil(a)
+		
+		# unpack *args
+		v = a[0]
+		x = a[1]
+		p = a[2]
+		
+		# possible second variable
+		try:
+			y = a[3]
+			q = a[4]
+		except:
+			y = None
+			q = None
+			
+		# prepare solver
+		h = self.prepare(v)
+		k = h.variables
+		
+		# no points
+		if len(p) < 1:
+			
+			return Bo([],x)
+			
+		# plan bindings at the first point, and bind inputs over all points
+		w = Ex._plan(f,x,p[0],y,q)
+		o = np.array([complex(i) for i in p],dtype=complex)
+		d,c = Ex._sweep(w,f,x,o,p,y,q)
+		
+		# inputs at each point
+		try:
+			g = [d[j] for j in k]
+			
+		# catch missing variables
+		except KeyError:
+			print('Not all variables accounted for, evaluation aborted.\n')
+			
+			raise ValueError('Not all variables accounted for, evaluation aborted.\n')
+			
+		# take point n of each input
+		at = lambda n: [i[n] if isinstance(i,np.ndarray) else i for i in g]
+		
+		# solve first point outright
+		r = np.zeros((len(o),h.degree),dtype=complex)
+		r[0] = h(*at(0))[0]
+		
+		# follow each point from the last
+		for n in range(1,len(o)):
+			
+			# predict along slope of the last two points
+			e = r[n - 1]
+			if n > 1 and o[n - 1] != o[n - 2]:
+				e = e + (r[n - 1] - r[n - 2]) * (o[n] - o[n - 1]) / (o[n - 1] - o[n - 2])
+				
+			# correct
+			s = h.crisp([e],*at(n))[0][0]
+			
+			# half the distance from each prediction to its nearest neighbor
+			u = np.abs(e[:,None] - e[None,:])
+			u[np.diag_indices(len(e))] = np.inf
+			u = u.min(axis=1) / 2
+			
+			# distances between corrected solutions
+			l = np.abs(s[:,None] - s[None,:])
+			l[np.diag_indices(len(s))] = np.inf
+			
+			# solve outright if correction failed
+			if not np.all(np.isfinite(s)) or np.any(np.abs(s - e) > u) or np.any(l.min(axis=1) == 0):
+				s = Eq._match(e,h(*at(n))[0])
+				
+			r[n] = s
+			
+		# crisp solutions at all points at once
+		e = None
+		if True in b:
+			r,e = h.crisp(r,*g)
+				
+		# inputs that vary by point
+		u = dict(c)
+		for j,i in d.items():
+			if j != x and j not in c:
+				u[j] = i
+				
+		# make book from arrays
+		l = Bo._bind(x,o,r,v,self.jot(),u)
+		l.residuals = e
+				
+		return l
+	
 	def view(self):
 		"""View the equation.
 		
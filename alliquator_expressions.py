@@ -1,6 +1,9 @@
 # alliquator_expressions.py
 # classes to manipulate algebraic expressions
 
+# import numpy
+import numpy as np
+
 # import results
 import alliquator_results as aq_re
 Re = aq_re.Result
@@ -31,8 +34,29 @@ class Expression (list):
 	"""An Expression is one Line of Terms divided by another.
 	
 	Expression class inherits from list.
+	
+	class attributes:
+		kronrod: tuple of lists, the nodes of the 15 point Gauss-Kronrod rule on (-1,1), their Kronrod weights, and the weights of the embedded 7 point Gauss rule
 	"""
 	
+	# Gauss-Kronrod nodes and weights, right half
+	x = [0.991455371120812639206854697526329,0.949107912342758524526189684047851]
+	x += [0.864864423359769072789712788640926,0.741531185599394439863864773280788]
+	x += [0.586087235467691130294144845693013,0.405845151377397166906606412076961]
+	x += [0.207784955007898467600689403773245]
+	w = [0.022935322010529224963732008058970,0.063092092629978553290700663189204]
+	w += [0.104790010322250183839876322541518,0.140653259715525918745189590510238]
+	w += [0.169004726639267902826583426598550,0.190350578064785409913256402421014]
+	w += [0.204432940075298892414161999234649]
+	g = [0.0,0.129484966168869693270611432679082]
+	g += [0.0,0.279705391489276667901467771423780]
+	g += [0.0,0.381830050505118944950369775488975]
+	g += [0.0]
+	
+	# mirror about the center
+	kronrod = ([-i for i in x] + [0.0] + x[::-1],w + [0.209482141084727828012999174891714] + w[::-1],g + [0.417959183673469387755102040816327] + g[::-1])
+	del x,w,g
+	
 	def __init__(self,t=None,b=None,n=None):
 		"""Define an algebraic expression.
 		
@@ -108,6 +132,78 @@ class Expression (list):
 
 
 	# static methods
+	@staticmethod
+	def _apply(w,f,x,p,y=None,q=None):
+		"""Apply a binding plan at a point to convert function objects to values.
+		
+		Arguments:
+			w: list of tuples, the binding plan
+			f: dictionary, maps variable names to numbers or function objects
+			x: string, first independent variable name
+			p: number, value for x
+			y=None: string, second independent variable name
+			q=None: number, value for y
+			
+		Returns:
+			dictionary, maps variables to values.
+		"""
+		
+		# begin dictionary
+		d = {x:p}
+		if y:
+			d[y] = q
+			
+		# bind each input by its kind
+		for k,h,e in w:
+			
+			# constants are read afresh
+			if h == 'constant':
+				d[k] = Re(f[k])
+				
+			# expressions are evaluated with the values so far
+			elif h == 'expression':
+				d[k] = e.evaluate(**d)[0]
+				
+			# functions are called
+			else:
+				d[k] = Ex._call(h,f[k],p,q)
+				
+		return d
+	
+	@staticmethod
+	def _bounds(g):
+		"""Get the limits and steps from a list of arguments.
+		
+		Arguments:
+			g: tuple of arguments following the variables
+			
+		Returns:
+			tuple:
+				complex, left limit, by default -2
+				complex, right limit, by default 2
+				integer, number of steps, by default 64
+		"""
+		
+		# left limit
+		try:
+			a = complex(g[0])
+		except:
+			a = -2.0
+			
+		# right limit
+		try:
+			b = complex(g[1])
+		except:
+			b = 2.0
+			
+		# steps
+		try:
+			n = int(g[2])
+		except:
+			n = 64
+			
+		return a,b,n
+	
 	@staticmethod
 	def _build(f,p,a,d):
 		"""Build a dictionary of partial derivative substitutions.
@@ -118,21 +214,21 @@ class Expression (list):
 			a: list of strings, additional derivable functions
 			d: dictionary mapping variables to substitutions
 			
-			Returns:
-				a dictionary mapping partial derivatives to substituting expressions
-			"""
+		Returns:
+			a dictionary mapping partial derivatives to substituting expressions
+				
+		Notes:
+			Mixed partials are the same whatever the order of their subscripts, so each partial is filed under its subscripts in sorted order, such as 'Fxy' for both 'Fxy' and 'Fyx'.  Each is calculated once, from the partial with its last subscript removed, and remembered for the others.
+			
+			Only the partials given are returned, along with those they depend on being calculated along the way.
+		"""
 		
 		# remove stem for list of subscripts
 		n = len(f)
 		u = [i[n:] for i in p]
 		
-		# highest order is largest length of subscript
-		o = [len(i) for i in u]
-		
 		# return empty dictionary if no partials
-		try:
-			o = max(o)
-		except ValueError:
+		if not u:
 			
 			return {}
 		
@@ -146,43 +242,117 @@ class Expression (list):
 		# extend dictionary to include all coordinates
 		d = Ex._mimic(d,c,z)
 		
-		# begin substitution dictionary
+		# all differentiable stems, longest first
+		r = list(set(list(z.keys()) + [f]))
+		r.sort(key=lambda x: -len(x))
+		
+		# file substitutions under sorted subscripts
+		d = {Ex._canonize(k,r,c): i for k,i in d.items()}
+		
+		# begin memo of partials
 		b = {f:d[f]}
 		
-		# begin derivatives list with stem
-		l = [f]
+		# power tables shared between substitutions
+		h = {}
 		
-		# for every degree
-		for g in range(o):
+		# calculate a partial from its sorted subscripts
+		def partial(s):
 			
-			# begin new derivatives list
-			w = []
-			
-			# for every derivative already generated
-			for i in l:
+			# retrieve if already calculated
+			k = f + s
+			if k in b:
 				
-				# for every coordinate, take the derivative
-				for j in c:
-					
-					# form function list
-					y = [k for k in z.keys()]
-					y = [k for k in y if j in z[k]]
-					e = b[i].derive(j,*y)
+				return b[k]
+				
+			# derive from partial without last subscript
+			j = s[-1]
+			e = partial(s[:-1])
+			y = [i for i in z.keys() if j in z[i]]
+			e = e.derive(j,*y)
+			
+			# sort subscripts of partials that appear
+			for i in e.scan():
+				w = Ex._canonize(i,r,c)
+				if w != i:
+					e = e.plug(w,i)
+				
+			# substitute from dictionary where present
+			v = e.scan()
+			v = {i: d[i] for i in d if i in v}
+			if v:
+				e = e.substitute_many(v,h)
 					
-					# substitute from dictionary
-					for k in d:
-						e = e.substitute(d[k],k)
-						
-					# add to new derivative list
-					w.append(i + j)
+			# remember
+			b[k] = e
+			
+			return e
+			
+		# calculate each partial given
+		w = {}
+		for i,j in zip(p,u):
+			w[i] = partial(''.join(sorted(j)))
+			
+		return w
+	
+	@staticmethod
+	def _call(h,i,p,q=None):
+		"""Call a function object in the manner given by its binding.
+		
+		Arguments:
+			h: string, kind of binding
+			i: function object
+			p: number or array, value for first variable
+			q=None: number, value for second variable
+			
+		Returns:
+			number or array
+		"""
+		
+		# both variables
+		if h == 'pair':
+			
+			return i(p,q)
+			
+		# real components of both variables
+		if h == 'real pair':
+			
+			return i(p.real,q.real)
+			
+		# one variable
+		if h == 'single':
+			
+			return i(p)
+			
+		# or the real component
+		return i(p.real)
+	
+	@staticmethod
+	def _canonize(v,r,c):
+		"""Sort the subscripts of a partial derivative.
+		
+		Arguments:
+			v: string, variable name
+			r: list of strings, differentiable stems, longest first
+			c: set of strings, coordinates
+			
+		Returns:
+			string
+			
+		Examples:
+			With stem 'F' and coordinates 'x' and 'y', 'Fyx' becomes 'Fxy'.  A variable with no stem, or with characters after the stem that are not coordinates, is unchanged.
+		"""
+		
+		# find stem
+		for i in r:
+			if v.startswith(i):
+				s = v[len(i):]
+				
+				# sort subscripts if all are coordinates
+				if all([j in c for j in s]):
 					
-					# add to substitution dictionary
-					b[i + j] = e
+					return i + ''.join(sorted(s))
 					
-			# swap new list for old
-			l = w
-			
-		return b
+		return v
 	
 	@staticmethod
 	def _couple(c,a):
@@ -335,6 +505,69 @@ class Expression (list):
 			
 		return d
 
+	@staticmethod
+	def _plan(f,x,p,y=None,q=None):
+		"""Plan how to bind each input to a value, by trying each form at a first point.
+		
+		Arguments:
+			f: dictionary, maps variable names to numbers or function objects
+			x: string, first independent variable name
+			p: number, value for x at the first point
+			y=None: string, second independent variable name
+			q=None: number, value for y
+			
+		Returns:
+			list of tuples:
+				string, variable name,
+				string, kind of binding,
+				Expression instance for expressions, otherwise None
+				
+		Notes:
+			The kinds are tried in turn: a constant number, a function of both variables, a function of their real components, a function of the first variable, a function of its real component, and last an expression.  Only the kind is planned, so constants are read afresh and functions are called afresh at each point.
+		"""
+		
+		# begin dictionary
+		d = {x:p}
+		if y:
+			d[y] = q
+			
+		# classify each input
+		w = []
+		for k,i in f.items():
+			
+			# check for number
+			try:
+				d[k] = Re(i)
+				w.append((k,'constant',None))
+				
+				continue
+				
+			except:
+				pass
+				
+			# or try each form of function
+			for h in ('pair','real pair','single','real single'):
+				try:
+					d[k] = Ex._call(h,i,p,q)
+					w.append((k,h,None))
+					break
+				except:
+					pass
+					
+			# or assume Expression instance
+			else:
+				try:
+					e = Ex(i)
+					d[k] = e.evaluate(**d)[0]
+					w.append((k,'expression',e))
+					
+				# otherwise abort
+				except:
+					print('Invalid function or value.  Evaluation aborted.\n')
+					raise ValueError('Invalid function or value.  Evaluation aborted.\n')
+					
+		return w
+		
 	@staticmethod
 	def _points(a,b,n):
 		"""Make a collection of points from beginning and ending distances, and number of points.
@@ -365,6 +598,101 @@ class Expression (list):
 			
 		return p
 				
+	@staticmethod
+	def _quadrature(h,a,b,t,f=None):
+		"""Integrate a function adaptively along a straight path with the 15 point Gauss-Kronrod rule.
+		
+		Arguments:
+			h: function object, maps an array of points to an array of values, with one row per point and one column per branch
+			a: complex, beginning of path
+			b: complex, end of path
+			t: float, tolerance
+			f=None: dictionary mapping variables to numbers or function objects
+			
+		Returns:
+			Page instance
+			
+		Notes:
+			The path is split in halves until the total estimated error of each branch is within the tolerance, taken both absolutely and relative to the integral.  Each round, every interval whose error is more than its share of the tolerance is split, so that all new points are evaluated in a single call of h.
+			
+			The error of each interval is estimated as the difference between the Kronrod and embedded Gauss results, and the total estimates are kept in the errors attribute of the page.  Constant numbers in f are kept as the inputs.
+			
+			Splitting stops after 1 << 14 intervals, in which case the errors reported exceed the tolerance.
+		"""
+		
+		# nodes and weights
+		x,k,g = [np.array(i) for i in Ex.kronrod]
+		
+		# begin with one interval, as left ends and widths along the path
+		l = np.array([0.0])
+		w = np.array([1.0])
+		d = complex(b) - complex(a)
+		
+		# results and errors of intervals so far
+		r = None
+		e = None
+		while True:
+			
+			# evaluate all nodes of new intervals at once
+			p = complex(a) + d * (l[:,None] + w[:,None] * (x + 1) / 2)
+			with np.errstate(all='ignore'):
+				v = np.asarray(h(p.ravel()),dtype=complex)
+			v = v.reshape(len(l),len(x),-1)
+			
+			# Kronrod and Gauss results
+			s = d * w[:,None] / 2
+			u = np.einsum('j,ijk->ik',k,v) * s
+			o = np.abs(u - np.einsum('j,ijk->ik',g,v) * s)
+			o[~np.isfinite(o)] = np.inf
+			
+			# add to intervals so far
+			if r is None:
+				r = u
+				e = o
+				m = w
+				n = l
+			else:
+				r = np.concatenate([r,u])
+				e = np.concatenate([e,o])
+				m = np.concatenate([m,w])
+				n = np.concatenate([n,l])
+				
+			# totals and tolerance of each branch
+			q = r.sum(axis=0)
+			z = e.sum(axis=0)
+			c = np.maximum(t,t * np.abs(q))
+			
+			# stop once within tolerance, or at too many intervals
+			if np.all(z <= c) or len(m) >= 1 << 14:
+				break
+				
+			# split intervals with more than their share of error, or else the worst
+			j = np.any(e > c * m[:,None],axis=1)
+			if not j.any():
+				j = np.arange(len(m)) == np.argmax(e.max(axis=1))
+				
+			# replace with halves
+			w = np.repeat(m[j] / 2,2)
+			l = np.repeat(n[j],2) + np.tile([0.0,1.0],j.sum()) * w
+			r = r[~j]
+			e = e[~j]
+			m = m[~j]
+			n = n[~j]
+			
+		# make page of totals
+		p = Pa(q.tolist())
+		p.errors = z.tolist()
+		
+		# constant inputs
+		if f:
+			for i,j in f.items():
+				try:
+					p.inputs[i] = Re(j)
+				except:
+					pass
+		
+		return p
+		
 	@staticmethod
 	def _reckon(f,x,p,y=None,q=None):
 		"""Convert function objects to values.
@@ -378,51 +706,14 @@ class Expression (list):
 			
 		Returns:
 			dictionary, maps variables to values.
+			
+		Notes:
+			For repeated evaluation, make a plan once with _plan and apply it at each point with _apply instead.
 		"""
 		
-		# begin dictionary
-		d = {x:p}
-		if y:
-			d[y] = q
-			
-		# convert functions to numbers
-		for k,i in f.items():
-			
-			# check for number
-			try:
-				d[k] = Re(i)
-				
-			# or evaluate function with both variables
-			except:
-				try:
-					d[k] = i(p,q)
-					
-				# or use only real components
-				except:
-					try:
-						d[k] = i(p.real,q.real)
-						
-					# or try one variable
-					except:
-						try:
-							d[k] = i(p)
-							
-						# or the real component
-						except:
-							try:
-								d[k] = i(p.real)
-								
-							# or assume Expression instance
-							except:
-								try:
-									i = Ex(i)
-									e = i.evaluate(**d)
-									d[k] = e[0]
-									
-								# otherwise abort
-								except:
-									print('Invalid function or value.  Evaluation aborted.\n')
-									raise ValueError('Invalid function or value.  Evaluation aborted.\n')
+		# plan and apply
+		w = Ex._plan(f,x,p,y,q)
+		d = Ex._apply(w,f,x,p,y,q)
 									
 		return d
 
@@ -472,6 +763,99 @@ class Expression (list):
 							
 		return s,n
 
+	@staticmethod
+	def _spread(a,b,n):
+		"""Spread points evenly across a range, at the midpoints of equal steps.
+		
+		Arguments:
+			a: number, beginning of range
+			b: number, end of range
+			n: integer, number of points
+			
+		Returns:
+			array of numbers, the points
+		"""
+		
+		# midpoints of steps
+		n = int(n)
+		t = (2 * np.arange(n) + 1) / (2.0 * n)
+		p = a + (b - a) * t
+			
+		return p
+	
+	@staticmethod
+	def _sweep(w,f,x,o,p,y=None,q=None):
+		"""Apply a binding plan over all points at once.
+		
+		Arguments:
+			w: list of tuples, the binding plan
+			f: dictionary, maps variable names to numbers or function objects
+			x: string, first independent variable name
+			o: array of complex numbers, the points
+			p: list of numbers, the points as given
+			y=None: string, second independent variable name
+			q=None: number, or array with one value per point, value for y
+			
+		Returns:
+			tuple:
+				dictionary mapping variables to numbers or arrays,
+				dictionary mapping variables to their common values
+				
+		Notes:
+			Functions are first called on the whole array of points.  If that fails, or does not give one value per point, they are called point by point.  Expressions are compiled and evaluated on the arrays.
+		"""
+		
+		# begin dictionaries
+		d = {x:o}
+		c = {}
+		if y:
+			d[y] = q
+			if not isinstance(q,np.ndarray):
+				c[y] = q
+				
+		# second variable at each point
+		s = [q] * len(p)
+		if isinstance(q,np.ndarray):
+			s = q.tolist()
+		
+		# bind each input by its kind
+		for k,h,e in w:
+			
+			# constants are common
+			if h == 'constant':
+				d[k] = Re(f[k])
+				c[k] = d[k]
+				
+				continue
+				
+			# compile expressions for the arrays
+			if h == 'expression':
+				v = e.scan()
+				try:
+					g = e.compile(*v)
+					with np.errstate(all='ignore'):
+						r = g(*[d[j] for j in v])
+				except KeyError:
+					print('Invalid function or value.  Evaluation aborted.\n')
+					raise ValueError('Invalid function or value.  Evaluation aborted.\n')
+					
+			# try functions on the whole array
+			else:
+				i = f[k]
+				try:
+					r = np.asarray(Ex._call(h,i,o,q),dtype=complex)
+					if r.shape not in ((),o.shape):
+						raise ValueError
+						
+				# or point by point
+				except:
+					r = [Ex._call(h,i,j,m) for j,m in zip(p,s)]
+					
+			# one value per point
+			d[k] = np.array(np.broadcast_to(np.asarray(r,dtype=complex),o.shape))
+			
+		return d,c
+		
 	# instance methods
 	def __add__(self,e):
 		"""Use the + shortcut for addition.
@@ -727,14 +1111,18 @@ class Expression (list):
 		
 		return s
 	
-	def add(self,e):
+	def add(self,e,l=False):
 		"""Add another Expression.
 		
 		Arguments:
 			e: Expression instance, string, Line instance, Term instance, pair of integers, or integer
+			l=False: boolean, combine over the least common denominator?
 			
 		Returns:
 			Expression instance
+			
+		Notes:
+			Different denominators are cross multiplied by default.  If l is True, they are instead combined over their least common multiple, found from their greatest common divisor, which keeps the bottom smaller at the cost of the division.
 		"""
 		
 		# A / B + C / D =
@@ -752,6 +1140,18 @@ class Expression (list):
 			t = a.add(c)
 			m = b.copy()
 			
+		# or cross multiply over least common denominator
+		# B = G * P, D = G * Q
+		# (A Q + P C) / G P Q
+		elif l:
+			h = b.common(d)
+			p = b.quotient(h)
+			q = d.quotient(h)
+			f = a.multiply(q)
+			g = p.multiply(c)
+			t = f.add(g)
+			m = b.multiply(q)
+			
 		# otherwise cross multiply
 		else:
 			f = a.multiply(d)
@@ -777,6 +1177,53 @@ class Expression (list):
 		
 		return r
 
+	def antiderive(self,x):
+		"""Take the antiderivative, if it is an expression.
+		
+		Arguments:
+			x: string, variable name
+			
+		Returns:
+			Expression instance, or
+			None if the antiderivative is not an expression
+			
+		Notes:
+			The antiderivative is found only when the bottom is a single term, so that the expression is a sum of terms, and no term has x^-1 once divided through.  Otherwise None is returned.
+			
+		Examples:
+			For expression (3x^2 + 2x + 1), the antiderivative is (x^3 + x^2 + x).
+			
+			For expression (x^3 + 2) / (2x^2), dividing through gives (1/2 x + x^-2), so the antiderivative is (1/4 x^2 - x^-1).
+			
+			For expression (x^2 + 1) / x, dividing through leaves x^-1, whose antiderivative is a logarithm, so None is returned.
+		"""
+		
+		# bottom must be a single term
+		b = self.bottom()
+		if len(b) != 1:
+			
+			return None
+			
+		# divide through by bottom
+		t = self.top().multiply(Li([b[0].invert()]))
+		
+		# antiderive
+		t = t.antiderive(x)
+		if t is None:
+			
+			return None
+			
+		# add prefix to name
+		n = self.name
+		if n:
+			n = 'I (' + n + ') d' + x
+			
+		# result type mimics self
+		r = Ex(t,1,n)
+		r.__class__ = self.__class__
+		
+		return r
+
 	def apply(self,*a,**d):
 		"""Apply specific function definitions to generic functions and their derivatives.
 		
@@ -834,10 +1281,8 @@ class Expression (list):
 		# build substitutions
 		b = Ex._build(f,p,a,d)
 
-		# substitute
-		s = self
-		for k in b:
-			s = s.substitute(b[k],k)
+		# substitute all at once
+		s = self.substitute_many(b)
 			
 		# maintain subclass
 		s.__class__ = self.__class__
@@ -893,7 +1338,7 @@ class Expression (list):
 			boolean, expressions equal?
 			
 		Notes:
-			Comparison is performed on a term by term basis, so two expressions that have terms in different orders will evaluate as false.
+			Comparison is performed on a term by term basis.  Lines keep their terms in a canonical order, so tops and bottoms with the same terms compare as equal, but equivalent expressions with different tops and bottoms, such as (2x / 4) and (x / 2), do not.
 		"""
 		
 		# convert to Expression
@@ -912,6 +1357,78 @@ class Expression (list):
 		
 		return q
 		
+	def compile(self,*v):
+		"""Compile the expression into a Python function for fast numerical evaluation.
+		
+		Arguments:
+			*v: unpacked tuple of strings, the variables in order of the function's arguments
+			
+		Returns:
+			function object
+			
+		Notes:
+			If no variables are given, all variables in the expression are used, in the order given by scan.
+			
+			The function takes one number or array of numbers per variable, and returns a complex number or array of complex numbers.  The powers of every variable in top and bottom are computed once per call.  The generated source is kept in the function's source attribute.
+			
+			Dividing by zero raises ZeroDivisionError for numbers, but gives infinities for arrays, following numpy.
+			
+		Examples:
+			Compiling (x^2 + 3y) / (y - 1) for x and y:
+				
+				f = self.compile('x','y')
+				
+			allows evaluation at x = 2, y = 3 with f(2,3), giving (6.5+0j).
+		"""
+		
+		# default to all variables
+		if not v:
+			v = self.scan()
+			
+		# name variables in source
+		o = {k: 'v%d' % (n) for n,k in enumerate(v)}
+		
+		# transcribe top and bottom, sharing powers
+		w = {}
+		t = self.top().transcribe(o,w)
+		b = self.bottom().transcribe(o,w)
+		
+		# begin function, converting arguments to complex
+		a = ','.join([o[k] for k in v])
+		s = ['def f(%s):' % (a)]
+		for k in v:
+			s.append('\t%s = lift(%s)' % (o[k],o[k]))
+			
+		# table of powers
+		for (k,e),n in w.items():
+			s.append('\t%s = %s ** %d' % (n,o[k],e))
+			
+		# top, and bottom unless it is one
+		s.append('\tt = %s' % (t))
+		if self.bottom().compare(Li(1)):
+			s.append('\treturn t')
+		else:
+			s.append('\tb = %s' % (b))
+			s.append('\treturn t / b')
+		s = '\n'.join(s) + '\n'
+		
+		# convert numbers to complex, and anything else to complex arrays
+		def lift(z):
+			try:
+				z = complex(z)
+			except TypeError:
+				z = np.asarray(z) + 0j
+				
+			return z
+		
+		# define function
+		d = {'lift': lift}
+		exec(s,d)
+		f = d['f']
+		f.source = s
+		
+		return f
+		
 	def copy(self):
 		"""Copy the expression.
 		
@@ -1103,7 +1620,7 @@ class Expression (list):
 		
 		return Pa([c],n,s,d)
 
-	def integrate(self,*g,**f):
+	def integrate(self,*g,_tolerance=None,**f):
 		"""Integrate the expression to a value.
 		
 		Arguments:
@@ -1114,19 +1631,112 @@ class Expression (list):
 				3) number, steps, defaults to 64.
 				4) boolean, view graph?, defaults to True.
 				
+			_tolerance=None: float, tolerance for adaptive integration, named with an underscore so as never to clash with a variable, whose name may only hold letters
+			
 			**f: unpacked dictionary mapping variables to numbers or function objects
 			
 		Returns:
 			Page instance
+			
+		Notes:
+			If the antiderivative is an expression and all other variables are constant, the integral is found exactly by evaluating the antiderivative at the limits, and the steps are not used.  Its estimated error is zero.  The graph is still drawn, unless declined or a tolerance is given.  If the antiderivative has negative powers of x and the path between the limits passes through zero, the integral is found numerically instead.
+			
+			Otherwise, given a tolerance, the integral is found adaptively by Gauss-Kronrod quadrature of the compiled expression, and no graph is drawn.  The estimated error is kept in the errors attribute of the page.
+			
+		Examples:
+			Integrating (x^2 + y) from 0 to 1 with y = 2, to within 1e-10:
+				
+				self.integrate('x',0,1,_tolerance=1e-10,y=2)
+				
+			gives 7/3.
 		"""
 		
-		# get lists of solutions using draw
-		s = self.draw(*g,**f)
+		# get limits and tolerance
+		x = g[0]
+		a,b,n = Ex._bounds(Ex._distil(g)[0][1:])
+		t = _tolerance
 		
-		# integrate
-		t = s.integrate()
+		# check for constant inputs
+		try:
+			c = {k: Re(i) for k,i in f.items()}
+		except:
+			c = None
+			
+		# find antiderivative if possible
+		e = None
+		if c is not None:
+			e = self.antiderive(x)
+			
+		# but not across a pole at zero
+		if e is not None and any([dict(i.monomial).get(x,0) < 0 for i in e.top()]):
+			s = complex(a).conjugate() * complex(b)
+			if abs(s.imag) <= Re.tolerance * (1 + abs(s)) and s.real <= 0:
+				e = None
+				
+		# evaluate antiderivative at limits
+		if e is not None:
+			c[x] = Re(a)
+			l = e.evaluate(**c)[0]
+			c[x] = Re(b)
+			r = e.evaluate(**c)[0]
+			
+			# make page
+			p = Pa([r.subtract(l)])
+			p.errors = [0.0]
+			
+			# attributes
+			del c[x]
+			p.inputs = c
+			p.name = e.name
+			p.source = self.jot()
+			
+			# draw graph unless declined
+			if t is None and False not in Ex._distil(g)[1]:
+				self.draw(*g,**f)
+			
+			return p
+		
+		# without tolerance, get lists of solutions using draw
+		if t is None:
+			s = self.draw(*g,**f)
 			
-		return t
+			# integrate
+			t = s.integrate()
+			
+			return t
+			
+		# compile expression
+		v = self.scan()
+		c = self.compile(*v)
+		
+		# plan bindings at the left limit
+		w = Ex._plan(f,x,a)
+		
+		# evaluate at an array of points
+		def h(o):
+			d = Ex._sweep(w,f,x,o,o.tolist())[0]
+			try:
+				r = c(*[d[k] for k in v])
+				
+			# catch missing variables
+			except KeyError:
+				print('Not all variables accounted for, evaluation aborted.\n')
+				
+				raise ValueError('Not all variables accounted for, evaluation aborted.\n')
+				
+			return np.broadcast_to(r,o.shape)
+			
+		# integrate adaptively
+		p = Ex._quadrature(h,a,b,t,f)
+		
+		# attributes
+		n = self.name
+		if n:
+			n = 'I (' + n + ') d' + x
+		p.name = n
+		p.source = self.jot()
+			
+		return p
 		
 	def invert(self):
 		"""Invert an expression.
@@ -1291,6 +1901,11 @@ class Expression (list):
 			
 		Returns:
 			Book instance
+			
+		Notes:
+			The expression is compiled once, and the inputs are planned once at the first point.  The compiled function is then evaluated over all points at once as an array, and the Book is bound from the arrays.
+			
+			Points where the array evaluation is not finite, such as poles, are evaluated again exactly.
 		"""
 		
 		# unpack args
@@ -1305,18 +1920,53 @@ class Expression (list):
 			y = None
 			q = None
 		
-		# evaluate results
-		u = []
-		for i in p:
+		# compile expression
+		v = self.scan()
+		g = self.compile(*v)
+		
+		# attributes
+		n = self.name
+		s = self.jot()
+		
+		# no points
+		if len(p) < 1:
 			
-			# reckon dictionary
-			d = Ex._reckon(f,x,i,y,q)
+			return Bo([],x)
+		
+		# plan bindings at the first point
+		w = Ex._plan(f,x,p[0],y,q)
+		
+		# bind inputs over all points
+		o = np.array([complex(i) for i in p],dtype=complex)
+		d,c = Ex._sweep(w,f,x,o,p,y,q)
+		
+		# evaluate all points
+		try:
+			with np.errstate(all='ignore'):
+				r = g(*[d[k] for k in v])
+				
+		# catch missing variables
+		except KeyError:
+			print('Not all variables accounted for, evaluation aborted.\n')
 			
-			# evaluate
-			u.append(self.evaluate(**d))
+			raise ValueError('Not all variables accounted for, evaluation aborted.\n')
+			
+		# spread over points if independent of them
+		r = np.array(np.broadcast_to(r,o.shape),dtype=complex)
 		
-		# make book
-		r = Bo(u,x)
+		# evaluate exactly where not finite
+		for j in np.flatnonzero(~np.isfinite(r)):
+			u = Ex._apply(w,f,x,p[j],y,q)
+			r[j] = self.evaluate(**u)[0]
+			
+		# inputs that vary by point
+		u = dict(c)
+		for k,i in d.items():
+			if k != x and k not in c:
+				u[k] = i
+			
+		# make book from arrays
+		r = Bo._bind(x,o,r,n,s,u)
 				
 		return r
 		
@@ -1404,6 +2054,8 @@ class Expression (list):
 			
 		Notes:
 			This method allows the 3d plotting of an expression over the real axes of two variables or the complex plane of one variable.  The rectangular plotting area is specified by two corner points, the lower left and the upper right.
+			
+			The whole grid is evaluated at once as arrays, and the arrays are kept in the points and values attributes of the Shelf.
 		"""
 		
 		# remove booleans from *args
@@ -1445,48 +2097,79 @@ class Expression (list):
 		except:
 			q = 32
 			
-		# calculate first axis points
-		u = Ex._points(a.real,b.real,p)
-			
-		# calculate second axis points
-		v = Ex._points(a.imag,b.imag,q)
+		# calculate axis points
+		u = Ex._spread(a.real,b.real,p)
+		v = Ex._spread(a.imag,b.imag,q)
 		
-		# loop through second axis to make shelf
-		h = []
-		for i in v:
-			
-			# progress tracker
-			print('.', end='')
+		# show plot?
+		p = False not in r
+		
+		# mesh into grid, one row for each second axis point
+		m,k = np.meshgrid(u,v)
+		o = m.ravel() + 0j
+		e = k.ravel() + 0j
+		
+		# one complex variable?
+		if not y:
+			o = o + 1j * e
+			e = None
 			
-			# add to **kwargs
-			# two real variables? 
-			if y:
-				f[y] = i
-				w = u
-				
-			# one complex variable?
-			else:
-				w = [Re(j,i) for j in u]
+		# compile expression
+		c = self.scan()
+		g = self.compile(*c)
+		
+		# plan bindings at the first point, and bind inputs over the grid
+		l = o.tolist()
+		w = Ex._plan(f,x,l[0],y,e if e is None else e[0])
+		d,z = Ex._sweep(w,f,x,o,l,y,e)
+		
+		# evaluate whole grid
+		try:
+			with np.errstate(all='ignore'):
+				r = g(*[d[j] for j in c])
 				
-			# evaluate for book
-			if y:
-				z = self.sample(x,w,y,i,**f)
-			else:
-				z = self.sample(x,w,**f)
+		# catch missing variables
+		except KeyError:
+			print('Not all variables accounted for, evaluation aborted.\n')
+			
+			raise ValueError('Not all variables accounted for, evaluation aborted.\n')
 			
-			# put into list of books
-			h.append(z)
+		# spread over grid if independent of it
+		r = np.array(np.broadcast_to(r,o.shape),dtype=complex)
+		
+		# evaluate exactly where not finite
+		for j in np.flatnonzero(~np.isfinite(r)):
+			t = Ex._apply(w,f,x,l[j],y,e if e is None else e[j])
+			r[j] = self.evaluate(**t)[0]
 			
-		# end tracker
-		print('\n')
+		# arrange in rows
+		o = o.reshape(len(v),len(u))
+		r = r.reshape(len(v),len(u))
+		
+		# inputs that vary by point
+		t = {j: i.reshape(len(v),len(u)) for j,i in d.items() if j not in z and j not in (x,y)}
+		
+		# make a book for each row
+		n = self.name
+		s = self.jot()
+		h = []
+		for j in range(len(v)):
+			i = dict(z)
+			if y:
+				i[y] = Re(v[j])
+			for k in t:
+				i[k] = t[k][j]
+			h.append(Bo._bind(x,o[j],r[j],n,s,i))
 			
 		# make Shelf
 		if not y:
 			y = x
 		h = Sh(h,y)
+		h.points = o
+		h.values = r
 			
 		# sculpt
-		if False not in r:
+		if p:
 			h.sculpt()
 		
 		return h
@@ -1538,6 +2221,8 @@ class Expression (list):
 		Notes:
 			The greatest common factor is extracted from top and bottom.  If these two factors have common factors among them, they are cancelled out.
 			
+			The remaining polynomials are divided by their greatest common divisor, so common polynomial factors are cancelled as well.
+			
 			Effectively this method removes all fractions and negative exponents.
 		"""
 		
@@ -1549,6 +2234,16 @@ class Expression (list):
 		m = self.bottom()
 		c,d = m.factor()
 		
+		# cancel greatest common divisor of polynomials
+		# A = H * U * K
+		# C = H * V * L
+		h = a.common(c)
+		if len(h) > 1 or len(h[0].monomial) > 0:
+			a,k = a.quotient(h).factor()
+			c,l = c.quotient(h).factor()
+			b = b.multiply(k)
+			d = d.multiply(l)
+		
 		# get gcf for two gcfs
 		f = Li([b,d],c=False)
 		g = f.extract()
@@ -1569,12 +2264,13 @@ class Expression (list):
 		
 		return Ex(p,q,n)
 		
-	def substitute(self,s,x):
+	def substitute(self,s,x,c=None):
 		"""Substitute an expression for a variable.
 		
 		Arguments:
 			s: Expression instance or string, Line instance, Term instance, pair of integers or integer, substitutes for variable
 			x: string, variable name with optional exponent
+			c=None: dictionary mapping substituting lines to their tables of powers, shared between calls
 			
 		Examples:
 			Consider the expression (2x^2 + 3y - 5).  Substituting (z - 3) for 'x':
@@ -1593,12 +2289,42 @@ class Expression (list):
 			Expression instance
 		"""
 		
-		# convert expression
-		s = Ex(s)
+		# substitute as the only variable
+		w = self.substitute_many({x: s},c)
+			
+		return w
+	
+	def substitute_many(self,d,c=None):
+		"""Substitute expressions for several variables at once.
+		
+		Arguments:
+			d: dictionary mapping variable names with optional exponents to substitutions, each an Expression instance or string, Line instance, Term instance, pair of integers or integer
+			c=None: dictionary mapping substituting lines to their tables of powers, shared between calls
+			
+		Returns:
+			Expression instance
+			
+		Notes:
+			All substitutions are made simultaneously in a single pass over top and bottom, so a variable appearing in one substitution is not replaced by another.
+			
+		Examples:
+			Consider the expression (x y + 1).  Substituting (z - 3) for 'x' and (z + 3) for 'y':
+				
+				self.substitute_many({'x': 'z - 3','y': 'z + 3'})
+				
+			leads to (z^2 - 8).
+		"""
+		
+		# convert expressions
+		s = {k: Ex(i) for k,i in d.items()}
+		
+		# begin power tables
+		if c is None:
+			c = {}
 		
 		# substitute top and bottom
-		t = self.top().substitute(s,x)
-		b = self.bottom().substitute(s,x)
+		t = self.top().substitute_many(s,c)
+		b = self.bottom().substitute_many(s,c)
 		
 		# divide
 		w = Ex(t).divide(Ex(b))
@@ -1611,11 +2337,12 @@ class Expression (list):
 			
 		return w
 			
-	def subtract(self,e):
+	def subtract(self,e,l=False):
 		"""Subtract one expression from another
 		
 		Arguments:
 			e: Expression instance or string, Line instance, Term instance, pair of integers, or integet
+			l=False: boolean, combine over the least common denominator?
 			
 		Returns:
 			Expression instance
@@ -1626,7 +2353,7 @@ class Expression (list):
 		
 		# scale by -1 and add
 		n = e.scale(-1)
-		s = self.add(n)
+		s = self.add(n,l)
 		
 		# keep equation status
 		s.__class__ = self.__class__
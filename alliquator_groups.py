@@ -206,11 +206,8 @@ class Group (list):
 		# build derivatives
 		b = Ex._build(f,p,a,d)
 		
-		# substitute
-		s = self
-		for k in b:
-			s = s.substitute(b[k],k)
-		s = Gr(*s)
+		# substitute all at once
+		s = self.substitute_many(b)
 			
 		# transfer subclass
 		s.__class__ = self.__class__
@@ -341,7 +338,7 @@ class Group (list):
 		
 		return s
 
-	def integrate(self,*g,**f):
+	def integrate(self,*g,_tolerance=None,**f):
 		"""Integrate the expression.
 		
 		Arguments:
@@ -352,6 +349,8 @@ class Group (list):
 				3) number, steps, defaults to 64.
 				4) boolean, False indicates the graph is not to be viewed, defauts to True.
 				
+			_tolerance=None: float, tolerance for adaptive integration, named apart from the variables as for Expression.integrate
+			
 			**f: unpacked dictionary mapping variables to numbers or function objects
 			
 		Returns:
@@ -364,7 +363,7 @@ class Group (list):
 		# integrate all expressions
 		t = []
 		for i in self:
-			s = i.integrate(*g,**f)
+			s = i.integrate(*g,_tolerance=_tolerance,**f)
 			t.append(s)
 		
 		return Bo(t,g[0])
@@ -535,19 +534,51 @@ class Group (list):
 		
 		return s
 		
-	def substitute(self,b,x):
+	def substitute(self,b,x,c=None):
 		"""Substitute an expression for all occurrences of a variable in the group.
 		
 		Arguments:
 			b: Expression instance or expression string to substitute for x
 			x: string, name of variable with optional power
+			c=None: dictionary mapping substituting lines to their tables of powers, shared between calls
+			
+		Returns:
+			Group instance
+		"""
+		
+		# begin power tables, shared by all members
+		if c is None:
+			c = {}
+		
+		# substitute each one
+		g = [i.substitute(b,x,c) for i in self]
+		g = Gr(*g)
+		
+		# transfer subclass
+		g.__class__ = self.__class__
+		
+		return g
+
+	def substitute_many(self,d,c=None):
+		"""Substitute expressions for several variables at once in every member of the group.
+		
+		Arguments:
+			d: dictionary mapping names of variables with optional powers to Expression instances or expression strings
+			c=None: dictionary mapping substituting lines to their tables of powers, shared between calls
 			
 		Returns:
 			Group instance
 		"""
 		
+		# begin power tables, shared by all members
+		if c is None:
+			c = {}
+			
+		# convert substitutions once
+		d = {k: Ex(i) for k,i in d.items()}
+		
 		# substitute each one
-		g = [i.substitute(b,x) for i in self]
+		g = [i.substitute_many(d,c) for i in self]
 		g = Gr(*g)
 		
 		# transfer subclass
@@ -1,6 +1,13 @@
 # alliquator_lines.py
 # class to manipulate lists of terms
 
+# import math
+import math
+gcd = math.gcd
+
+# import fractions
+from fractions import Fraction
+
 # import results
 import alliquator_results as aq_re
 Re = aq_re.Result
@@ -22,8 +29,14 @@ class Line (list):
 	"""A Line is a list of Term instances
 	
 	Line class inherits from list.
+	
+	class attributes:
+		threshold: integer, number of pairwise products above which dense multiplication is attempted
 	"""
 	
+	# dense multiplication threshold
+	threshold = 1 << 10
+	
 	def __init__(self,l=None,c=True):
 		"""Define a line as a list of Term instances.
 		
@@ -39,6 +52,8 @@ class Line (list):
 			
 			Condensation will add together compatible terms.
 			
+			Terms are always kept in graded reverse lexicographic order, so equal lines hold equal terms in the same positions.
+			
 		Examples:
 			The line (3x + (5/2)y^2 -2x y) is a list of 3 terms, 3x, (5/2)y^2, and -2x y.  It may be entered as the string:
 				
@@ -69,13 +84,53 @@ class Line (list):
 		if c:
 			l = Li._condense(l)
 			
-		# deposit terms, skip zeroes
-		for i in l:
-			if 0 not in i:
-				self.append(i)
+		# deposit terms in order, skip zeroes
+		l = [i for i in l if i.coefficient != 0]
+		self.extend(Li._order(l))
 		
 	
 	# static methods
+	@staticmethod
+	def _accumulate(w,a,b):
+		"""Accumulate the products of two lists of terms into a map.
+		
+		Arguments:
+			w: dictionary mapping pairs of monomial and imaginary unit to coefficients
+			a: list of Term instances
+			b: list of Term instances
+			
+		Returns:
+			None
+		"""
+		
+		# make shorter list the outer loop
+		if len(b) < len(a):
+			a,b = b,a
+			
+		# unpack the second list once
+		b = [(j.coefficient,j.unit,j.monomial) for j in b]
+		
+		# accumulate products
+		merge = Te._merge
+		for i in a:
+			c = i.coefficient
+			e = i.unit
+			m = i.monomial
+			for d,f,n in b:
+				
+				# fold i^2 into the sign
+				g = c * d
+				h = e + f
+				if h > 1:
+					g = -g
+					h -= 2
+					
+				# add into map
+				k = (merge(m,n),h)
+				w[k] = w.get(k,0) + g
+				
+		return None
+	
 	@staticmethod
 	def _condense(a,b=None):
 		"""Condense two lists of terms into one list by adding the first into the second.
@@ -86,72 +141,161 @@ class Line (list):
 			
 		Returns:
 			list of Term instances
+			
+		Notes:
+			Terms are matched by their monomial and imaginary unit in a dictionary, so condensation takes a single pass.
 		"""
 		
 		# second is by default empty
 		if b is None:
 			b = []
 		
-		# add first into second
-		for i in a:
+		# terms keyed by monomial and imaginary unit, in order of appearance
+		d = {}
+		for i in list(b) + list(a):
 			
-			# try to add onto all terms
-			t = [i.add(j) for j in b]
-			
-			# check for match
-			m = False
-			for n,j in enumerate(t):
-				if j is not None:
-						
-					# replace with combination
-					b[n] = j
-						
-					# stop searching
-					m = True
-					break
+			# skip zeroes
+			if i.coefficient == 0:
+				continue
+			
+			# add onto matching term
+			k = (i.monomial,i.unit)
+			if k in d:
+				j = d[k].add(i)
 				
+				# remove zeroes, so a later match starts over at the end
+				if j.coefficient == 0:
+					del d[k]
+				else:
+					d[k] = j
+					
 			# otherwise append
-			if not m:
-				b.append(i)
+			else:
+				d[k] = i
 			
-			# remove zeroes
-			zo = lambda x: 0 in x
-			b = [i for i in b if not zo(i)]
+		# make list
+		b = list(d.values())
 			
 		return b
 		
 		
 	@staticmethod
-	def _distribute(p,t):
-		"""Distribute a number of exponents amongst a number of terms in all ways possible.
+	def _content(p,k):
+		"""Find the content of a polynomial with respect to one variable, the greatest common divisor of its coefficients.
 		
 		Arguments:
-			p: integer, exponent
-			t: integer, number of terms
+			p: dictionary mapping tuples of exponents to pairs of Fractions, the polynomial
+			k: integer, index of the variable
 			
 		Returns:
-			list of tuples, the distributions
+			dictionary mapping tuples of exponents to pairs of Fractions
+			
+		Notes:
+			The coefficients are themselves polynomials in the variables after index k.
 		"""
 		
-		# begin list with power
-		l = [[p]]
-		for i in range(t - 1):
+		# gather coefficients by exponent of the variable
+		w = {}
+		for e,c in p.items():
+			j = e[:k] + (0,) + e[k + 1:]
+			w.setdefault(e[k],{})[j] = c
+			
+		# take greatest common divisor of all coefficients, stopping at a constant
+		w = list(w.values())
+		g = w[0]
+		for i in w[1:]:
+			if len(g) == 1 and not any(list(g.keys())[0]):
+				break
+			g = Li._greatest(g,i,k + 1)
 			
-			# expand the first members
-			for n,j in enumerate(l):
-				f = Li._fracture(j[0])
+		return g
+		
+	@staticmethod
+	def _convert(l,v):
+		"""Convert a list of terms into a polynomial map with Gaussian rational coefficients.
+		
+		Arguments:
+			l: list of Term instances, with no negative exponents
+			v: list of strings, the variables
+			
+		Returns:
+			dictionary mapping tuples of exponents to pairs of Fractions, the real and imaginary parts
+		"""
+		
+		# position of each variable
+		o = {k: n for n,k in enumerate(v)}
+		
+		# fold each term into its monomial
+		p = {}
+		for i in l:
+			e = [0] * len(v)
+			for k,j in i.monomial:
+				e[o[k]] = j
+			e = tuple(e)
 				
-				# recombine with tails
-				l[n] = [k + j[1:] for k in f]
+			# add to real or imaginary part
+			a,b = p.get(e,(0,0))
+			if i.unit:
+				b += i.coefficient
+			else:
+				a += i.coefficient
+			p[e] = (a,b)
 			
-			# unpack lists
-			l = [k for j in l for k in j]
+		# remove zeroes
+		p = {e: c for e,c in p.items() if c != (0,0)}
 			
-		# make tuples
-		l = [tuple(i) for i in l]
-				
-		return l
+		return p
+		
+	@staticmethod
+	def _exact(p,q):
+		"""Divide one polynomial map exactly by another.
+		
+		Arguments:
+			p: dictionary mapping tuples of exponents to pairs of Fractions, the dividend
+			q: dictionary mapping tuples of exponents to pairs of Fractions, the divisor
+			
+		Returns:
+			dictionary mapping tuples of exponents to pairs of Fractions, or None if the division is not exact
 			
+		Notes:
+			Leading terms are taken in lexicographic order.  Whenever the division is exact the leading term of the remainder is divisible by the leading term of the divisor, so the first failure ends the division.
+		"""
+		
+		# leading term of divisor, and its inverse
+		f = max(q)
+		a,b = q[f]
+		n = Fraction(a * a + b * b)
+		a,b = a / n,-b / n
+		
+		# divide leading terms until nothing remains
+		r = dict(p)
+		w = {}
+		while r:
+			g = max(r)
+			e = tuple([x - y for x,y in zip(g,f)])
+			if any([x < 0 for x in e]):
+				
+				return None
+				
+			# quotient term
+			c,d = r[g]
+			s = (c * a - d * b,c * b + d * a)
+			w[e] = s
+			
+			# subtract its product with the divisor
+			c,d = s
+			for h,(x,y) in q.items():
+				k = tuple([i + j for i,j in zip(h,e)])
+				u,z = r.get(k,(0,0))
+				u -= c * x - d * y
+				z -= c * y + d * x
+				if u == 0 and z == 0:
+					r.pop(k,None)
+				else:
+					r[k] = (u,z)
+					
+		return w
+	
 	@staticmethod
 	def _expand(l,p,d=None):
 		"""Expand a list of terms taken to a power.
@@ -159,12 +303,17 @@ class Line (list):
 		Arguments:
 			l: list of Term instances
 			p: integer, power
-			d=None: dictionary mapping tuples of exponents to calculated terms
+			d=None: dictionary mapping pairs of term index and exponent to calculated term powers
 			
 		Returns:
 			tuple:
-				list of Term instances,
-				dictionary mapping tuples of exponents to calculated terms
+				list of Term instances, condensed and in order,
+				dictionary mapping pairs of term index and exponent to calculated term powers
+				
+		Notes:
+			The list is squared once to gauge its density.  If most products of pairs of terms are distinct, the list is sparse, and the multinomial terms are streamed one at a time, with partial products shared between neighbouring terms.  Otherwise the power is built by repeated squaring, which condenses along the way.
+			
+			Negative powers are treated as positive.
 		"""
 		
 		# number of terms
@@ -173,103 +322,733 @@ class Line (list):
 		# make power positive
 		p = abs(int(p))
 		
+		# begin dictionary
+		if d is None:
+			d = {}
+		
 		# return 1 if power is zero:
 		if p == 0:
 			
-			return [{}],d
+			return [Te(1)],d
 			
 		# or return zero if length is zero
 		if t < 1:
 			
 			return [],d
-		
-		# initiate dictionary
-		if d is None:
 			
-			# begin with tuple of zeroes, i.e., all terms to the power of zero
-			o = (0,) * t
-			d = {o: Te(1)}
-		
-		# build matrix of each term
-		m = []
-		for i in range(t):
+		# or return the same terms for a power of one
+		if p == 1:
+			
+			return Li._order([i for i in l if i.coefficient != 0]),d
+			
+		# or power of a single term
+		if t == 1:
+			w = [l[0].power(p)]
+			w = [i for i in w if i.coefficient != 0]
+			
+			return w,d
+			
+		# square once
+		s = Li._product(l,l)
+		if p == 2:
+			
+			return s,d
+			
+		# dense lists by repeated squaring
+		if 4 * len(s) < t * (t + 1):
+			w = Li._square(l,p,s)
+			
+			return w,d
 			
-			# taken to each power
+		# extend the factorial table as needed
+		f = Te.factorials
+		while len(f) <= p:
+			f.append(f[-1] * len(f))
+			
+		# table of each term to each power, divided by the factorial of the power
+		m = []
+		for n,i in enumerate(l):
 			r = []
 			for j in range(p + 1):
 				
-				# make tuple
-				o = [0] * t
-				o[i] = j
-				o = tuple(o)
-				
-				# try to find in dictionary
-				try:
-					x = d[o]
+				# try to find in dictionary, otherwise calculate
+				k = (n,j)
+				if k not in d:
+					d[k] = i.power(j)
+				x = d[k]
 				
-				# otherwise calculate and put in dictionary
-				except:
-					x = l[i].power(j)
-					d[o] = x
-				
-				# put in matrix
-				r.append(x)
+				# add to row
+				r.append((x.coefficient / f[j],x.unit,x.monomial))
 				
 			# add row
 			m.append(r)
 			
-		# get permutations
-		u = Li._distribute(p,t)
+		# walk all distributions of the power amongst the terms
+		merge = Te._merge
+		w = {}
+		h = [(0,p,1,0,())]
+		while h:
+			n,r,c,e,v = h.pop()
+			
+			# last term takes all remaining power
+			o = range(r + 1)
+			if n == t - 1:
+				o = [r]
+				
+			# multiply in each power of this term
+			for j in o:
+				a,b,g = m[n][j]
+				
+				# fold i^2 into the sign
+				x = c * a
+				y = e + b
+				if y > 1:
+					x = -x
+					y -= 2
+					
+				# merge monomials
+				z = merge(v,g)
+				
+				# add into map
+				if n == t - 1:
+					k = (z,y)
+					w[k] = w.get(k,0) + x
+					
+				# or continue to next term
+				else:
+					h.append((n + 1,r - j,x,y,z))
+					
+		# make terms with multinomial coefficients, skipping zeroes
+		a = f[p]
+		w = [Te._make(a * x,y,z) for (z,y),x in w.items() if x != 0]
+		w = Li._order(w)
 		
-		# multinomial corfficient is p! / k1! k2! k3! ...
-		# compute leading factorial
-		f = Te.factorials
-		try:
-			a = f[p]
-		except:
-			a = fac(p)
+		return w,d
+		
+	@staticmethod
+	def _grade(*l):
+		"""Make a sorting key for graded reverse lexicographic order over all variables in several lists of terms.
+		
+		Arguments:
+			*l: unpacked tuple of lists of Term instances
 			
-		# compute terms
-		w = []
-		for i in u:
+		Returns:
+			function object, mapping a Term instance to its sorting key
+			
+		Notes:
+			Terms of higher total degree come first.  Ties are broken by the last variable in the variable table, with the lower exponent coming first, then the next to last, and so on.  Real terms come before imaginary terms with the same monomial.
+			
+			Variables absent from a term count as exponent zero, so keys made over any set of variables containing both terms order them the same way.
+		"""
+		
+		# all variables, last in table first
+		v = set([k for j in l for i in j for k,e in i.monomial])
+		v = sorted(v,key=lambda x: Te.table[x],reverse=True)
+		
+		# key is degree, reversed negative exponents, and negative imaginary unit
+		def g(t):
+			e = dict(t.monomial)
+			d = sum(e.values())
+			r = tuple([-e.get(k,0) for k in v])
+			
+			return d,r,-t.unit
+			
+		return g
+	
+	@staticmethod
+	def _greatest(p,q,k=0):
+		"""Find the greatest common divisor of two polynomial maps.
+		
+		Arguments:
+			p: dictionary mapping tuples of exponents to pairs of Fractions
+			q: dictionary mapping tuples of exponents to pairs of Fractions
+			k=0: integer, index of the main variable
 			
-			# compute multinomial
-			b = 1
-			c = []
-			for n,j in enumerate(i):
+		Returns:
+			dictionary mapping tuples of exponents to pairs of Fractions, monic in lexicographic order
+			
+		Notes:
+			The polynomials may only contain the variables from index k onward.  Each is split into its content and primitive part with respect to the main variable.  The contents are handled recursively in the remaining variables, and the primitive parts by a primitive pseudo-remainder sequence.
+			
+			Coefficients are Gaussian rationals, so every nonzero constant is a unit and constant divisors are reported as one.
+		"""
+		
+		# one as a polynomial
+		z = (0,) * len(list(p.keys() or q.keys())[0])
+		o = {z: (Fraction(1),Fraction(0))}
+		
+		# divisor with zero is the other polynomial
+		if not p:
+			
+			return Li._primitive(q,k) if q else {}
+			
+		if not q:
+			
+			return Li._primitive(p,k)
+			
+		# no variables left, or a constant
+		if k >= len(z) or (len(p) == 1 and z in p) or (len(q) == 1 and z in q):
+			
+			return o
+			
+		# split off contents
+		c = Li._greatest(Li._content(p,k),Li._content(q,k),k + 1)
+		p = Li._primitive(p,k)
+		q = Li._primitive(q,k)
+		
+		# put higher degree first
+		if max([e[k] for e in p]) < max([e[k] for e in q]):
+			p,q = q,p
+			
+		# primitive pseudo-remainder sequence
+		while True:
+			
+			# last nonzero remainder is the divisor
+			if not q:
+				g = p
+				break
+				
+			# but a remainder free of the main variable means the primitive parts are coprime
+			if max([e[k] for e in q]) == 0:
+				g = o
+				break
 				
-				# look for factorial or compute
-				try:
-					b *= f[j]
-				except:
-					b *= fac(j)
+			# next remainder
+			r = Li._remainder(p,q,k)
+			p = q
+			q = Li._primitive(r,k) if r else r
+			
+		# combine with divisor of contents
+		g = Li._times(c,g)
+		g = Li._primitive(g,len(z))
+		
+		return g
+	
+	@staticmethod
+	def _heuristic(p,q):
+		"""Find the greatest common divisor of two polynomial maps with real coefficients by the heuristic method.
+		
+		Arguments:
+			p: dictionary mapping tuples of exponents to pairs of Fractions, with no imaginary parts
+			q: dictionary mapping tuples of exponents to pairs of Fractions, with no imaginary parts
+			
+		Returns:
+			dictionary mapping tuples of exponents to pairs of Fractions, monic in lexicographic order, or None if the method fails
+			
+		Notes:
+			The coefficients are first cleared of denominators.  One variable at a time is then replaced by a large integer, until only the integer divisor of two numbers is left.  The divisor is recovered a variable at a time from the digits of its image in that integer as base, taken as symmetric remainders.
+			
+			If the primitive part of the recovered divisor divides both polynomials, then it is their greatest common divisor, provided the integer exceeds twice the size of their coefficients.  Otherwise the integer is raised and the evaluation tried again, up to six times before giving up.
+			
+			Divisors that are constants are found after a single evaluation of each variable, so that coprime polynomials are recognized quickly.
+		"""
+		
+		# zero exponents
+		z = (0,) * len(list(p.keys())[0])
+		
+		# clear denominators
+		def clear(p):
+			m = 1
+			for a,b in p.values():
+				m = m * a.denominator // math.gcd(m,a.denominator)
+				
+			return {e: int(a * m) for e,(a,b) in p.items()}
+			
+		# evaluate variable k at x
+		def evaluate(p,k,x):
+			w = {}
+			for e,c in p.items():
+				j = e[:k] + (0,) + e[k + 1:]
+				w[j] = w.get(j,0) + c * x ** e[k]
+				
+			return {e: c for e,c in w.items() if c != 0}
+			
+		# recover variable k from digits in base x
+		def interpolate(h,k,x):
+			w = {}
+			n = 0
+			while h:
+				g = {}
+				for e,c in h.items():
+					c = c % x
+					if c > x // 2:
+						c -= x
+					if c != 0:
+						g[e] = c
+						w[e[:k] + (n,) + e[k + 1:]] = c
+				h = {e: (c - g.get(e,0)) // x for e,c in h.items()}
+				h = {e: c for e,c in h.items() if c != 0}
+				n += 1
+				
+			return w
+			
+		# integer content
+		def content(*l):
+			g = 0
+			for h in l:
+				for c in h.values():
+					g = math.gcd(g,c)
 					
-				# append term
-				c.append(m[n][j])
+			return g
 			
-			# multiply out term
-			w.append(Te(a,b,*c))
+		# test exact division
+		def divides(h,p):
+			if len(h) == 1 and z in h:
+				
+				return True
+				
+			r = Li._exact({e: (Fraction(c),Fraction(0)) for e,c in p.items()},{e: (Fraction(c),Fraction(0)) for e,c in h.items()})
+			
+			return r is not None
+			
+		# divisor with variables from k onward
+		def heuristic(p,q,k):
+			
+			# split off common integer content, as it may hold factors in variables already evaluated
+			m = content(p,q)
+			p = {e: c // m for e,c in p.items()}
+			q = {e: c // m for e,c in q.items()}
+			
+			# integer divisor if no variables left
+			if k >= len(z):
+				
+				return {z: m * math.gcd(p.get(z,0),q.get(z,0))}
+				
+			# skip variable if absent
+			if not any([e[k] for e in p]) and not any([e[k] for e in q]):
+				h = heuristic(p,q,k + 1)
+				
+				return {e: c * m for e,c in h.items()} if h is not None else None
+				
+			# begin with integer above twice the coefficients
+			a = max([abs(c) for c in p.values()])
+			b = max([abs(c) for c in q.values()])
+			n = 2 * min(a,b) + 29
+			x = max(min(n,99 * math.isqrt(n)),2 * min(a // abs(p[max(p)]),b // abs(q[max(q)])) + 2)
+			
+			# try six integers
+			for i in range(6):
+				
+				# divisor of images
+				f = evaluate(p,k,x)
+				g = evaluate(q,k,x)
+				if f and g:
+					h = heuristic(f,g,k + 1)
+					
+					# recover and test divisor
+					if h is not None:
+						h = interpolate(h,k,x)
+						u = content(h)
+						h = {e: c // u for e,c in h.items()}
+						if divides(h,p) and divides(h,q):
+							
+							return {e: c * m for e,c in h.items()}
+							
+				# raise integer
+				x = 73794 * x * math.isqrt(math.isqrt(x)) // 27011
+				
+			return None
+			
+		# find divisor
+		h = heuristic(clear(p),clear(q),0)
+		if h is None:
+			
+			return None
+			
+		# scale to monic
+		h = Li._primitive({e: (Fraction(c),Fraction(0)) for e,c in h.items()},len(z))
 		
-		return w,d
+		return h
+	
+	@staticmethod
+	def _kronecker(a,b):
+		"""Multiply two dense lists of terms by Kronecker substitution.
+		
+		Arguments:
+			a: list of Term instances
+			b: list of Term instances
+			
+		Returns:
+			list of Term instances in order, or None if the lists are too sparse
+			
+		Notes:
+			The exponents of all variables are packed into a single index, with strides wide enough that the product cannot spill from one variable into the next.  Coefficients are scaled to integers, split into real and imaginary parts, and packed as the digits of one large integer per part, with digits wide enough to hold any coefficient of the product.  The product is then at most three exact large integer multiplications, unpacked back into terms.
+			
+			If the packed index range of the product is large compared with the number of pairwise products, None is returned so the sparse path is used instead.
+		"""
 		
+		# all variables, in table order
+		v = set([k for j in (a,b) for i in j for k,e in i.monomial])
+		v = sorted(v,key=lambda x: Te.table[x])
+		o = {k: n for n,k in enumerate(v)}
+		
+		# exponents of each term, with lowest and highest of each variable
+		def span(l):
+			e = [[0] * len(v) for i in l]
+			for r,i in zip(e,l):
+				for k,j in i.monomial:
+					r[o[k]] = j
+			f = [min(c) for c in zip(*e)]
+			g = [max(c) for c in zip(*e)]
+			
+			return e,f,g
+			
+		x,f,g = span(a)
+		y,h,u = span(b)
+		
+		# size and stride of each variable in the packed index
+		s = [q - p + t - r + 1 for p,q,r,t in zip(f,g,h,u)]
+		z = []
+		n = 1
+		for i in s:
+			z.append(n)
+			n *= i
+			
+		# too sparse
+		if n * 4 > len(a) * len(b):
+			
+			return None
+			
+		# scale to integers and gather real and imaginary parts at each index
+		def pack(l,e,m):
+			d = 1
+			for i in l:
+				c = i.coefficient.denominator
+				d = d * c // gcd(d,c)
+				
+			# real and imaginary maps
+			r = {}
+			q = {}
+			for i,j in zip(l,e):
+				k = sum([(c - p) * w for c,p,w in zip(j,m,z)])
+				c = (i.coefficient * d).numerator
+				if i.unit:
+					q[k] = c
+				else:
+					r[k] = c
+					
+			return r,q,d
+			
+		r,q,d = pack(a,x,f)
+		t,w,c = pack(b,y,h)
+		
+		# digit width in bytes, with room for the sign
+		p = max([abs(i) for i in list(r.values()) + list(q.values())])
+		m = max([abs(i) for i in list(t.values()) + list(w.values())])
+		m = 4 * p * m * min(len(a),len(b))
+		k = m.bit_length() // 8 + 1
+		
+		# pack a map into a large integer, positive and negative digits separately
+		def join(r):
+			p = bytearray(k * n)
+			m = bytearray(k * n)
+			for i,c in r.items():
+				if c > 0:
+					p[i * k:(i + 1) * k] = c.to_bytes(k,'little')
+				elif c < 0:
+					m[i * k:(i + 1) * k] = (-c).to_bytes(k,'little')
+					
+			return int.from_bytes(p,'little') - int.from_bytes(m,'little')
+			
+		# unpack a large integer into signed digits, offsetting each digit by half its range
+		e = 1 << (8 * k - 1)
+		l = int.from_bytes(e.to_bytes(k,'little') * n,'little')
+		def split(p):
+			p = (p + l).to_bytes(k * n,'little')
+			p = [int.from_bytes(p[i * k:(i + 1) * k],'little') - e for i in range(n)]
+			
+			return p
+			
+		# multiply real parts
+		p = split(join(r) * join(t))
+		m = [0] * n
+		
+		# and imaginary parts, using
+		# (A + B i) (C + D i) = (AC - BD) + ((A + B)(C + D) - AC - BD) i
+		if q or w:
+			g = split(join(q) * join(w))
+			i = {j: r.get(j,0) + q.get(j,0) for j in set(r) | set(q)}
+			j = {j: t.get(j,0) + w.get(j,0) for j in set(t) | set(w)}
+			m = split(join(i) * join(j))
+			m = [i - j - y for i,j,y in zip(m,p,g)]
+			p = [i - y for i,y in zip(p,g)]
+			
+		# lowest exponents of product
+		h = [i + j for i,j in zip(f,h)]
+			
+		# unpack indices into terms
+		d *= c
+		w = []
+		for i,(c,g) in enumerate(zip(p,m)):
+			if c == 0 and g == 0:
+				continue
+				
+			# exponents from index
+			u = []
+			for k,x,y,j in zip(v,z,s,h):
+				e = (i // x) % y + j
+				if e != 0:
+					u.append((k,e))
+			u = tuple(u)
+			
+			# real and imaginary terms
+			if c != 0:
+				w.append(Te._make(Fraction(c,d),0,u))
+			if g != 0:
+				w.append(Te._make(Fraction(g,d),1,u))
+				
+		return Li._order(w)
+	
 	@staticmethod
-	def _fracture(n):
-		"""Fractute an integer into all possible pairs.
+	def _make(l):
+		"""Make a Line instance directly from a list of terms already condensed and in order.
 		
 		Arguments:
-			n: integer
+			l: list of Term instances
 			
 		Returns:
-			list of lists, combinations.
+			Line instance
 		"""
 		
-		# make all fractures
-		f = []
-		for i in range(n + 1):
-			f.append([n - i, i])
+		# bypass the constructor
+		n = Li.__new__(Li)
+		n.extend(l)
+		
+		return n
+	
+	@staticmethod
+	def _order(l):
+		"""Sort a list of terms into graded reverse lexicographic order.
+		
+		Arguments:
+			l: list of Term instances
 			
-		return f
+		Returns:
+			list of Term instances
+		"""
+		
+		# sort by key, largest first
+		g = Li._grade(l)
+		l = sorted(l,key=g,reverse=True)
 		
+		return l
+	
+	@staticmethod
+	def _powers(l,p,c):
+		"""Retrieve the powers of a list of terms from a table, extending it by successive multiplication as needed.
+		
+		Arguments:
+			l: list of Term instances
+			p: integer, highest power needed
+			c: dictionary mapping tuples of terms to lists of their powers
+			
+		Returns:
+			list of lists of Term instances, indexed by power
+		"""
+		
+		# begin table with one
+		k = tuple(l)
+		if k not in c:
+			c[k] = [[Te(1)]]
+			
+		# extend
+		w = c[k]
+		while len(w) <= p:
+			w.append(Li._product(w[-1],l))
+			
+		return w
+	
+	@staticmethod
+	def _primitive(p,k):
+		"""Find the primitive part of a polynomial map with respect to one variable, scaled to be monic in lexicographic order.
+		
+		Arguments:
+			p: dictionary mapping tuples of exponents to pairs of Fractions
+			k: integer, index of the variable
+			
+		Returns:
+			dictionary mapping tuples of exponents to pairs of Fractions
+		"""
+		
+		# divide out content, unless no variables are left
+		if k < len(list(p.keys())[0]):
+			c = Li._content(p,k)
+			if len(c) > 1 or any(list(c.keys())[0]):
+				p = Li._exact(p,c)
+			
+		# divide by the leading coefficient
+		a,b = p[max(p)]
+		n = Fraction(a * a + b * b)
+		a,b = a / n,-b / n
+		p = {e: (c * a - d * b,c * b + d * a) for e,(c,d) in p.items()}
+		
+		return p
+	
+	@staticmethod
+	def _product(a,b):
+		"""Multiply two lists of terms into an ordered list of terms.
+		
+		Arguments:
+			a: list of Term instances
+			b: list of Term instances
+			
+		Returns:
+			list of Term instances
+			
+		Notes:
+			Products are accumulated directly into a map from monomial and imaginary unit to coefficient, so no intermediate Term instances are made and no separate condensing is needed.
+			
+			Above the threshold number of pairwise products, dense lists are multiplied by Kronecker substitution instead.
+		"""
+		
+		# try dense multiplication for large lists
+		if len(a) * len(b) >= Li.threshold:
+			w = Li._kronecker(a,b)
+			if w is not None:
+				
+				return w
+		
+		# accumulate products
+		w = {}
+		Li._accumulate(w,a,b)
+				
+		# make terms, skipping zeroes
+		make = Te._make
+		w = [make(g,h,k) for (k,h),g in w.items() if g != 0]
+		
+		return Li._order(w)
+	
+	@staticmethod
+	def _remainder(p,q,k):
+		"""Find the pseudo-remainder of one polynomial map divided by another with respect to one variable.
+		
+		Arguments:
+			p: dictionary mapping tuples of exponents to pairs of Fractions, the dividend
+			q: dictionary mapping tuples of exponents to pairs of Fractions, the divisor
+			k: integer, index of the variable
+			
+		Returns:
+			dictionary mapping tuples of exponents to pairs of Fractions
+			
+		Notes:
+			At each step the remainder is multiplied by the leading coefficient of the divisor before the leading term is cancelled, so no division of coefficients is needed.
+		"""
+		
+		# split a polynomial by exponent of the variable
+		def split(r):
+			d = max([e[k] for e in r])
+			c = {e[:k] + (0,) + e[k + 1:]: v for e,v in r.items() if e[k] == d}
+			
+			return d,c
+			
+		# leading coefficient of divisor
+		d,a = split(q)
+		
+		# cancel leading terms until degree drops below divisor
+		r = p
+		while r:
+			f,b = split(r)
+			if f < d:
+				break
+				
+			# shift divisor up to the same degree
+			s = {e[:k] + (e[k] + f - d,) + e[k + 1:]: v for e,v in q.items()}
+			
+			# multiply through and subtract
+			x = Li._times(a,r)
+			y = Li._times(b,s)
+			for e,(u,v) in y.items():
+				g,h = x.get(e,(0,0))
+				g -= u
+				h -= v
+				if g == 0 and h == 0:
+					x.pop(e,None)
+				else:
+					x[e] = (g,h)
+			r = x
+			
+		return r
+	
+	@staticmethod
+	def _revert(p,v):
+		"""Revert a polynomial map back into a list of terms.
+		
+		Arguments:
+			p: dictionary mapping tuples of exponents to pairs of Fractions
+			v: list of strings, the variables, in table order
+			
+		Returns:
+			list of Term instances, in order
+		"""
+		
+		# make real and imaginary terms
+		w = []
+		for e,(a,b) in p.items():
+			m = tuple([(k,j) for k,j in zip(v,e) if j != 0])
+			if a != 0:
+				w.append(Te._make(a,0,m))
+			if b != 0:
+				w.append(Te._make(b,1,m))
+				
+		return Li._order(w)
+	
+	@staticmethod
+	def _square(l,p,s=None):
+		"""Raise a list of terms to a power by repeated squaring.
+		
+		Arguments:
+			l: list of Term instances
+			p: integer, positive power
+			s=None: list of Term instances, the square if already calculated
+			
+		Returns:
+			list of Term instances, in order
+		"""
+		
+		# begin with one
+		w = [Te(1)]
+		b = l
+		
+		# multiply in the running square at each bit of the power
+		while p > 0:
+			if p & 1:
+				w = Li._product(w,b)
+				
+			# square for the next bit
+			p >>= 1
+			if p > 0:
+				if s is None:
+					s = Li._product(b,b)
+				b = s
+				s = None
+				
+		return w
+	
+	@staticmethod
+	def _times(p,q):
+		"""Multiply two polynomial maps.
+		
+		Arguments:
+			p: dictionary mapping tuples of exponents to pairs of Fractions
+			q: dictionary mapping tuples of exponents to pairs of Fractions
+			
+		Returns:
+			dictionary mapping tuples of exponents to pairs of Fractions
+		"""
+		
+		# accumulate products
+		w = {}
+		for e,(a,b) in p.items():
+			for f,(c,d) in q.items():
+				k = tuple([i + j for i,j in zip(e,f)])
+				x,y = w.get(k,(0,0))
+				w[k] = (x + a * c - b * d,y + a * d + b * c)
+				
+		# remove zeroes
+		w = {k: c for k,c in w.items() if c != (0,0)}
+				
+		return w
+	
 	@staticmethod
 	def _translate(s):
 		"""Generate a list of Term instances from a string.
@@ -506,23 +1285,84 @@ class Line (list):
 		
 		Arguments:
 			l: Line instance, Term instance, pair of integers, or integer 
-			s: boolean, sort terms afterward?
+			s: boolean, kept for compatibility, as terms are always in order
 			
 		Returns:
 			Line instance
+			
+		Notes:
+			Both lines are in order, so they are merged in a single pass.
 		"""
 				
 		# make line
-		s = self.copy()
-		l = Li(l)
-		a = Li._condense(l,s)
-		a = Li(a,c=False)
+		if not isinstance(l,Line):
+			l = Li(l)
+			
+		# key both lines over all their variables
+		g = Li._grade(self,l)
+		a = [(g(i),i) for i in self]
+		b = [(g(j),j) for j in l]
+		
+		# merge
+		w = []
+		m = 0
+		n = 0
+		while m < len(a) and n < len(b):
+			x,i = a[m]
+			y,j = b[n]
+			
+			# take the larger
+			if x > y:
+				w.append(i)
+				m += 1
+			elif y > x:
+				w.append(j)
+				n += 1
+				
+			# or add matching terms, skipping zeroes
+			else:
+				t = i.add(j)
+				if t.coefficient != 0:
+					w.append(t)
+				m += 1
+				n += 1
+				
+		# add leftovers
+		w += [i for x,i in a[m:]]
+		w += [j for y,j in b[n:]]
+		
+		return Li._make(w)
+		
+	def antiderive(self,x):
+		"""Take the antiderivative of all terms in a line.
+		
+		Arguments:
+			x: string, variable name
 			
-		# sort?
-		if s:
-			a = a.sort()
+		Returns:
+			Line instance, or
+			None if any term has x^-1
 			
-		return a
+		Notes:
+			Raising the exponent of x in each term gives distinct terms, so they need only be put back in order.
+		"""
+		
+		# antiderive term by term
+		l = []
+		for i in self:
+			t = i.antiderive(x)
+			
+			# logarithm is beyond a line
+			if t is None:
+				
+				return None
+				
+			l.append(t)
+			
+		# reorder
+		l = Li._make(Li._order(l))
+			
+		return l
 	
 	def compare(self,l):
 		"""Test whether two lines are equal.
@@ -534,23 +1374,77 @@ class Line (list):
 			boolean, lines equal?
 		"""
 		
-		# assume equality
-		q = True
+		# lengths must be equal
+		q = len(self) == len(l)
 		
-		# test term by term
-		for i,j in zip(self,l):
-			
-			# break at first mismatch
-			if not i.compare(j):
-				q = False
-				break
+		# terms are in order, so test term by term
+		if q:
+			for i,j in zip(self,l):
 				
-		# make sure lengths are also equal
-		if len(self) != len(l):
-			q = False
+				# break at first mismatch
+				if i != j:
+					q = False
+					break
 				
 		return q
 
+	def common(self,l):
+		"""Find the greatest common divisor with another line.
+		
+		Arguments:
+			l: Line instance, Term instance, pair of numbers or number
+			
+		Returns:
+			Line instance
+			
+		Notes:
+			The greatest common factor of the terms in each line is split off first, and the divisor of those two factors is found as for any list of terms.  The divisor of the remaining polynomials is found by the heuristic method if their coefficients are real.  Otherwise, or if that fails, they are divided recursively, one variable at a time, with primitive pseudo-remainder sequences.
+			
+			Because coefficients may be any Gaussian rational, the divisor is only determined up to a constant.  It is scaled so that its leading coefficient in lexicographic order is one before the common factor of terms is restored.
+			
+		Examples:
+			The greatest common divisor of (2x^2 - 2y^2) and (4x^2 + 4xy) is 2(x + y).
+		"""
+		
+		# convert to line
+		if not isinstance(l,Line):
+			l = Li(l)
+			
+		# divisor with zero is the other line
+		if len(self) < 1:
+			
+			return l.copy()
+			
+		if len(l) < 1:
+			
+			return self.copy()
+		
+		# split off greatest common factors
+		a,f = self.factor()
+		b,g = l.factor()
+		h = Li([f,g],c=False).extract()
+		
+		# all variables, in table order
+		v = set([k for j in (a,b) for i in j for k,e in i.monomial])
+		v = sorted(v,key=lambda x: Te.table[x])
+		
+		# find divisor of polynomials, by the heuristic method if coefficients are real
+		p = Li._convert(a,v)
+		q = Li._convert(b,v)
+		d = None
+		if not any([c[1] for c in list(p.values()) + list(q.values())]):
+			d = Li._heuristic(p,q)
+			
+		# otherwise by pseudo-remainder sequences
+		if d is None:
+			d = Li._greatest(p,q)
+		d = Li._revert(d,v)
+		
+		# restore common factor
+		d = Li._make(d).multiply(h)
+		
+		return d
+
 	def copy(self):
 		"""Copy a line.
 		
@@ -561,10 +1455,10 @@ class Line (list):
 			Line instance
 		"""
 		
-		# copy list
-		c = [i.copy() for i in self]
+		# terms are immutable, so copy list only
+		c = list(self)
 		
-		return Li(c,c=False)
+		return Li._make(c)
 
 	def derive(self,x,*f):
 		"""Take the derivative of all terms in a line.
@@ -623,19 +1517,32 @@ class Line (list):
 			In the line (1/2 x + 3/2 y - 5/4 x^-1), the extracted greatest common factor is 1/4 x^-1, because x is present at exponents 1,0, and -1, so -1 is the lowest.  2 is present at exponents -1,-1,-2, so -2 is the lowest.  Hence 2^-2 * x^-1, or 1/4 x^-1.
 		"""
 		
-		# create list
+		# one for an empty line
 		s = self
-		a = [k for i in s for k in i.keys()]
-		a = set(a)
+		if len(s) < 1:
+			
+			return Te(1)
 		
-		# find minimum exponent 
-		g = {}
+		# lowest prime exponents are the gcd of numerators over the lcm of denominators
+		n = 0
+		d = 1
+		for i in s:
+			c = i.coefficient
+			n = gcd(n,c.numerator)
+			d = d * c.denominator // gcd(d,c.denominator)
+			
+		# lowest exponent of imaginary unit
+		e = min([i.look('i') for i in s])
+		
+		# find minimum exponent of variables
+		a = set([k for i in s for k,j in i.monomial])
+		g = {'i':e}
 		for i in a:
 			h = [j.look(i) for j in s]
 			m = min(h)
 			if m != 0:
 				g[i] = m
-		g = Te(g)
+		g = Te(n,d,g)
 		
 		return g
 
@@ -685,11 +1592,8 @@ class Line (list):
 			if i.look('i') % 4 in (2,3):
 				s += ' -('
 				
-			# list of variables
-			y = i.keys()
-			y = [str(j) for j in y if j != 'i']
-			y = [j for j in y if j.isalpha()]
-			y = Pa._tidy(y)
+			# list of variables, already in tidy order
+			y = i.monomial
 				
 			# coefficient
 			n,d = i.fuse()
@@ -701,13 +1605,13 @@ class Line (list):
 				s += 'i'
 			
 			# add variables to string
-			for k in y:
+			for k,j in y:
 				if s[-1] == '(':
 					s += k
 				else:
 					s += ' ' + k
-				if i[k] != 1:
-					s += str(i[k])
+				if j != 1:
+					s += str(j)
 					
 			# close
 			s += ')'
@@ -727,38 +1631,20 @@ class Line (list):
 		
 		Arguments:
 			l: Line instance, Term instance, pair of numbers or number
-			s=True: boolean, sort terms afterward?
+			s=True: boolean, kept for compatibility, as terms are always in order
 			
 		Returns:
 			Line instance
 		"""
 		
 		# convert to line
-		l = Li(l,c=False)
+		if not isinstance(l,Line):
+			l = Li(l,c=False)
 		
-		# new term list
-		w = []
-		
-		# for every term in first
-		for i in self:
-				
-			# multiply each member of second
-			for j in l:
-				
-				# multiply together
-				m = i.multiply(j)
-				
-				# append into new line
-				w.append(m)
-
-		# new line, condenses
-		w = Li(w)
-					
-		# sort new line
-		if s:
-			w = w.sort()
+		# multiply all pairs of terms
+		w = Li._product(self,l)
 		
-		return w
+		return Li._make(w)
 		
 	def plug(self,y,x):
 		"""Plug in an integer, fraction, or term for all occurrences of a variable.
@@ -789,12 +1675,72 @@ class Line (list):
 			
 		Returns:
 			Line instance
+			
+		Notes:
+			Negative powers are treated as positive.
 		"""
 		
 		# raise to power
 		r,o = Li._expand(self,p)
 		
-		return Li(r)
+		return Li._make(r)
+		
+	def quotient(self,l):
+		"""Divide exactly by another line.
+		
+		Arguments:
+			l: Line instance, Term instance, pair of numbers or number
+			
+		Returns:
+			Line instance, or None if the division is not exact
+			
+		Examples:
+			The quotient of (x^2 - y^2) by (x + y) is (x - y).
+			
+			The quotient of (x^2 + 1) by (x + 1) is None.
+		"""
+		
+		# convert to line
+		if not isinstance(l,Line):
+			l = Li(l)
+			
+		# division by zero
+		if len(l) < 1:
+			print('Division by zero not allowed!\n')
+			
+			return None
+			
+		# a single term divides directly
+		if len(l) < 2:
+			
+			return self.multiply(l[0].invert())
+			
+		# zero divides to zero
+		if len(self) < 1:
+			
+			return Li()
+			
+		# split off greatest common factors
+		a,f = self.factor()
+		b,g = l.factor()
+		
+		# all variables, in table order
+		v = set([k for j in (a,b) for i in j for k,e in i.monomial])
+		v = sorted(v,key=lambda x: Te.table[x])
+		
+		# divide polynomials
+		p = Li._convert(a,v)
+		q = Li._convert(b,v)
+		w = Li._exact(p,q)
+		if w is None:
+			
+			return None
+			
+		# restore factors
+		w = Li._make(Li._revert(w,v))
+		w = w.multiply(f.divide(g))
+		
+		return w
 		
 	def scale(self,n,d=1):
 		"""Scale all terms by a constant.
@@ -807,10 +1753,11 @@ class Line (list):
 			Line instance
 		"""
 		
-		# scale all terms
+		# scale all terms, keeping order
 		s = [i.scale(n,d) for i in self]
+		s = [i for i in s if i.coefficient != 0]
 		
-		return Li(s)
+		return Li._make(s)
 
 	def scan(self,p=False):
 		"""Scan for all variables in a line of terms.
@@ -822,16 +1769,10 @@ class Line (list):
 			list of strings, variable names
 		"""
 		
-		# get variables from all terms
-		v = []
+		# get variables from all monomials, removing duplicates
+		v = set()
 		for i in self:
-			a,b,c = i.parse()
-			
-			# add keys
-			v += b.keys()
-			
-		# remove duplicates
-		v = set(v)
+			v.update(k for k,j in i.monomial)
 		
 		# sort into upper case, lower case
 		l = []
@@ -857,7 +1798,7 @@ class Line (list):
 		return v
 
 	def sort(self):
-		"""Sort a list of terms by variable and exponent.
+		"""Sort a list of terms into graded reverse lexicographic order.
 		
 		Arguments:
 			None
@@ -866,46 +1807,10 @@ class Line (list):
 			Line instance
 		"""
 		
-		# get variables, add i
-		v = self.scan(p=False)
-		v.append('i')
-		
-		# reverse so least weighted variables come first
-		v.reverse()
-		
-		# assign a weight to each variable, based on position in list
-		w = {}
-		for n,i in enumerate(v):
-			w[i] = 1000 ** (n + 1)
-			
-		# assign score based on weights and exponents
-		s = {}
-		for i in self:
-			
-			# sum weights
-			c = 0
-			for k,j in i.items():
-				
-				# adjust weights based on exponent
-				if k != 'i':
-					c += w.get(k,0) * (100 + j)
-					
-				# i is adjusted based on even or odd exponents
-				else:
-					c += w.get(k,0) * (100 + j % 2)
-					
-			# use score as key
-			s[c] = i
-				
-		# sort keys largest to smallest
-		y = s.keys()
-		y.sort()
-		y.reverse()
-		
 		# new term list
-		n = [s[k] for k in y]
+		n = Li._order(list(self))
 		
-		return Li(n,c=False)
+		return Li._make(n)
 
 	def subtract(self,l):
 		"""Subtract from a Line instance.
@@ -926,12 +1831,13 @@ class Line (list):
 		
 		return s
 
-	def substitute(self,s,x):
+	def substitute(self,s,x,c=None):
 		"""Substitute a list of Terms for a variable.
 		
 		Arguments:
 			s: integer, string, Term instance, Line instance, or pair of Line instances.
 			x: string, variable name with optional exponent
+			c=None: dictionary mapping substituting lines to their tables of powers
 			
 		Returns:
 			List of two Line instances
@@ -939,6 +1845,8 @@ class Line (list):
 		Notes:
 			If a pair of Line instances is given, the first represents the numerator expression of the substitution and the second represents the denominator.
 			
+			Powers of the numerator and denominator are built once by successive multiplication and kept in c, so a dictionary passed in by the caller is shared across repeated substitutions.  All converted terms are accumulated in one pass, as with substitute_many.
+			
 		Examples:
 			If (y + 1) is to substitute for x:
 				
@@ -949,101 +1857,153 @@ class Line (list):
 				self.substitute('y + 1','x2').
 		"""
 		
-		# turn substitution into top line
-		try:
-			t = Li(s)
-			b = Li(1)
-			
-		# unless it is a list of lines
-		except:
-			t = Li(s[0])
-			b = Li(s[1])
-		
-		# split variable from power
-		h = Te._chop(x)
-		x = h[0]
+		# substitute as the only variable
+		l = self.substitute_many({x: s},c)
 		
-		# assume power of 1 for substituted variable, but revise if found in string
-		p = 1
-		try:
-			p = int(h[1])
-		except:
-			pass
-		
-		# exponents in each term
-		e = [i.look(x) for i in self]
-		
-		# adjust for power of substituted variable
-		e = [i // p for i in e]
+		return l
+
+	def substitute_many(self,s,c=None):
+		"""Substitute lists of Terms for several variables at once.
 		
-		# max, min powers of substitution
-		try:
-			a = max(e)
-			m = min(e)
-		except:
-			a = 0
-			m = 0
+		Arguments:
+			s: dictionary mapping variable names with optional exponents to substitutions, each an integer, string, Term instance, Line instance, or pair of Line instances
+			c=None: dictionary mapping substituting lines to their tables of powers
+			
+		Returns:
+			List of two Line instances
+			
+		Notes:
+			All substitutions are made simultaneously, so a variable appearing in one substitution is not replaced by another.  The variables should be distinct.
+			
+			Terms are gathered by their exponents of every substitution, and each gathering is multiplied by the powers it needs over a single common denominator, so the line is expanded only once.
+			
+		Examples:
+			To substitute (y + 1) for x and (z - 1) / z for w:
+				
+				self.substitute_many({'x': 'y + 1', 'w': [Li('z - 1'),Li('z')]})
+		"""
 		
-		# truncate max and min powers 
-		if a < 0:
-			a = 0
-		if m > 0:
-			m = 0
+		# begin power tables
+		if c is None:
+			c = {}
 			
-		# dictionaries of calculated terms for top and bottom
-		f = {}
-		g = {}
+		# variables, powers, tops and bottoms
+		r = []
+		for x,i in s.items():
+			
+			# turn substitution into top line
+			try:
+				t = Li(i)
+				b = Li(1)
+				
+			# unless it is a list of lines
+			except:
+				t = Li(i[0])
+				b = Li(i[1])
 			
-		# expand top and bottom to truncated max and min
-		q,f = Li._expand(t,-m,f)
-		r,g = Li._expand(b,a,g)
-		q = Li(q,c=False)
-		r = Li(r,c=False)
+			# split variable from power
+			h = Te._chop(x)
+			x = h[0]
+			
+			# assume power of 1 for substituted variable, but revise if found in string
+			p = 1
+			try:
+				p = int(h[1])
+			except:
+				pass
+				
+			r.append((x,p,t,b))
 		
-		# store results in dictionaries
-		y = {-m: q}
-		z = {a: r}
+		# exponents of each substitution in each term, adjusted for power of substituted variable
+		e = [tuple([i.look(x) // p for x,p,t,b in r]) for i in self]
+		
+		# max, min powers of each substitution, truncated at zero
+		a = [max([0] + [j[n] for j in e]) for n in range(len(r))]
+		m = [min([0] + [j[n] for j in e]) for n in range(len(r))]
+		
+		# powers of tops and bottoms
+		q = [Li._powers(t,j - k,c) for (x,p,t,b),j,k in zip(r,a,m)]
+		g = [Li._powers(b,j - k,c) for (x,p,t,b),j,k in zip(r,a,m)]
 		
 		# make denominator
-		d = q.multiply(r)
+		d = [Te(1)]
+		for n in range(len(r)):
+			d = Li._product(d,Li._product(q[n][-m[n]],g[n][a[n]]))
+		d = Li._make(d)
+		
+		# gather terms by exponents of substitutions, dividing out variables
+		h = {}
+		for i,w in zip(self,e):
+			v = Te({x: -j * p for (x,p,t,b),j in zip(r,w) if j != 0})
+			h.setdefault(w,[]).append(i.multiply(v))
+			
+		# accumulate the product of each gathering with its powers
+		z = {}
+		for w,i in h.items():
+			u = [Te(1)]
+			for n,j in enumerate(w):
+				u = Li._product(u,Li._product(q[n][j - m[n]],g[n][a[n] - j]))
+			Li._accumulate(z,u,i)
+			
+		# make terms, skipping zeroes
+		l = [Te._make(k,h,n) for (n,h),k in z.items() if k != 0]
+		l = Li._make(Li._order(l))
 		
-		# convert each term
-		l = Li([])
-		for n,i in enumerate(self):
-			
-			# exponent of substitution
-			w = e[n]
+		return [l,d]
+
+	def transcribe(self,o,w):
+		"""Transcribe the line into Python source code for numerical evaluation.
+		
+		Arguments:
+			o: dictionary mapping variables to names in the source
+			w: dictionary mapping pairs of variable and exponent to names of powers in the source
 			
-			# divide out variable
-			v = Te({x: -w * p})
-			i = i.multiply(v)
+		Returns:
+			string
 			
-			# retrieve top expansion
-			if (w - m) in y:
-				u = y[w - m]
-				
-			# or calculate
+		Notes:
+			Real and imaginary terms with the same monomial are combined into a single complex coefficient.  Each power needed is named in w, so that a table of powers may be shared with other lines and computed only once.
+		"""
+		
+		# combine coefficients by monomial
+		g = {}
+		for i in self:
+			a,b = g.get(i.monomial,(0,0))
+			if i.unit:
+				b += i.coefficient
 			else:
-				u,f = Li._expand(t,w - m,f)
-				u = Li(u,c=False)
-				y[w - m] = u
-			
-			# retrieve bottom expansion
-			if (a - w) in z:
-				c = z[a - w]
+				a += i.coefficient
+			g[i.monomial] = (a,b)
+			
+		# transcribe each monomial
+		s = []
+		for m,(a,b) in g.items():
+			c = [repr(complex(a,b))]
+			for k,e in m:
+				
+				# catch missing variables
+				if k not in o:
+					print('Not all variables accounted for, evaluation aborted.\n')
+					
+					raise ValueError('Not all variables accounted for, evaluation aborted.\n')
+					
+				# refer to power in table
+				if e == 1:
+					c.append(o[k])
+				else:
+					if (k,e) not in w:
+						w[(k,e)] = '%s_%s' % (o[k],str(e).replace('-','m'))
+					c.append(w[(k,e)])
+					
+			# multiply factors
+			s.append(' * '.join(c))
 			
-			# or calculate
-			else:
-				c,g = Li._expand(b,a - w,g)
-				c = Li(c,c=False)
-				z[a - w] = c
+		# add terms
+		s = ' + '.join(s)
+		if not s:
+			s = '0j'
 			
-			# multiply and add
-			u = u.multiply(c)
-			u = u.multiply(i)
-			l = l.add(u)
-		
-		return [l,d]
+		return s
 
 	def view(self):
 		"""Display line term by term.
@@ -29,6 +29,7 @@ class Page (list):
 			u=None: dictionary mapping variables to values
 			
 		Attributes:
+			errors: list of floats, estimated errors of the results, if integrated adaptively
 			inputs: dictionary mapping variables to their values
 			name: string, name of results
 			source: string, the expression that produced the results
@@ -45,6 +46,7 @@ class Page (list):
 			self.inputs = u
 		self.name = n
 		self.source = s
+		self.errors = None
 	
 	
 	# static methods
@@ -114,6 +116,7 @@ class Page (list):
 		p.name = self.name
 		p.source = self.source
 		p.inputs = self.inputs
+		p.errors = self.errors
 		
 		return p
 		
@@ -344,6 +347,10 @@ class Page (list):
 		p.source = self.source
 		p.inputs = self.inputs
 		
+		# keep errors of indices retained
+		if self.errors:
+			p.errors = [e for n,e in enumerate(self.errors) if n in a]
+		
 		return p
 		
 	def sum(self):
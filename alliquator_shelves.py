@@ -9,6 +9,9 @@ sqrt = math.sqrt
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 
+# import numpy
+import numpy as np
+
 # import results
 import alliquator_results as aq_re
 Re = aq_re.Result
@@ -41,7 +44,9 @@ class Shelf(list):
 			inputs: dictionary mapping variables to values
 			second: string, name of second axis variable
 			name: string, name of results
+			points: two dimensional array of complex numbers, the first axis points of each book, if evaluated as arrays
 			source: source expression
+			values: two dimensional array of complex numbers, the results of each book, if evaluated as arrays
 
 		"""
 		
@@ -99,6 +104,10 @@ class Shelf(list):
 				c[k] = u
 		self.inputs = c
 		
+		# no arrays
+		self.points = None
+		self.values = None
+		
 	
 	# instance methods
 	def __pos__(self):
@@ -154,6 +163,9 @@ class Shelf(list):
 			
 		Returns:
 			Shelf instance
+			
+		Notes:
+			The points and values arrays are left out, as the books of the copy may be rearranged without them.
 		"""
 		
 		# copy each book
@@ -555,12 +567,6 @@ class Shelf(list):
 		# get summed curvatures for inclusions
 		u = h.survey(u)
 		
-		# get permutations
-		p = Re.permutations
-		p = p[len(self[0][0])]
-		p = p[:]
-		p.reverse()
-		
 		# take excluded points
 		q.reverse()
 		while len(q) > 0:
@@ -591,9 +597,19 @@ class Shelf(list):
 				if e:
 					w.append(a)
 						
-			# try all permutations
+			# predict point from each neighbor and from their mean
 			b,c = o
 			g = h[b][c].copy()
+			t = []
+			for j,k in ((b - 1,c),(b + 1,c),(b,c - 1),(b,c + 1)):
+				if 0 <= j < len(h) and 0 <= k < len(h[0]):
+					t.append(np.array(h[j][k],dtype=complex))
+			t.append(sum(t) / len(t))
+			
+			# pick permutations, the identity last
+			p = Bo._permute(g,t)
+			
+			# try each permutation
 			d = []
 			for i in p:
 				
@@ -0,0 +1,981 @@
+# alliquator_sketches.py
+# class to build algebraic expressions lazily
+
+# import numpy
+import numpy as np
+
+# import weak references
+import weakref
+
+# import results
+import alliquator_results as aq_re
+Re = aq_re.Result
+
+# import pages
+import alliquator_pages as aq_pa
+Pa = aq_pa.Page
+
+# import books
+import alliquator_books as aq_bo
+Bo = aq_bo.Book
+
+# import terms
+import alliquator_terms as aq_te
+Te = aq_te.Term
+
+# import lines
+import alliquator_lines as aq_li
+Li = aq_li.Line
+
+# import expressions
+import alliquator_expressions as aq_ex
+Ex = aq_ex.Expression
+
+
+# Sketch class
+class Sketch (list):
+	"""A Sketch is an expression whose operations are recorded rather than expanded.
+	
+	Sketch class inherits from list, but is not to be changed in place.
+	
+	Substitution is recorded as an operation only for a variable to the first power.  Substituting for a power of a variable, such as 'x2', depends on how the variable's powers are split in each term, so it is instead carried out at once on the expanded sketch and the result starts a new sketch from a single leaf.
+	
+	class attributes:
+		table: weak dictionary mapping the keys of all living sketches to the sketches themselves
+		zero: Sketch instance, the expression 0
+		one: Sketch instance, the expression 1
+	"""
+	
+	# sketches still in use
+	table = weakref.WeakValueDictionary()
+	
+	def __new__(cls,e=None):
+		"""Define a sketch as a node in a graph of operations, with an Expression at each leaf.
+		
+		Arguments:
+			e=None: Sketch instance, Expression instance, Line instance, string, pair of integers, or integer
+		
+		Returns:
+			Sketch instance
+		
+		Attributes:
+			variables: frozenset of strings, the variables in the sketch
+		
+		Notes:
+			The first entry names the operation, one of 'leaf', 'sum', 'product', 'quotient', 'power', or 'substitution', and the rest are its operands.
+			
+			Sketches are hash-consed: each distinct operation on the same operands is made only once and kept in the table, so that shared parts of a graph are stored once and two sketches are equal exactly when they are the same object.  The table holds sketches weakly, so a sketch is forgotten once nothing else refers to it.  Keys hold the identities of operands, which stay fixed while the sketch keeps its operands alive.
+			
+			The variables of each sketch are found from those of its operands when it is made, so scan and substitute never walk the graph.
+			
+			Nothing is expanded until asked for with expand.  A sketch may instead be compiled straight to a numerical function, sampled, or evaluated.
+		
+		Examples:
+			Sketching (x + 1)^20 (x - 1)^20 - 1:
+				
+				a = Sk('x + 1').power(20)
+				b = Sk('x - 1').power(20)
+				s = a.multiply(b).subtract(1)
+			
+			records four operations without multiplying out either power.  s.sample('x',[0,1,2]) evaluates it directly, and s.expand() gives the Expression.
+		"""
+		
+		# a sketch is already itself
+		if isinstance(e,Sketch):
+			
+			return e
+		
+		# make an expression leaf
+		e = Ex(e)
+		k = ('leaf',tuple(e.top()),tuple(e.bottom()))
+		s = Sketch._make(k,('leaf',e))
+		
+		return s
+	
+	def __init__(self,e=None):
+		"""Leave the sketch as made by __new__.
+		
+		Arguments:
+			e=None: Sketch instance, Expression instance, Line instance, string, pair of integers, or integer
+		
+		Returns:
+			None
+		"""
+		
+		return None
+	
+	
+	# static methods
+	@staticmethod
+	def _make(k,a):
+		"""Make a sketch from its operands, or retrieve the one made before.
+		
+		Arguments:
+			k: tuple, key of the sketch
+			a: tuple, name of operation followed by operands
+		
+		Returns:
+			Sketch instance
+		"""
+		
+		# look in table
+		try:
+			s = Sketch.table[k]
+		
+		# otherwise make it
+		except KeyError:
+			s = list.__new__(Sketch)
+			list.extend(s,a)
+			Sketch.table[k] = s
+			
+			# variables of a leaf
+			if a[0] == 'leaf':
+				v = set(a[1].scan())
+			
+			# substituted variable is replaced by those of its substitute
+			elif a[0] == 'substitution':
+				v = (a[1].variables - set([a[2]])) | a[3].variables
+			
+			# all others combine operands
+			else:
+				v = set()
+				for i in s.operands():
+					v |= i.variables
+			
+			s.variables = frozenset(v)
+		
+		return s
+	
+	@staticmethod
+	def _order(g,w=True):
+		"""Order all sketches in a graph so that each comes after its operands.
+		
+		Arguments:
+			g: Sketch instance
+			w=True: boolean, include the expressions substituted into?
+		
+		Returns:
+			list of Sketch instances
+		
+		Notes:
+			The graph is walked without recursion, so that long chains of operations do not reach the recursion limit.  Shared sketches appear only once.
+		"""
+		
+		# walk depth first, writing each sketch after its operands
+		o = []
+		v = set()
+		k = [(g,False)]
+		while k:
+			s,d = k.pop()
+			
+			# operands are done
+			if d:
+				o.append(s)
+				continue
+			
+			# skip sketches already visited
+			if id(s) in v:
+				continue
+			v.add(id(s))
+			
+			# revisit after operands
+			k.append((s,True))
+			for i in s.operands(w):
+				if id(i) not in v:
+					k.append((i,False))
+		
+		return o
+	
+	@staticmethod
+	def _sort(v):
+		"""Sort variables as scan does, lower case before upper case.
+		
+		Arguments:
+			v: set of strings
+		
+		Returns:
+			list of strings
+		"""
+		
+		# parse into lower case, upper case
+		l = [i for i in v if not i[0].isupper()]
+		u = [i for i in v if i[0].isupper()]
+		l.sort()
+		u.sort()
+		
+		return l + u
+	
+	# instance methods
+	def __add__(self,e):
+		"""Use the + shortcut for addition.
+		
+		Arguments:
+			e: Sketch instance, Expression instance, Line instance, Term instance, pair of integers, or integer
+		
+		Returns:
+			Sketch instance
+		"""
+		
+		# add
+		a = self.add(e)
+		
+		return a
+	
+	def __eq__(self,e):
+		"""Use the == shortcut for comparison.
+		
+		Arguments:
+			e: Sketch instance or expression string
+		
+		Returns:
+			boolean, sketches equal?
+		"""
+		
+		# compare
+		q = self.compare(e)
+		
+		return q
+	
+	def __hash__(self):
+		"""Hash a sketch by its identity.
+		
+		Arguments:
+			None
+		
+		Returns:
+			integer
+		"""
+		
+		# sketches are unique
+		h = id(self)
+		
+		return h
+	
+	def __mul__(self,e):
+		"""Use the * shortcut for multiplication.
+		
+		Arguments:
+			e: Sketch instance, Expression instance, Line instance, Term instance, pair of integers, or integer
+		
+		Returns:
+			Sketch instance
+		"""
+		
+		# multiply
+		m = self.multiply(e)
+		
+		return m
+	
+	def __ne__(self,e):
+		"""Use the != shortcut for comparison.
+		
+		Arguments:
+			e: Sketch instance or expression string
+		
+		Returns:
+			boolean, sketches not equal?
+		"""
+		
+		# compare
+		q = not self.compare(e)
+		
+		return q
+	
+	def __neg__(self):
+		"""Use the - shortcut for negation.
+		
+		Arguments:
+			None
+		
+		Returns:
+			Sketch instance
+		"""
+		
+		# multiply by -1
+		n = self.multiply(-1)
+		
+		return n
+	
+	def __pow__(self,n):
+		"""Use the ** shortcut for powers.
+		
+		Arguments:
+			n: integer
+		
+		Returns:
+			Sketch instance
+		"""
+		
+		# raise to power
+		p = self.power(n)
+		
+		return p
+	
+	def __repr__(self):
+		"""Represent the sketch as a string.
+		
+		Arguments:
+			None
+		
+		Returns:
+			string
+		"""
+		
+		# jot down
+		s = self.jot()
+		
+		return s
+	
+	def __rmul__(self,e):
+		"""Use the * shortcut for multiplication from the left.
+		
+		Arguments:
+			e: Expression instance, Line instance, Term instance, pair of integers, or integer
+		
+		Returns:
+			Sketch instance
+		"""
+		
+		# multiply
+		m = self.multiply(e)
+		
+		return m
+	
+	def __sub__(self,e):
+		"""Use the - shortcut for subtraction.
+		
+		Arguments:
+			e: Sketch instance, Expression instance, Line instance, Term instance, pair of integers, or integer
+		
+		Returns:
+			Sketch instance
+		"""
+		
+		# subtract
+		s = self.subtract(e)
+		
+		return s
+	
+	def __truediv__(self,e):
+		"""Use the / shortcut for division.
+		
+		Arguments:
+			e: Sketch instance, Expression instance, Line instance, Term instance, pair of integers, or integer
+		
+		Returns:
+			Sketch instance
+		"""
+		
+		# divide
+		d = self.divide(e)
+		
+		return d
+	
+	def add(self,e):
+		"""Add another expression to the sketch.
+		
+		Arguments:
+			e: Sketch instance, Expression instance, Line instance, Term instance, pair of integers, or integer
+		
+		Returns:
+			Sketch instance
+		
+		Notes:
+			Addition is commutative, so a + b and b + a are the same sketch.  Adding zero gives the sketch back.
+		"""
+		
+		# convert to sketch
+		e = Sk(e)
+		
+		# adding zero changes nothing
+		if e is Sk.zero:
+			
+			return self
+		
+		if self is Sk.zero:
+			
+			return e
+		
+		# order operands by identity
+		a,b = sorted([self,e],key=id)
+		s = Sk._make(('sum',id(a),id(b)),('sum',a,b))
+		
+		return s
+	
+	def compare(self,e):
+		"""Compare two sketches.
+		
+		Arguments:
+			e: Sketch instance, Expression instance, Line instance, Term instance, string, pair of integers, or integer
+		
+		Returns:
+			boolean, sketches are the same?
+		
+		Notes:
+			Sketches are the same only if they record the same operations on the same leaves.  Different sketches may still expand to the same expression.
+		"""
+		
+		# sketches are unique
+		q = Sk(e) is self
+		
+		return q
+	
+	def compile(self,*v):
+		"""Compile the sketch into a Python function for fast numerical evaluation, without expanding it.
+		
+		Arguments:
+			*v: unpacked tuple of strings, the variables in order of the function's arguments
+		
+		Returns:
+			function object
+		
+		Notes:
+			If no variables are given, all variables in the sketch are used, in the order given by scan.
+			
+			Each leaf is compiled as an Expression, and each operation becomes one line of the function, so a shared part of the graph is evaluated only once per call.  The expression under a substitution is compiled as a function of its own, called with the substituted value.  The generated source is kept in the function's source attribute.
+		"""
+		
+		# default to all variables
+		if not v:
+			v = self.scan()
+		
+		# name variables in source
+		o = {k: 'v%d' % (n) for n,k in enumerate(v)}
+		
+		# name each sketch in order
+		g = Sk._order(self,False)
+		h = {id(i): 'g%d' % (n) for n,i in enumerate(g)}
+		
+		# functions for leaves and substitutions
+		d = {}
+		
+		# begin function
+		a = ','.join([o[k] for k in v])
+		s = ['def f(%s):' % (a)]
+		
+		# evaluate each sketch
+		for n,i in enumerate(g):
+			m = h[id(i)]
+			
+			# sums, products, quotients, and powers
+			if i[0] == 'sum':
+				s.append('\t%s = %s + %s' % (m,h[id(i[1])],h[id(i[2])]))
+				continue
+			
+			if i[0] == 'product':
+				s.append('\t%s = %s * %s' % (m,h[id(i[1])],h[id(i[2])]))
+				continue
+			
+			if i[0] == 'quotient':
+				s.append('\t%s = %s / %s' % (m,h[id(i[1])],h[id(i[2])]))
+				continue
+			
+			if i[0] == 'power':
+				s.append('\t%s = %s ** %d' % (m,h[id(i[1])],i[2]))
+				continue
+			
+			# leaves are compiled directly, substitutions from the expression substituted into
+			z = i[1].scan()
+			c = i[1].compile(*z)
+			d['c%d' % (n)] = c
+			
+			# substituted variable takes the substituting value
+			r = []
+			for k in z:
+				if i[0] == 'substitution' and k == i[2]:
+					r.append(h[id(i[3])])
+					continue
+				
+				# catch missing variables
+				if k not in o:
+					print('Not all variables accounted for, evaluation aborted.\n')
+					
+					raise ValueError('Not all variables accounted for, evaluation aborted.\n')
+				
+				r.append(o[k])
+			
+			s.append('\t%s = c%d(%s)' % (m,n,','.join(r)))
+		
+		# return last
+		s.append('\treturn %s' % (h[id(self)]))
+		s = '\n'.join(s) + '\n'
+		
+		# define function
+		exec(s,d)
+		f = d['f']
+		f.source = s
+		
+		return f
+	
+	def derive(self,x,*f):
+		"""Sketch the derivative.
+		
+		Arguments:
+			x: string, variable name
+			*f: unpacked tuple of strings, functions of variable x
+		
+		Returns:
+			Sketch instance
+		
+		Notes:
+			Leaves are derived as Expressions.  Sums, products, quotients, powers, and substitutions follow the sum, product, quotient, power, and chain rules, sketching the result without expanding it.  Each shared part of the graph is derived only once.
+			
+			Functions in f are treated as by Expression.derive.
+		"""
+		
+		# derivatives of each sketch
+		d = {}
+		for i in Sk._order(self,False):
+			
+			# derive leaf directly
+			if i[0] == 'leaf':
+				r = Sk(i[1].derive(x,*f))
+			
+			# sum rule
+			if i[0] == 'sum':
+				r = d[id(i[1])].add(d[id(i[2])])
+			
+			# product rule
+			if i[0] == 'product':
+				r = d[id(i[1])].multiply(i[2]).add(i[1].multiply(d[id(i[2])]))
+			
+			# quotient rule: (a/b)' = (a' b - a b') / b^2
+			if i[0] == 'quotient':
+				r = d[id(i[1])].multiply(i[2]).subtract(i[1].multiply(d[id(i[2])]))
+				r = r.divide(i[2].power(2))
+			
+			# power rule
+			if i[0] == 'power':
+				r = i[1].power(i[2] - 1).multiply(i[2]).multiply(d[id(i[1])])
+			
+			# chain rule: d/dx e(s) = e_x(s) + e_y(s) s_x
+			if i[0] == 'substitution':
+				e,y,s = i[1:]
+				r = e.derive(y,*f).substitute(s,y).multiply(d[id(s)])
+				if y != x:
+					r = r.add(e.derive(x,*f).substitute(s,y))
+			
+			d[id(i)] = r
+		
+		return d[id(self)]
+	
+	def divide(self,e):
+		"""Divide the sketch by another expression.
+		
+		Arguments:
+			e: Sketch instance, Expression instance, Line instance, Term instance, pair of integers, or integer
+		
+		Returns:
+			Sketch instance
+		"""
+		
+		# convert to sketch
+		e = Sk(e)
+		
+		# dividing by one changes nothing
+		if e is Sk.one:
+			
+			return self
+		
+		# zero stays zero
+		if self is Sk.zero:
+			
+			return self
+		
+		# make quotient
+		q = Sk._make(('quotient',id(self),id(e)),('quotient',self,e))
+		
+		return q
+	
+	def evaluate(self,**d):
+		"""Evaluate the sketch to a complex number.
+		
+		Arguments:
+			**d: unpacked dictionary, maps variable names to numerical values.
+		
+		Returns:
+			Page instance
+		
+		Notes:
+			The sketch is compiled, not expanded.
+		"""
+		
+		# compile and evaluate
+		v = self.scan()
+		f = self.compile(*v)
+		try:
+			c = f(*[d[k] for k in v])
+		
+		# catch missing variables
+		except KeyError:
+			print('Not all variables accounted for, evaluation aborted.\n')
+			
+			raise ValueError('Not all variables accounted for, evaluation aborted.\n')
+		
+		# attributes
+		s = self.jot()
+		
+		return Pa([c],None,s,d)
+	
+	def expand(self):
+		"""Expand the sketch into an Expression.
+		
+		Arguments:
+			None
+		
+		Returns:
+			Expression instance
+		
+		Notes:
+			Each shared part of the graph is expanded only once.
+		"""
+		
+		# expansions of each sketch
+		d = {}
+		for i in Sk._order(self,True):
+			
+			# leaf
+			if i[0] == 'leaf':
+				r = i[1].copy()
+			
+			# sum
+			if i[0] == 'sum':
+				r = d[id(i[1])].add(d[id(i[2])])
+			
+			# product
+			if i[0] == 'product':
+				r = d[id(i[1])].multiply(d[id(i[2])])
+			
+			# quotient
+			if i[0] == 'quotient':
+				r = d[id(i[1])].divide(d[id(i[2])])
+			
+			# power
+			if i[0] == 'power':
+				r = d[id(i[1])].power(i[2])
+			
+			# substitution
+			if i[0] == 'substitution':
+				r = d[id(i[1])].substitute(d[id(i[3])],i[2])
+			
+			d[id(i)] = r
+		
+		return d[id(self)]
+	
+	def jot(self):
+		"""Jot down a sketch as a string.
+		
+		Arguments:
+			None
+		
+		Returns:
+			string
+		
+		Notes:
+			Shared parts of the graph are written out in full wherever they appear.
+		"""
+		
+		# strings for each sketch
+		d = {}
+		for i in Sk._order(self,True):
+			
+			# leaf
+			if i[0] == 'leaf':
+				r = '(%s)' % (i[1].jot())
+			
+			# sum
+			if i[0] == 'sum':
+				r = '(%s + %s)' % (d[id(i[1])],d[id(i[2])])
+			
+			# product
+			if i[0] == 'product':
+				r = '%s %s' % (d[id(i[1])],d[id(i[2])])
+			
+			# quotient
+			if i[0] == 'quotient':
+				r = '(%s / %s)' % (d[id(i[1])],d[id(i[2])])
+			
+			# power
+			if i[0] == 'power':
+				r = '%s^%d' % (d[id(i[1])],i[2])
+			
+			# substitution
+			if i[0] == 'substitution':
+				r = '%s[%s = %s]' % (d[id(i[1])],i[2],d[id(i[3])])
+			
+			d[id(i)] = r
+		
+		return d[id(self)]
+	
+	def multiply(self,e):
+		"""Multiply the sketch by another expression.
+		
+		Arguments:
+			e: Sketch instance, Expression instance, Line instance, Term instance, pair of integers, or integer
+		
+		Returns:
+			Sketch instance
+		
+		Notes:
+			Multiplication is commutative, so a b and b a are the same sketch.  Multiplying by one gives the sketch back, and multiplying by zero gives zero.
+		"""
+		
+		# convert to sketch
+		e = Sk(e)
+		
+		# multiplying by one changes nothing
+		if e is Sk.one:
+			
+			return self
+		
+		if self is Sk.one:
+			
+			return e
+		
+		# multiplying by zero gives zero
+		if Sk.zero in (self,e):
+			
+			return Sk.zero
+		
+		# order operands by identity
+		a,b = sorted([self,e],key=id)
+		p = Sk._make(('product',id(a),id(b)),('product',a,b))
+		
+		return p
+	
+	def operands(self,w=True):
+		"""Get the sketches operated on.
+		
+		Arguments:
+			w=True: boolean, include the expression substituted into?
+		
+		Returns:
+			list of Sketch instances
+		"""
+		
+		# sketches among operands
+		o = [i for i in self[1:] if isinstance(i,Sketch)]
+		
+		# substitution into expression
+		if not w and self[0] == 'substitution':
+			o = o[1:]
+		
+		return o
+	
+	def power(self,n):
+		"""Sketch the power of an expression.
+		
+		Arguments:
+			n: integer, an exponent
+		
+		Returns:
+			Sketch instance
+		"""
+		
+		# make sure n is an integer
+		n = int(n)
+		
+		# trivial powers
+		if n == 0:
+			
+			return Sk.one
+		
+		if n == 1:
+			
+			return self
+		
+		# make power
+		p = Sk._make(('power',id(self),n),('power',self,n))
+		
+		return p
+	
+	def sample(self,*a,**f):
+		"""Sample the sketch at every point given, without expanding it.
+		
+		Arguments:
+			*a: unpacked tuple:
+				0) string, variable to sample
+				1) list of values for variable
+				2) string, possible second variable
+				3) value for second variable
+			
+			**f: unpacked dictionary, variable names mapped to values or function objects that evaluate to a value using x.
+		
+		Returns:
+			Book instance
+		
+		Notes:
+			Inputs are bound as by Expression.sample.  Points where the evaluation is not finite, such as poles, are evaluated again from the expanded Expression.
+		"""
+		
+		# unpack args
+		x = a[0]
+		p = a[1]
+		
+		# retrieve secondary variable if present
+		try:
+			y = a[2]
+			q = a[3]
+		except:
+			y = None
+			q = None
+		
+		# compile sketch
+		v = self.scan()
+		g = self.compile(*v)
+		
+		# attributes
+		s = self.jot()
+		
+		# no points
+		if len(p) < 1:
+			
+			return Bo([],x)
+		
+		# plan bindings at the first point
+		w = Ex._plan(f,x,p[0],y,q)
+		
+		# bind inputs over all points
+		o = np.array([complex(i) for i in p],dtype=complex)
+		d,c = Ex._sweep(w,f,x,o,p,y,q)
+		
+		# evaluate all points
+		try:
+			with np.errstate(all='ignore'):
+				r = g(*[d[k] for k in v])
+		
+		# catch missing variables
+		except KeyError:
+			print('Not all variables accounted for, evaluation aborted.\n')
+			
+			raise ValueError('Not all variables accounted for, evaluation aborted.\n')
+		
+		# spread over points if independent of them
+		r = np.array(np.broadcast_to(r,o.shape),dtype=complex)
+		
+		# evaluate exactly where not finite, expanding only if needed
+		e = None
+		for j in np.flatnonzero(~np.isfinite(r)):
+			if e is None:
+				e = self.expand()
+			u = Ex._apply(w,f,x,p[j],y,q)
+			r[j] = e.evaluate(**u)[0]
+		
+		# inputs that vary by point
+		u = dict(c)
+		for k,i in d.items():
+			if k != x and k not in c:
+				u[k] = i
+		
+		# make book from arrays
+		r = Bo._bind(x,o,r,None,s,u)
+		
+		return r
+	
+	def scan(self,p=False):
+		"""Get variables in the sketch.
+		
+		Arguments:
+			p=True: boolean, print to screen?
+		
+		Returns:
+			list of variables
+		
+		Notes:
+			The variables are kept from when the sketch was made, so the graph is not walked again.
+		"""
+		
+		# sort variables found when made
+		v = Sk._sort(self.variables)
+		
+		# print to screen
+		if p:
+			print(','.join(v))
+		
+		return v
+	
+	def substitute(self,s,x):
+		"""Sketch the substitution of an expression for all occurrences of a variable.
+		
+		Arguments:
+			s: Sketch instance, Expression instance, Line instance, string, or integer
+			x: string, name of variable with optional exponent
+		
+		Returns:
+			Sketch instance
+		
+		Notes:
+			A variable with an exponent other than 1 is substituted at once by expanding both sketches, as described for the class.
+			
+			Substituting for a variable not in the sketch gives the sketch back.
+		"""
+		
+		# convert to sketch
+		s = Sk(s)
+		
+		# split variable from power
+		h = Te._chop(x)
+		y = h[0]
+		
+		# assume power of 1, but revise if found in string
+		p = 1
+		try:
+			p = int(h[1])
+		except:
+			pass
+		
+		# substitute powers directly
+		if p != 1:
+			
+			return Sk(self.expand().substitute(s.expand(),x))
+		
+		# nothing to substitute
+		if y not in self.variables:
+			
+			return self
+		
+		# make substitution
+		b = Sk._make(('substitution',id(self),y,id(s)),('substitution',self,y,s))
+		
+		return b
+	
+	def subtract(self,e):
+		"""Subtract another expression from the sketch.
+		
+		Arguments:
+			e: Sketch instance, Expression instance, Line instance, Term instance, pair of integers, or integer
+		
+		Returns:
+			Sketch instance
+		"""
+		
+		# add the negative
+		s = self.add(Sk(e).multiply(-1))
+		
+		return s
+	
+	def view(self):
+		"""View the sketch.
+		
+		Arguments:
+			None
+		
+		Returns:
+			None
+		"""
+		
+		# print sketch
+		print(self.jot())
+		
+		# spacer
+		print(' ')
+		
+		return None
+
+
+# Abbreviations
+Sk = Sketch
+
+# trivial sketches
+Sketch.zero = Sketch(0)
+Sketch.one = Sketch(1)
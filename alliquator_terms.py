@@ -5,6 +5,21 @@
 import math
 fac = math.factorial
 
+# import fractions
+import fractions
+Fraction = fractions.Fraction
+
+# import sys for string interning
+import sys
+intern = sys.intern
+
+# import functools for memoization
+import functools
+memoize = functools.lru_cache
+
+# import random for pollard rho
+import random
+
 # import results
 import alliquator_results as aq_re
 Re = aq_re.Result
@@ -20,8 +35,10 @@ class Term (dict):
 	Term class inherits from dict.
 	
 	class attributes:
-		primes: tuple of prime numbers
+		primes: tuple of prime numbers, extended by sieving as needed
+		bound: integer, limit of trial division by sieved primes
 		factorials: list of factorials
+		table: dictionary, interned variable names mapped to their sort keys
 	"""
 	
 	# prime numbers
@@ -29,9 +46,15 @@ class Term (dict):
 	primes += 37,41,43,47,53,59,61,67,71,73 
 	primes += 79,83,89,97,101
 	
+	# trial division limit
+	bound = 1 << 12
+	
 	# factorials
 	factorials = [fac(i) for i in range(10)]
 	
+	# interned variables
+	table = {}
+	
 	def __init__(self,*a,**w):
 		"""Define a Term instance as a dictionary mapping variables or prime numbers to exponents.
 		
@@ -40,11 +63,17 @@ class Term (dict):
 			**w: unpacked dictionary, maps numbers or strings to integers
 			
 		Attributes:
-			None
+			coefficient: Fraction, the rational coefficient
+			unit: integer, 0 or 1, the remaining power of the imaginary unit
+			monomial: tuple of (variable, exponent) pairs in sorted variable order
 			
 		Notes:
 			Integers are broken into their prime factors with associated exponents.
 			
+			Terms are immutable.  The coefficient, imaginary unit, and monomial are fixed at creation, and the dictionary itself may not be altered afterward.
+			
+			Arithmetic is performed on the coefficient as a fraction.  The dictionary of prime factors is only a view, filled in the first time it is looked at.
+			
 			Negative numbers are represented using the imaginary unit squared, i^2.
 			
 			Variable names may be any number of letters, but no numbers or other symbols.
@@ -91,16 +120,28 @@ class Term (dict):
 				Te('3 16 x y 2 z -1')
 		"""
 		
-		# begin dictionary
-		d = {}
+		# copy directly from a lone Term
+		if len(a) == 1 and not w and isinstance(a[0],Term):
+			t = a[0]
+			self._settle(t.coefficient,t.unit,t.monomial)
+			
+			return None
+		
+		# begin coefficient, imaginary exponent, and variables
+		c = Fraction(1)
+		e = 0
+		v = {}
+		
+		# flag for division by zero
+		z = False
 		
-		# deposit **kwargs into dictionary
+		# deposit **kwargs into variables
 		for k,i in w.items():
 			
 			# only accept integer exponents
 			try:
 				i = int(i)
-				d[k] = d.get(k,0) + i
+				v[k] = v.get(k,0) + i
 			except:
 				pass
 				
@@ -108,6 +149,15 @@ class Term (dict):
 		s = []
 		for i in a:
 			
+			# fold in Term directly
+			if isinstance(i,Term):
+				c *= i.coefficient
+				e += i.unit
+				for k,j in i.monomial:
+					v[k] = v.get(k,0) + j
+					
+				continue
+			
 			# deposit if dictionary
 			try:
 				for k,j in i.items():
@@ -115,12 +165,30 @@ class Term (dict):
 					# only accept integers
 					try:
 						j = int(j)
-						d[k] = d.get(k,0) + j
 					except:
-						pass
+						continue
+						
+					# sort into variables
+					try:
+						if k.isalpha():
+							v[k] = v.get(k,0) + j
+							
+					# or numbers
+					except AttributeError:
+						
+						# zero or division by zero
+						if k == 0:
+							if j > 0:
+								c = Fraction(0)
+							if j < 0:
+								z = True
+								
+						# or factors of the coefficient
+						elif j != 0:
+							c *= Fraction(k) ** j
 						
 			# otherwise test for strings
-			except:
+			except AttributeError:
 				
 				# remove / and ,
 				try:
@@ -156,23 +224,39 @@ class Term (dict):
 			s = ' '.join(s)
 			s = Te._chop(s)
 				
-			# make coefficients
-			c = Te._coefficients(s)
-			for k,i in c.items():
-				d[k] = d.get(k,0) + i
+			# make coefficient
+			n,d = Te._coefficients(s)
+			if d == 0:
+				z = True
+			else:
+				c *= Fraction(n,d)
 			
 			# make variables
-			v = Te._variables(s)
-			for k,i in v.items():
-				d[k] = d.get(k,0) + i
+			g = Te._variables(s)
+			for k,i in g.items():
+				v[k] = v.get(k,0) + i
 			
-		# filter
-		d = Te._filter(d)
-		
-		# put keys into Term
-		for k,i in d.items():
-			self[k] = i
+		# return zero if divided by zero
+		if z:
+			print('Division by zero not allowed!\n')
+			c = Fraction(0)
+			
+		# pull imaginary unit from variables
+		e += v.pop('i',0)
 			
+		# fold i^2 into the sign of the coefficient
+		e = e % 4
+		if e > 1:
+			c = -c
+			e -= 2
+			
+		# intern variables and pack into monomial
+		m = [(Te._intern(k),i) for k,i in v.items() if i != 0]
+		m.sort(key=lambda x: Te.table[x[0]])
+		
+		# settle attributes
+		self._settle(c,e,tuple(m))
+		
 	
 	# static methods
 	@staticmethod
@@ -244,13 +328,15 @@ class Term (dict):
 			
 	@staticmethod
 	def _coefficients(l):
-		"""Create a prime factors dictionary from coefficient strings.
+		"""Create a numerator and denominator from coefficient strings.
 		
 		Arguments:
 			l: list of strings
 			
 		Returns:
-			dictionary mapping prime factors to exponents.
+			tuple:
+				integer, numerator
+				integer, denominator
 		"""
 		
 		# peel off pre-letter strings
@@ -269,9 +355,12 @@ class Term (dict):
 		s = ''
 		for i in p:
 			
-			# make an integer
+			# make an integer, keeping all digits if possible
 			try:
-				n.append(int(float(s + i)))
+				try:
+					n.append(int(s + i))
+				except ValueError:
+					n.append(int(float(s + i)))
 				s = ''
 				
 			# or keep to stick on the next
@@ -283,19 +372,64 @@ class Term (dict):
 				else:
 					s = i
 					
-		# prime factor numerator from first
-		c = Te._prime(n[0])
+		return n[0],n[1]
+			
+	@staticmethod
+	@memoize(maxsize=1 << 14)
+	def _factor(n):
+		"""Factor a positive integer completely into primes.
+		
+		Arguments:
+			n: integer, greater than zero
+			
+		Returns:
+			tuple of (prime, exponent) pairs in ascending order
+			
+		Notes:
+			Small primes are divided out by trial division up to the bound.  Any remainder is tested for primality and split with Pollard's rho algorithm if composite.
+			
+			Results are memoized in a least recently used cache, so repeated coefficients are only factored once.
+		"""
 		
-		# prime factor denominator from second and flip
-		d = Te._prime(n[1])
-		d = Te._flip(d)
+		# extend sieve to trial division bound
+		Te._sieve(Te.bound)
 		
-		# combine exponents
-		for k,i in d.items():
-			c[k] = c.get(k,0) + i
+		# trial division
+		f = {}
+		for i in Te.primes:
+			
+			# until prime squared is bigger than dividend
+			if i * i > n:
+				break
 				
-		return c
+			# divide out primes, add to factors
+			while n % i == 0:
+				n //= i
+				f[i] = f.get(i,0) + 1
+				
+			# stop at bound
+			if i > Te.bound:
+				break
+				
+		# split remainder into primes
+		s = []
+		if n > 1:
+			s.append(n)
+		while s:
+			n = s.pop()
 			
+			# add prime to factors
+			if Te._test(n):
+				f[n] = f.get(n,0) + 1
+				
+			# or split composite with rho
+			else:
+				d = Te._rho(n)
+				s.append(d)
+				s.append(n // d)
+		
+		return tuple(sorted(f.items()))
+	
 	@staticmethod
 	def _filter(d):
 		"""Filter out extraneous keys from the dictionary.
@@ -364,6 +498,107 @@ class Term (dict):
 		
 		return f
 			
+	@staticmethod
+	def _intern(v):
+		"""Intern a variable name into the variable table.
+		
+		Arguments:
+			v: string, variable name
+			
+		Returns:
+			string, the interned name
+			
+		Notes:
+			The table maps each name to its sort key, lowercase names before uppercase names, then alphabetically.
+		"""
+		
+		# look up in table
+		try:
+			
+			return Te.table[v][1]
+			
+		# or add to table
+		except KeyError:
+			v = intern(v)
+			Te.table[v] = (v[0].isupper(),v)
+			
+			return v
+	
+	@staticmethod
+	def _make(c,e,m):
+		"""Make a Term instance directly from its coefficient, imaginary unit, and monomial.
+		
+		Arguments:
+			c: Fraction, coefficient
+			e: integer, 0 or 1, power of imaginary unit
+			m: tuple of (variable, exponent) pairs, already interned and sorted
+			
+		Returns:
+			Term instance
+			
+		Notes:
+			No parsing is performed, so the arguments must already be in canonical form.
+		"""
+		
+		# bypass the constructor
+		t = Te.__new__(Te)
+		t._settle(c,e,m)
+		
+		return t
+	
+	@staticmethod
+	def _merge(m,n,s=1):
+		"""Merge two monomials by adding exponents.
+		
+		Arguments:
+			m: tuple of (variable, exponent) pairs
+			n: tuple of (variable, exponent) pairs
+			s=1: integer, multiplier for exponents of second monomial
+			
+		Returns:
+			tuple of (variable, exponent) pairs
+		"""
+		
+		# trivial cases
+		if not n:
+			
+			return m
+			
+		if not m and s == 1:
+			
+			return n
+		
+		# step through both in sorted order
+		w = Te.table
+		r = []
+		a = 0
+		b = 0
+		while a < len(m) and b < len(n):
+			x,p = m[a]
+			y,q = n[b]
+			
+			# same variable, add exponents
+			if x is y or x == y:
+				g = p + s * q
+				if g != 0:
+					r.append((x,g))
+				a += 1
+				b += 1
+				
+			# or take the earlier variable
+			elif w[x] < w[y]:
+				r.append((x,p))
+				a += 1
+			else:
+				r.append((y,s * q))
+				b += 1
+				
+		# add leftovers
+		r.extend(m[a:])
+		r.extend((y,s * q) for y,q in n[b:])
+		
+		return tuple(r)
+	
 	@staticmethod
 	def _prime(n):
 		"""Factor integer into primes.
@@ -373,6 +608,9 @@ class Term (dict):
 			
 		Returns:
 			dictionary mapping prime factors to exponents
+			
+		Notes:
+			Factorization is complete, so that every key is prime, and cached.
 		"""
 			
 		# default to 1 for noninteger
@@ -386,9 +624,6 @@ class Term (dict):
 			
 			return {0:1}
 	
-		# primes
-		p = Te.primes
-		
 		# begin dictionary of prime factors
 		f = {}
 		
@@ -397,23 +632,146 @@ class Term (dict):
 			f['i'] = 2
 			n = abs(n)
 		
-		# scan through primes
-		for i in p:
+		# add cached factorization
+		for k,i in Te._factor(n):
+			f[k] = i
+				
+		return f
+	
+	@staticmethod
+	def _rho(n):
+		"""Find a nontrivial factor of a composite number with Pollard's rho algorithm, using Brent's cycle detection.
+		
+		Arguments:
+			n: integer, odd and composite
 			
-			# until prime bigger than dividend
-			if i > n:
-				break
+		Returns:
+			integer, a factor of n
+		"""
+		
+		# even numbers
+		if n % 2 == 0:
+			
+			return 2
+		
+		# try random polynomials x^2 + c until a factor is found
+		while True:
+			y = random.randrange(1,n)
+			c = random.randrange(1,n)
+			m = 128
+			g = 1
+			r = 1
+			q = 1
+			while g == 1:
+				x = y
+				for i in range(r):
+					y = (y * y + c) % n
+					
+				# accumulate products in batches before taking gcd
+				k = 0
+				while k < r and g == 1:
+					z = y
+					for i in range(min(m,r - k)):
+						y = (y * y + c) % n
+						q = q * abs(x - y) % n
+					g = math.gcd(q,n)
+					k += m
+					
+				r *= 2
 				
-			# divide out primes, add to factors
-			while n % i == 0:
-				n /= i
-				f[i] = f.get(i,0) + 1
+			# backtrack if batch overshot
+			if g == n:
+				g = 1
+				while g == 1:
+					z = (z * z + c) % n
+					g = math.gcd(abs(x - z),n)
+					
+			# success unless factor is trivial
+			if g != n:
+				
+				return g
+	
+	@staticmethod
+	def _sieve(n):
+		"""Extend the tuple of primes up to a limit with the sieve of Eratosthenes.
+		
+		Arguments:
+			n: integer, limit
 			
-		# add remainder as its own entry
-		if n > 1:
-			f[n] = 1
+		Returns:
+			None
+		"""
+		
+		# already sieved far enough
+		if Te.primes[-1] >= n:
+			
+			return None
+		
+		# sieve odd numbers
+		s = bytearray([1]) * (n + 1)
+		s[0] = 0
+		s[1] = 0
+		for i in range(2,int(n ** 0.5) + 1):
+			if s[i]:
+				s[i * i::i] = bytearray(len(range(i * i,n + 1,i)))
 				
-		return f
+		# replace primes
+		Te.primes = tuple(i for i in range(n + 1) if s[i])
+		
+		return None
+	
+	@staticmethod
+	def _test(n):
+		"""Test a number for primality with the Miller-Rabin test.
+		
+		Arguments:
+			n: integer, greater than one
+			
+		Returns:
+			boolean, prime?
+			
+		Notes:
+			The first twelve primes as witnesses make the test exact below 3 * 10^24, and a vanishingly unlikely error above.
+		"""
+		
+		# witnesses
+		w = Te.primes[:12]
+		
+		# small numbers
+		if n < 2:
+			
+			return False
+			
+		for i in w:
+			if n % i == 0:
+				
+				return n == i
+		
+		# write n - 1 as d * 2^s
+		d = n - 1
+		s = 0
+		while d % 2 == 0:
+			d //= 2
+			s += 1
+			
+		# test each witness
+		for i in w:
+			x = pow(i,d,n)
+			if x == 1 or x == n - 1:
+				continue
+				
+			# square until n - 1 is found
+			for j in range(s - 1):
+				x = x * x % n
+				if x == n - 1:
+					break
+					
+			# composite if never found
+			else:
+				
+				return False
+				
+		return True
 	
 	@staticmethod
 	def _variables(l):
@@ -473,6 +831,30 @@ class Term (dict):
 		
 		return a
 	
+	def __contains__(self,k):
+		"""Check for a key without unfolding the prime factors unless necessary.
+		
+		Arguments:
+			k: integer or string key
+			
+		Returns:
+			boolean
+		"""
+		
+		return self.look(k) != 0
+	
+	def __delitem__(self,k):
+		"""Prevent deletion of keys, as Term instances are immutable.
+		
+		Arguments:
+			k: key
+			
+		Returns:
+			None
+		"""
+		
+		raise TypeError('Term instances are immutable.')
+	
 	def __div__(self,t):
 		"""Use the / shortcut for division.
 		
@@ -488,6 +870,63 @@ class Term (dict):
 		
 		return d
 	
+	def __eq__(self,t):
+		"""Test equality with another Term instance by coefficient, imaginary unit, and monomial.
+		
+		Arguments:
+			t: Term instance or dictionary
+			
+		Returns:
+			boolean
+		"""
+		
+		# compare Terms directly
+		if isinstance(t,Term):
+			
+			return self.coefficient == t.coefficient and self.unit == t.unit and self.monomial == t.monomial
+			
+		# or compare dictionaries
+		if isinstance(t,dict):
+			self._unfold()
+			
+			return dict.__eq__(self,t)
+			
+		return NotImplemented
+	
+	def __getitem__(self,k):
+		"""Get an exponent from the dictionary view.
+		
+		Arguments:
+			k: integer or string key
+			
+		Returns:
+			integer
+		"""
+		
+		# unfold and retrieve
+		self._unfold()
+		
+		return dict.__getitem__(self,k)
+	
+	def __hash__(self):
+		"""Hash the Term instance by its coefficient, imaginary unit, and monomial.
+		
+		Arguments:
+			None
+			
+		Returns:
+			integer
+			
+		Notes:
+			The hash is calculated once and cached.
+		"""
+		
+		# calculate if not yet cached
+		if self._hash is None:
+			self._hash = hash((self.coefficient,self.unit,self.monomial))
+			
+		return self._hash
+	
 	def __iadd__(self,t):
 		"""Use the += shortcut for addition and reassignment to the same pointer.
 		
@@ -539,6 +978,21 @@ class Term (dict):
 		
 		return v
 	
+	def __iter__(self):
+		"""Iterate through the keys of the dictionary view.
+		
+		Arguments:
+			None
+			
+		Returns:
+			iterator
+		"""
+		
+		# unfold and iterate
+		self._unfold()
+		
+		return dict.__iter__(self)
+	
 	def __ipow__(self,n):
 		"""Use the **= shortcut for exponentiation and reassignment to the same pointer.
 		
@@ -577,6 +1031,21 @@ class Term (dict):
 		
 		return self.subtract(t)
 	
+	def __len__(self):
+		"""Count the keys of the dictionary view.
+		
+		Arguments:
+			None
+			
+		Returns:
+			integer
+		"""
+		
+		# unfold and count
+		self._unfold()
+		
+		return dict.__len__(self)
+	
 	def __mul__(self,t):
 		"""Use the * shortcut for multiplication.
 		
@@ -592,6 +1061,24 @@ class Term (dict):
 		
 		return m
 	
+	def __ne__(self,t):
+		"""Test inequality with another Term instance.
+		
+		Arguments:
+			t: Term instance or dictionary
+			
+		Returns:
+			boolean
+		"""
+		
+		# negate equality
+		q = self.__eq__(t)
+		if q is NotImplemented:
+			
+			return q
+		
+		return not q
+	
 	def __neg__(self):
 		"""Use the - shortcut for the additive inverse.
 		
@@ -637,6 +1124,21 @@ class Term (dict):
 		
 		return p
 	
+	def __repr__(self):
+		"""Represent the dictionary view on screen.
+		
+		Arguments:
+			None
+			
+		Returns:
+			string
+		"""
+		
+		# unfold and represent
+		self._unfold()
+		
+		return dict.__repr__(self)
+	
 	def __rshift__(self,g):
 		"""Use the >> shortcut to plug in an integer, fraction, variable, or Term instance for another variable.
 		
@@ -651,6 +1153,19 @@ class Term (dict):
 		
 		return self.plug(*g)
 	
+	def __setitem__(self,k,i):
+		"""Prevent assignment of keys, as Term instances are immutable.
+		
+		Arguments:
+			k: key
+			i: value
+			
+		Returns:
+			None
+		"""
+		
+		raise TypeError('Term instances are immutable.')
+	
 	def __sub__(self,t):
 		"""Use the - shortcut to subtract terms.
 		
@@ -667,6 +1182,81 @@ class Term (dict):
 		
 		return s
 	
+	def _settle(self,c,e,m):
+		"""Settle the attributes of a new Term instance.
+		
+		Arguments:
+			c: Fraction, coefficient
+			e: integer, 0 or 1, power of imaginary unit
+			m: tuple of (variable, exponent) pairs
+			
+		Returns:
+			None
+		"""
+		
+		# zero drops the imaginary unit and variables
+		if c == 0:
+			c = Fraction(0)
+			e = 0
+			m = ()
+			
+		# attributes
+		self.coefficient = c
+		self.unit = e
+		self.monomial = m
+		
+		# caches for hash and partitions
+		self._hash = None
+		self._parts = None
+		
+		# dictionary view not yet unfolded
+		self._unfolded = False
+			
+		return None
+		
+	def _unfold(self):
+		"""Unfold the coefficient, imaginary unit, and monomial into the dictionary view.
+		
+		Arguments:
+			None
+			
+		Returns:
+			None
+		"""
+		
+		# only once
+		if self._unfolded:
+			
+			return None
+			
+		self._unfolded = True
+		
+		# zero is represented by {0:1}
+		c = self.coefficient
+		if c == 0:
+			dict.__setitem__(self,0,1)
+			
+			return None
+			
+		# prime factors of numerator
+		for k,i in Te._prime(abs(c.numerator)).items():
+			dict.__setitem__(self,k,i)
+			
+		# prime factors of denominator
+		for k,i in Te._prime(c.denominator).items():
+			dict.__setitem__(self,k,-i)
+			
+		# imaginary unit, with i^2 for negatives
+		g = self.look('i')
+		if g != 0:
+			dict.__setitem__(self,'i',g)
+			
+		# variables
+		for k,i in self.monomial:
+			dict.__setitem__(self,k,i)
+			
+		return None
+	
 	def add(self,t):
 		"""Add two terms if they are compatible.
 		
@@ -679,50 +1269,78 @@ class Term (dict):
 		"""
 		
 		# convert to term
-		t = Te(t)
+		if not isinstance(t,Term):
+			t = Te(t)
 		
 		# check for zero in self
-		if 0 in self:
+		if self.coefficient == 0:
 			
-			return t.copy()
+			return t
 			 
 		# check for zero in added term
-		if 0 in t:
+		if t.coefficient == 0:
 			
-			return self.copy()
-		
-		# parse term into numbers, variables, and imaginary unit
-		u,v,w = self.parse()
-		x,y,z = t.parse()
+			return self
 		
 		# test variables for equality
-		if not v.compare(y):
+		if self.monomial != t.monomial:
 			
 			return None
 			
-		# test for equal or opposite imaginary units
-		g = abs(w.look('i') - z.look('i'))
-		if g % 2 != 0:
+		# test for equal imaginary units, as opposites are folded into the sign
+		if self.unit != t.unit:
 			
 			return None
 			
-		# make fractions
-		b,c = u.fuse()
-		p,q = x.fuse()
-				
-		# cross-multiply and add or subtract to get nunerator, depending on i
-		if g == 0:
-			n = (b * q) + (p * c)
-		if g == 2:
-			n = (b * q) - (p * c)
+		# add coefficients, retaining variables and imaginary unit 
+		c = self.coefficient + t.coefficient
+		a = Te._make(c,self.unit,self.monomial)
+		
+		return a
+		
+	def antiderive(self,x):
+		"""Take the antiderivative by the inverse of the power rule.
+		
+		Arguments:
+			x: string, the integrating variable
 			
-		# new denominator
-		d = c * q
+		Returns:
+			Term instance, or
+			None if the exponent of x is -1
 			
-		# retain variables and imaginary unit 
-		a = Te(n,d,v,w)
+		Examples:
+			The antiderivative of (3x^2 y) with respect to x is (x^3 y).
+			
+			The antiderivative of (2x^-3) with respect to x is (-x^-2).
+			
+			The antiderivative of (x^-1) is the logarithm, which is not a term, so None is returned.
+		"""
 		
-		return a
+		# exponent of x
+		p = self.look(x)
+		
+		# logarithm is beyond a term
+		if p == -1:
+			
+			return None
+			
+		# raise exponent of variable and divide by new exponent
+		m = Te._merge(self.monomial,((Te._intern(x),1),))
+		t = Te._make(self.coefficient / (p + 1),self.unit,m)
+		
+		return t
+
+	def clear(self):
+		"""Prevent clearing, as Term instances are immutable.
+		
+		Arguments:
+			None
+			
+		Returns:
+			None
+		"""
+		
+		raise TypeError('Term instances are immutable.')
 
 	def compare(self,t):
 		"""Compare two Term instances for equality.
@@ -736,7 +1354,7 @@ class Term (dict):
 		
 		# compare terms
 		q = False
-		if cmp(self,t) == 0:
+		if self == t:
 			q = True
 		
 		return q
@@ -777,22 +1395,20 @@ class Term (dict):
 		if p != 0:
 			
 			# multiply by exponent and reduce exponent of variable
-			t = Te(p,self,{x:-1})
+			m = Te._merge(self.monomial,((Te._intern(x),-1),))
+			t = Te._make(self.coefficient * p,self.unit,m)
 			w.append(t)
 		
 		# product rule generates new term for every function of x
-		v = self.parse()[1]
-		for i in v:
+		for i,p in self.monomial:
 			
 			# check for stems
 			s = [i.startswith(j) for j in f]
 			if True in s:
-				p = self.look(i)
-				if p != 0:
 					
-					# multiply by exponent, reduce exponent of stem, and add subscripted stem
-					t = Te(p,self,{i:-1, i + x:1})
-					w.append(t)
+				# multiply by exponent, reduce exponent of stem, and add subscripted stem
+				t = Te(p,self,{i:-1, i + x:1})
+				w.append(t)
 			
 		return w
 	
@@ -806,10 +1422,12 @@ class Term (dict):
 			Term instance
 		"""
 		
-		# invert self, multiply, revert
-		v = self.invert()
-		d = v.multiply(t)
-		d = d.invert()
+		# convert to term
+		if not isinstance(t,Term):
+			t = Te(t)
+			
+		# multiply by inverse
+		d = self.multiply(t.invert())
 		
 		return d
 
@@ -831,13 +1449,12 @@ class Term (dict):
 		# add imaginary unit to dictionary
 		d['i'] = Re(0,1)
 				
-		# parse term, recombine variables and imaginary
-		n,v,m = self.parse()
-		v = Te(v,m)
-		
-		# multiply in variables
+		# multiply in variables and imaginary unit
 		c = Re(1)
-		for k,i in v.items():
+		v = self.monomial
+		if self.unit:
+			v += (('i',self.unit),)
+		for k,i in v:
 			
 			# catch missing keys
 			try:
@@ -848,8 +1465,9 @@ class Term (dict):
 					
 				raise ValueError('Not all variables accounted for, evaluation aborted.\n')
 					
-		# make fraction
-		f,g = n.fuse()
+		# make fraction, including sign
+		f = self.coefficient.numerator
+		g = self.coefficient.denominator
 		c = c.multiply(Re(f))
 		c = c.divide(Re(g))
 					
@@ -867,29 +1485,29 @@ class Term (dict):
 				integer, denominator
 		"""
 		
-		# check for zero
-		if 0 in self:
-			
-			return 0,1
-		
-		# make numerator and denominator
-		n = 1
-		d = 1
-		for k,i in self.items():
-			
-			# integer atoms
-			try:
-				if i < 0:
-					d *= k ** -i
-				else:
-					n *= k ** i
-						
-			# ignore non number atoms
-			except:
-				pass
+		# numerator and denominator of coefficient, without sign
+		c = self.coefficient
+		n = abs(c.numerator)
+		d = c.denominator
 					
 		return n,d
 	
+	def get(self,k,d=None):
+		"""Get an exponent from the dictionary view.
+		
+		Arguments:
+			k: integer or string key
+			d=None: default value
+			
+		Returns:
+			integer
+		"""
+		
+		# unfold and retrieve
+		self._unfold()
+		
+		return dict.get(self,k,d)
+	
 	def invert(self):
 		"""Invert the Term instancr.
 		
@@ -900,11 +1518,40 @@ class Term (dict):
 			Term instance
 		"""
 		
-		# flip and filter
-		v = Te._flip(self)
-		v = Te._filter(v)
+		# raise to power of -1
+		v = self.power(-1)
+		
+		return v
+	
+	def items(self):
+		"""Get the items of the dictionary view.
+		
+		Arguments:
+			None
+			
+		Returns:
+			dictionary items
+		"""
+		
+		# unfold and retrieve
+		self._unfold()
+		
+		return dict.items(self)
+		
+	def keys(self):
+		"""Get the keys of the dictionary view.
+		
+		Arguments:
+			None
+			
+		Returns:
+			dictionary keys
+		"""
+		
+		# unfold and retrieve
+		self._unfold()
 		
-		return Te(v)
+		return dict.keys(self)
 	
 	def look(self,k):
 		"""Look up the exponent associated with a variable or prime.
@@ -916,8 +1563,40 @@ class Term (dict):
 			integer: exponent of variable or prime in Term instance
 		"""
 		
+		# imaginary unit, with i^2 for negatives
+		if k == 'i':
+			p = self.unit
+			if self.coefficient < 0:
+				p += 2
+				
+			return p
+		
+		# variables from monomial
+		try:
+			if k.isalpha():
+				p = 0
+				for j,i in self.monomial:
+					if j == k:
+						p = i
+						break
+						
+				return p
+				
+		# numbers from dictionary view
+		except AttributeError:
+			pass
+			
+		# zero from coefficient
+		if k == 0:
+			p = 0
+			if self.coefficient == 0:
+				p = 1
+			
+			return p
+			
 		# get exponent, default to zero
-		p = self.get(k,0)
+		self._unfold()
+		p = dict.get(self,k,0)
 		
 		return p
 	
@@ -931,8 +1610,22 @@ class Term (dict):
 			Term instance
 		"""
 		
-		# make new term from elements
-		m = Te(t,self)
+		# convert to term
+		if not isinstance(t,Term):
+			t = Te(t)
+			
+		# multiply coefficients
+		c = self.coefficient * t.coefficient
+		
+		# fold i^2 into the sign
+		e = self.unit + t.unit
+		if e > 1:
+			c = -c
+			e -= 2
+			
+		# merge monomials
+		v = Te._merge(self.monomial,t.monomial)
+		m = Te._make(c,e,v)
 				
 		return m
 		
@@ -947,29 +1640,33 @@ class Term (dict):
 				Term instance for numbers,
 				Term instance for variables,
 				Term instance for imaginary unit
+				
+		Notes:
+			The partitions are made once and cached.
 		"""
 		
-		# initiate dictionaries for numbers, variables, and imaginary unit
-		n = {}
-		v = {}
-		m = {}
+		# return partitions if already made
+		if self._parts is not None:
+			
+			return self._parts
 		
-		# parse powers
-		for k,i in self.items():
-				
-			# segregate numbers
-			try:
-				k = int(k)
-				n[k] = i
-					
-			# and variables
-			except:
-				if k == 'i':
-					m[k] = i
-				else:
-					v[k] = i
+		# numbers are the magnitude of the coefficient
+		c = self.coefficient
+		n = Te._make(abs(c),0,())
+		
+		# variables are the monomial
+		v = Te._make(Fraction(1),0,self.monomial)
+		
+		# imaginary unit carries the sign
+		s = Fraction(1)
+		if c < 0:
+			s = -s
+		m = Te._make(s,self.unit,())
+		
+		# cache partitions
+		self._parts = n,v,m
 				
-		return Te(n),Te(v),Te(m)
+		return self._parts
 		
 	def plug(self,y,x):
 		"""Plug in a Term instance, fraction, or integer for a variable.
@@ -1012,6 +1709,30 @@ class Term (dict):
 		
 		return t
 		
+	def pop(self,*a):
+		"""Prevent popping, as Term instances are immutable.
+		
+		Arguments:
+			*a: unpacked tuple, key and default
+			
+		Returns:
+			None
+		"""
+		
+		raise TypeError('Term instances are immutable.')
+		
+	def popitem(self):
+		"""Prevent popping, as Term instances are immutable.
+		
+		Arguments:
+			None
+			
+		Returns:
+			None
+		"""
+		
+		raise TypeError('Term instances are immutable.')
+		
 	def power(self,n):
 		"""Raise the Term instance to a power.
 		
@@ -1022,13 +1743,37 @@ class Term (dict):
 			Term instance
 		"""
 		
-		# multiply all exponents
-		p = {}
+		# power of zero
 		n = int(n)
-		for k,i in self.items():
-			p[k] = i * n
+		c = self.coefficient
+		if c == 0:
+			
+			# division by zero
+			if n < 0:
+				print('Division by zero not allowed!\n')
+				
+			# zero to zero is one
+			if n == 0:
+				
+				return Te._make(Fraction(1),0,())
+				
+			return self
+			
+		# raise coefficient
+		c = c ** n
+		
+		# power of imaginary unit
+		e = (self.unit * n) % 4
+		if e > 1:
+			c = -c
+			e -= 2
+			
+		# multiply all exponents
+		m = ()
+		if n != 0:
+			m = tuple((k,i * n) for k,i in self.monomial)
 			
-		return Te(p)
+		return Te._make(c,e,m)
 		
 	def scale(self,n,d=1):
 		"""Scale the term by a constant.
@@ -1041,11 +1786,29 @@ class Term (dict):
 			Term instance
 		"""
 		
-		# multiply for new term
-		s = self.multiply((n,d))
+		# multiply coefficient directly unless dividing by zero
+		try:
+			c = self.coefficient * Fraction(int(n),int(d))
+			s = Te._make(c,self.unit,self.monomial)
+			
+		# otherwise multiply for new term
+		except ZeroDivisionError:
+			s = self.multiply((n,d))
 		
 		return s
 
+	def setdefault(self,*a):
+		"""Prevent assignment of keys, as Term instances are immutable.
+		
+		Arguments:
+			*a: unpacked tuple, key and default
+			
+		Returns:
+			None
+		"""
+		
+		raise TypeError('Term instances are immutable.')
+
 	def subtract(self,t):
 		"""Subtract another Term instance from the Term instance if they are compatible.
 		
@@ -1066,6 +1829,34 @@ class Term (dict):
 		
 		return s
 
+	def update(self,*a,**w):
+		"""Prevent updating, as Term instances are immutable.
+		
+		Arguments:
+			*a: unpacked tuple
+			**w: unpacked dictionary
+			
+		Returns:
+			None
+		"""
+		
+		raise TypeError('Term instances are immutable.')
+
+	def values(self):
+		"""Get the values of the dictionary view.
+		
+		Arguments:
+			None
+			
+		Returns:
+			dictionary values
+		"""
+		
+		# unfold and retrieve
+		self._unfold()
+		
+		return dict.values(self)
+
 	def view(self):
 		"""View the term in readable form.
 		
@@ -0,0 +1,6 @@
+# tests
+# unit tests of alliquator, run with python -m unittest from the top directory
+
+# draw without a display
+import os
+os.environ.setdefault('MPLBACKEND','Agg')
@@ -0,0 +1,54 @@
+# test_aberth.py
+# tests of the aberth-ehrlich solver
+
+# import unittest
+import unittest
+
+# import numpy
+import numpy as np
+
+# import alliquator
+import alliquator as aq
+Eq = aq.Eq
+
+
+# AberthTest
+class AberthTest(unittest.TestCase):
+	"""Tests of Equation._aberth through solve and prepared solvers, against companion matrices."""
+	
+	def assertRoots(self,r,s):
+		"""Assert that each row of roots matches the same row of other roots, in any order."""
+		
+		# nearest root of other row
+		for i,j in zip(np.atleast_2d(r),np.atleast_2d(s)):
+			self.assertEqual(len(i),len(j))
+			for k in j:
+				self.assertAlmostEqual(min(abs(i - k)),0,8)
+				
+	def test_solve(self):
+		"""Solving a sextic by the aberth-ehrlich method agrees with the companion matrix."""
+		
+		# x^6 - 2x^5 + 2x^3 - x + 3
+		e = Eq('x6 - 2x5 + a x3 - x + 3')
+		r = e.solve('x','aberth',a=2)
+		s = e.solve('x',a=2)
+		self.assertRoots(np.array([complex(i) for i in r]),np.array([complex(i) for i in s]))
+		
+	def test_prepared(self):
+		"""Prepared solvers give the same roots by either method, cold or warm started."""
+		
+		# a quintic along a path, and at scattered points
+		h = Eq('x5 - a x4 + 3x2 - a2 x + 1').prepare('x')
+		for a in (np.linspace(-3,3,200),np.random.default_rng(5).uniform(-3,3,50)):
+			s = h(a)
+			self.assertRoots(h(a,m='aberth'),s)
+			self.assertRoots(h(a,m='aberth',w=True),s)
+			
+		# from given starting roots
+		a = np.linspace(-1,1,10)
+		s = h(a)
+		self.assertRoots(h(a,z=s + 0.01),s)
+
+
+if __name__ == '__main__':
+	unittest.main()
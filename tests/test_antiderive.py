@@ -0,0 +1,63 @@
+# test_antiderive.py
+# tests of exact integration by antiderivatives
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Te = aq.Term
+Li = aq.Li
+Ex = aq.Ex
+
+
+# AntideriveTest
+class AntideriveTest(unittest.TestCase):
+	"""Tests of antiderive and of exact integration in Expression.integrate."""
+	
+	def test_terms(self):
+		"""Terms and lines are antiderived by the inverse power rule."""
+		
+		# power rule, including negative powers
+		self.assertEqual(Te('3x2 y').antiderive('x'),Te('x3 y'))
+		self.assertEqual(Te('2x-3').antiderive('x'),Te('-x-2'))
+		self.assertEqual(Li('3x2 + 2x + 1').antiderive('x'),Li('x3 + x2 + x'))
+		
+		# logarithms are beyond them
+		self.assertIsNone(Te('x-1').antiderive('x'))
+		self.assertIsNone(Li('x-1 + 1').antiderive('x'))
+		
+	def test_expressions(self):
+		"""Expressions over a single term are divided through and antiderived."""
+		
+		# (x^3 + 2) / (2x^2) = 1/2 x + x^-2
+		self.assertEqual(Ex('x3 + 2','2x2').antiderive('x'),Ex('1/4x2 - x-1'))
+		
+		# a logarithm, and a bottom of more than one term
+		self.assertIsNone(Ex('x2 + 1','x').antiderive('x'))
+		self.assertIsNone(Ex('1','x + 1').antiderive('x'))
+		
+	def test_exact(self):
+		"""Integrals with antiderivatives are exact."""
+		
+		# x^2 y from 0 to 1 with y = 2
+		r = Ex('x2 y').integrate('x',0,1,False,y=2)
+		self.assertAlmostEqual(r[0].real,2 / 3,14)
+		self.assertEqual(r.errors,[0.0])
+		
+		# x^-2 from 1 to 2
+		r = Ex('x-2').integrate('x',1,2,False)
+		self.assertAlmostEqual(r[0].real,1 / 2,14)
+		self.assertEqual(r.errors,[0.0])
+		
+	def test_pole(self):
+		"""A path through a pole of the antiderivative is integrated numerically instead."""
+		
+		# x^-2 from -1 to 1 crosses zero
+		r = Ex('x-2').integrate('x',-1,1,64,False)
+		self.assertIsNone(r.errors)
+		self.assertGreater(r[0].real,2)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,63 @@
+# test_arithmetic.py
+# tests of arithmetic on terms with fractional coefficients
+
+# import unittest
+import unittest
+
+# import fractions
+from fractions import Fraction
+
+# import alliquator
+import alliquator as aq
+Te = aq.Term
+Li = aq.Li
+
+
+# ArithmeticTest
+class ArithmeticTest(unittest.TestCase):
+	"""Tests of Term arithmetic on the coefficient, unit, and monomial."""
+	
+	def test_add(self):
+		"""Like terms add their fractional coefficients."""
+		
+		# 1/3 x^2 + 1/6 x^2
+		self.assertEqual(Te('1/3x2').add(Te('1/6x2')),Te('1/2x2'))
+		
+	def test_multiply(self):
+		"""Products and quotients multiply coefficients and add exponents."""
+		
+		# products and quotients
+		a = Te('1/3x2')
+		self.assertEqual(a.multiply(Te('3/2y')),Te('1/2x2 y'))
+		self.assertEqual(a.divide(Te('2x')),Te('1/6x'))
+		self.assertEqual(a.scale(Fraction(3)),Te('x2'))
+		
+		# powers of i
+		self.assertEqual(Te('i').multiply(Te('i')),Te('-1'))
+		self.assertEqual(Te('i').power(3),Te('-i'))
+		
+	def test_power(self):
+		"""Powers and inverses work on the whole term."""
+		
+		# (1/3 x^2)^3 and its inverse
+		a = Te('1/3x2')
+		self.assertEqual(a.power(3),Te('1/27x6'))
+		self.assertEqual(a.invert(),Te('3x-2'))
+		self.assertEqual(a.look('x'),2)
+		
+	def test_derive(self):
+		"""Derivatives follow the power rule."""
+		
+		# d/dx 1/3 x^2
+		self.assertEqual(Te('1/3x2').derive('x')[0],Te('2/3x'))
+		
+	def test_extract(self):
+		"""The common factor of a line is the gcd of numerators over the lcm of denominators."""
+		
+		# 2/3 x + 4/9 y
+		self.assertEqual(Li('2/3x + 4/9y').extract(),Te('2/9'))
+		self.assertEqual(Li('21x2 - 42i x + 14x y').extract(),Te('7x'))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,96 @@
+# test_companions.py
+# tests of solving equations beyond cubics, and sorting their solutions into branches
+
+# import unittest
+import unittest
+
+# import numpy
+import numpy as np
+
+# import alliquator
+import alliquator as aq
+Eq = aq.Eq
+Re = aq.Re
+Pa = aq.Page
+Bo = aq.Book
+Sh = aq.Shelf
+
+
+# CompanionTest
+class CompanionTest(unittest.TestCase):
+	"""Tests of Equation.solve, Equation.sample, Book.hone, and Shelf.polish beyond cubics."""
+	
+	def test_quintic(self):
+		"""Roots of a quintic agree with numpy."""
+		
+		# x^5 - 3x^3 + y x - 1 at y = 2
+		r = Eq('x5 - 3x3 + y x - 1').solve('x',y=2)
+		s = np.roots([1,0,-3,0,2,-1])
+		self.assertEqual(len(r),5)
+		for i in s:
+			self.assertAlmostEqual(min([abs(complex(j) - i) for j in r]),0)
+			
+	def test_sample(self):
+		"""Sampling gives every branch at every point."""
+		
+		# x^4 = y has four roots of modulus y^(1/4)
+		b = Eq('x4 - y').sample('x','y',[1,2,3])
+		for p,y in zip(b,[1,2,3]):
+			self.assertEqual(len(p),4)
+			for i in p:
+				self.assertAlmostEqual(abs(complex(i)),y ** 0.25)
+				
+	def test_hone(self):
+		"""Honing sorts many scrambled branches without growing the table of permutations."""
+		
+		# six branches, scrambled at every point
+		g = np.random.default_rng(1)
+		x = np.linspace(0,1,20)
+		f = [lambda t,k=k: k + (k + 1) * 0.3 * t + 0.2j * k * t * t for k in range(6)]
+		b = []
+		for t in x:
+			v = [f[k](t) for k in range(6)]
+			p = Pa([Re(v[i]) for i in g.permutation(6)])
+			p.inputs = {'x': Re(t)}
+			b.append(p)
+		b = Bo(b,'x')
+		
+		# hone
+		n = len(Re.permutations)
+		h = b.hone()
+		self.assertEqual(len(Re.permutations),n)
+		
+		# each branch follows one function
+		for k in range(6):
+			m = round(complex(h[0][k]).real)
+			for p,t in zip(h,x):
+				self.assertAlmostEqual(abs(complex(p[k]) - f[m](t)),0)
+				
+	def test_polish(self):
+		"""Polishing many branches keeps every solution at every point."""
+		
+		# five branches on a grid, scrambled at every point
+		g = np.random.default_rng(2)
+		f = [lambda t,s,k=k: k + (k + 1) * 0.3 * t + 0.2j * k * s for k in range(5)]
+		h = []
+		for s in np.linspace(0,1,6):
+			b = []
+			for t in np.linspace(0,1,8):
+				v = [f[k](t,s) for k in range(5)]
+				p = Pa([Re(v[i]) for i in g.permutation(5)])
+				p.inputs = {'x': Re(t),'y': Re(s)}
+				b.append(p)
+			h.append(Bo(b,'x'))
+		h = Sh(h,'y')
+		
+		# polish
+		n = len(Re.permutations)
+		q = h.polish()
+		self.assertEqual(len(Re.permutations),n)
+		for a,b in zip(h,q):
+			for i,j in zip(a,b):
+				self.assertEqual(sorted([complex(k).real for k in i]),sorted([complex(k).real for k in j]))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,57 @@
+# test_compile.py
+# tests of compiling expressions
+
+# import unittest
+import unittest
+
+# import numpy
+import numpy as np
+
+# import alliquator
+import alliquator as aq
+Ex = aq.Ex
+
+
+# CompileTest
+class CompileTest(unittest.TestCase):
+	"""Tests of Expression.compile."""
+	
+	def test_value(self):
+		"""Compiled functions agree with evaluate."""
+		
+		# (x^2 y - 3i x + 1/2) / (y - 1)
+		e = Ex('x2 y - 3i x + 1/2','y - 1')
+		f = e.compile('x','y')
+		for x,y in [(1,2),(0.5 - 1j,3),(-2,0.25j)]:
+			self.assertAlmostEqual(abs(f(x,y) - e.evaluate(x=x,y=y)[0]),0)
+			
+		# source is kept
+		self.assertIn('def f',f.source)
+		
+	def test_arrays(self):
+		"""Compiled functions take arrays."""
+		
+		# x^2 + y over arrays of x
+		f = Ex('x2 + y').compile('x','y')
+		r = f(np.array([1,2,3]),1j)
+		self.assertEqual(r.dtype,np.complex128)
+		self.assertEqual(list(r),[1 + 1j,4 + 1j,9 + 1j])
+		
+	def test_order(self):
+		"""Without variables given, they are taken in the order of scan."""
+		
+		# x - y
+		f = Ex('x - y').compile()
+		self.assertEqual(f(3,1),2)
+		
+	def test_poles(self):
+		"""Sampling at a pole evaluates it as evaluate does."""
+		
+		# 1 / x at 0
+		e = Ex('1','x')
+		b = e.sample('x',[0,1])
+		self.assertEqual(b[0][0],e.evaluate(x=0)[0])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,38 @@
+# test_condense.py
+# tests of condensing lines
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Te = aq.Term
+Li = aq.Li
+
+
+# CondenseTest
+class CondenseTest(unittest.TestCase):
+	"""Tests of Line._condense."""
+	
+	def test_merge(self):
+		"""Like terms merge, cancelled terms drop out, and later matches come at the end."""
+		
+		# x + 2y - x + 3x + ix + 2y
+		l = Li._condense([Te('x'),Te('2y'),Te('-x'),Te('3x'),Te('i x'),Te('2y')])
+		self.assertEqual(l,[Te('4y'),Te('3x'),Te('i x')])
+		
+	def test_zero(self):
+		"""Terms cancelling completely leave nothing."""
+		
+		# x - x
+		self.assertEqual(Li._condense([Te('x'),Te('-x')]),[])
+		
+	def test_units(self):
+		"""Real and imaginary terms of the same monomial are kept apart."""
+		
+		# x + ix + x
+		self.assertEqual(Li._condense([Te('x'),Te('i x'),Te('x')]),[Te('2x'),Te('i x')])
+
+
+if __name__ == '__main__':
+	unittest.main()
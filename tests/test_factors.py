@@ -0,0 +1,47 @@
+# test_factors.py
+# tests of factoring coefficients
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Te = aq.Term
+
+
+# FactorTest
+class FactorTest(unittest.TestCase):
+	"""Tests of Term._factor and Term._prime."""
+	
+	def test_small(self):
+		"""Small numbers are factored completely."""
+		
+		# 360 = 2^3 3^2 5, and 1 has no factors
+		self.assertEqual(Te._factor(360),((2,3),(3,2),(5,1)))
+		self.assertEqual(Te._factor(1),())
+		
+		# primes beyond 101
+		self.assertEqual(Te._prime(103 * 107),{103: 1,107: 1})
+		
+	def test_large(self):
+		"""Factors beyond the trial division bound are found by Pollard's rho, and large primes are recognized."""
+		
+		# product of primes beyond the bound
+		self.assertEqual(Te._factor(1000003 * 1000033),((1000003,1),(1000033,1)))
+		self.assertEqual(Te._factor(600851475143),((71,1),(839,1),(1471,1),(6857,1)))
+		
+		# a mersenne prime
+		self.assertEqual(Te._factor(2 ** 61 - 1),((2 ** 61 - 1,1),))
+		
+	def test_cache(self):
+		"""Repeated coefficients are factored once."""
+		
+		# factor twice
+		Te._factor(2 ** 31 * 999983)
+		h = Te._factor.cache_info().hits
+		Te._factor(2 ** 31 * 999983)
+		self.assertEqual(Te._factor.cache_info().hits,h + 1)
+
+
+if __name__ == '__main__':
+	unittest.main()
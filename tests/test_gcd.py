@@ -0,0 +1,106 @@
+# test_gcd.py
+# tests of polynomial greatest common divisors
+
+# import unittest
+import time
+import unittest
+
+# import alliquator
+import alliquator as aq
+Li = aq.Li
+Ex = aq.Ex
+
+
+# GcdTest
+class GcdTest(unittest.TestCase):
+	"""Tests of Line.common, Line.quotient, and cancelling in Expression.add and simplify."""
+	
+	def test_coprime(self):
+		"""Coprime lines have a constant divisor."""
+		
+		# one
+		self.assertEqual(Li('x + y').common(Li('x + 2')),Li(1))
+		self.assertEqual(Li('x2 + 1').common(Li('x - 1')),Li(1))
+		
+	def test_shared(self):
+		"""Shared factors are found, along with the common factor of the terms."""
+		
+		# 2(x + y)
+		self.assertEqual(Li('2x2 - 2y2').common(Li('4x2 + 4x y')),Li('2x + 2y'))
+		
+		# shared factor in three variables
+		a = Li('x2 + 3x y + z')
+		b = Li('x3 + y z + 1')
+		c = Li('x y - 2z + 5')
+		d = a.multiply(c).power(2).common(b.multiply(c).power(3))
+		self.assertEqual(d,c.power(2))
+		
+	def test_fractions(self):
+		"""Fractional coefficients give a monic divisor times the common factor of the terms."""
+		
+		# 1/6 (x^2 - 2/3)
+		self.assertEqual(Li('1/2 x2 - 1/3').common(Li('3/2 x2 - 1')),Li('1/6 x2 - 1/9'))
+		
+	def test_gaussian(self):
+		"""Complex coefficients are divided by pseudo-remainder sequences."""
+		
+		# x + i
+		self.assertEqual(Li('x2 + 1').common(Li('x + i')),Li('x + i'))
+		
+	def test_cost(self):
+		"""Coprime powers are recognized quickly."""
+		
+		# cubes of coprime polynomials
+		t = time.time()
+		d = Li('x2 + 3x y + z').power(3).common(Li('x3 + y z + 1').power(3))
+		self.assertEqual(d,Li(1))
+		self.assertLess(time.time() - t,2.0)
+		
+	def test_quotient(self):
+		"""Exact quotients are found, or None."""
+		
+		# divisible
+		self.assertEqual(Li('x2 - y2').quotient(Li('x + y')),Li('x - y'))
+		
+		# not divisible
+		self.assertIsNone(Li('x2 + 1').quotient(Li('x + 1')))
+		
+	def test_add(self):
+		"""Different denominators are cross multiplied, or combined over their least common multiple if asked."""
+		
+		# cross multiplied by default
+		a = Ex('1','x2 - 1')
+		b = Ex('1','x + 1')
+		e = a.add(b)
+		self.assertEqual(len(e.bottom()),4)
+		self.assertAlmostEqual(abs(e.evaluate(x=3)[0] - 0.375),0)
+		
+		# least common multiple
+		e = a.add(b,True)
+		self.assertEqual(len(e.bottom()),2)
+		self.assertAlmostEqual(abs(e.evaluate(x=3)[0] - 0.375),0)
+		
+		# coprime denominators
+		e = Ex('x','y + 1').add(Ex('y','x + 1'),True)
+		self.assertAlmostEqual(abs(e.evaluate(x=3,y=0.5)[0] - 2.125),0)
+		
+		# subtraction
+		e = Ex('1','x - 1').subtract(Ex('1','x2 - 1'),True)
+		self.assertEqual(len(e.bottom()),2)
+		self.assertAlmostEqual(abs(e.evaluate(x=3)[0] - 0.375),0)
+		
+	def test_simplify(self):
+		"""Common polynomial factors of top and bottom are cancelled."""
+		
+		# x - y
+		e = Ex('x2 - y2','x + y').simplify()
+		self.assertEqual(len(e.bottom()),1)
+		self.assertAlmostEqual(abs(e.evaluate(x=3,y=0.5)[0] - 2.5),0)
+		
+		# nothing to cancel
+		e = Ex('x2 + y2','x + y').simplify()
+		self.assertEqual(len(e.bottom()),2)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,63 @@
+# test_halley.py
+# tests of crisping roots by halley's method
+
+# import unittest
+import unittest
+
+# import numpy
+import numpy as np
+
+# import alliquator
+import alliquator as aq
+Eq = aq.Eq
+Ex = aq.Ex
+Re = aq.Re
+
+
+# HalleyTest
+class HalleyTest(unittest.TestCase):
+	"""Tests of Equation._halley, Equation.crisp, and crisped sampling."""
+	
+	def test_arrays(self):
+		"""All roots at all points are crisped together."""
+		
+		# x^2 - a at a = 1, 4 from rough roots
+		c = Eq._halley(Ex('x2 - a'),'x',['a'])
+		r,m = c(np.array([[1.1,-0.9],[2.2,-1.8]]),np.array([1,4]))
+		self.assertAlmostEqual(abs(r - np.array([[1,-1],[2,-2]])).max(),0)
+		self.assertLess(m.max(),1e-12)
+		
+	def test_double(self):
+		"""A double root never ends worse than it starts."""
+		
+		# (x - 1)^2 from 1.1
+		c = Eq._halley(Ex('x2 - 2x + 1'),'x',[])
+		r,m = c(np.array([[1.1]]))
+		self.assertLessEqual(m[0][0],0.01)
+		self.assertLess(abs(r[0][0] - 1),0.1)
+		
+	def test_crisp(self):
+		"""Equation.crisp keeps its list interface."""
+		
+		# x^2 - 2
+		r = Eq('x2 - 2').crisp('x',[Re(1.4),Re(-1.4)])
+		self.assertAlmostEqual(abs(r[0] - 2 ** 0.5),0,14)
+		self.assertAlmostEqual(abs(r[1] + 2 ** 0.5),0,14)
+		
+	def test_residuals(self):
+		"""Crisped samples keep their residuals."""
+		
+		# x^2 - a at a = 1, 4
+		b = Eq('x2 - a').sample('x','a',[1,4],True)
+		self.assertEqual(b.residuals.shape,(2,2))
+		self.assertLess(b.residuals.max(),1e-12)
+		
+		# copies leave them out
+		self.assertIsNone(b.copy().residuals)
+		
+		# not crisped
+		self.assertIsNone(Eq('x2 - a').sample('x','a',[1,4]).residuals)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,67 @@
+# test_kernels.py
+# tests of the closed form root kernels
+
+# import unittest
+import unittest
+
+# import numpy
+import numpy as np
+
+# import alliquator
+import alliquator as aq
+Eq = aq.Eq
+Re = aq.Re
+
+
+# KernelTest
+class KernelTest(unittest.TestCase):
+	"""Tests of Equation._linears, _quadratics, and _cubics."""
+	
+	def assertRoots(self,r,s):
+		"""Assert that a row of roots matches other roots in any order."""
+		
+		# nearest root of other row
+		self.assertEqual(len(r),len(s))
+		for k in s:
+			self.assertAlmostEqual(min(abs(np.asarray(r) - k)),0)
+			
+	def test_linear(self):
+		"""Linear equations are solved at all points."""
+		
+		# a x + b
+		r = Eq._linears(np.array([1,2],dtype=complex),np.array([-3,8],dtype=complex))
+		self.assertRoots(r[:,0],[3,-4])
+		
+	def test_quadratic(self):
+		"""Quadratics avoid cancellation in the smaller root."""
+		
+		# x^2 - 3x + 2, x^2 + 10^8 x + 1, x^2 + 1
+		a = np.array([1,1,1],dtype=complex)
+		b = np.array([-3,1e8,0],dtype=complex)
+		c = np.array([2,1,1],dtype=complex)
+		r = Eq._quadratics(a,b,c)
+		self.assertRoots(r[0],[1,2])
+		self.assertRoots(r[2],[1j,-1j])
+		
+		# small root to full relative precision
+		u = r[1][np.argmin(abs(r[1]))]
+		self.assertAlmostEqual(abs(u / -1.00000000000000000001e-8 - 1),0,12)
+		
+	def test_cubic(self):
+		"""Cubics give all three roots at every point."""
+		
+		# x^3 - 6x^2 + 11x - 6 and x^3 - 8
+		r = Eq._cubics(*[np.array(i,dtype=complex) for i in ([1,1],[-6,0],[11,0],[-6,-8])])
+		self.assertRoots(r[0],[1,2,3])
+		self.assertRoots(r[1],[2,-1 + 3 ** 0.5 * 1j,-1 - 3 ** 0.5 * 1j])
+		
+	def test_results(self):
+		"""The Result forms delegate to the kernels."""
+		
+		# same equations
+		self.assertRoots([complex(i) for i in Eq._quadratic(Re(1),Re(-3),Re(2))],[1,2])
+		self.assertRoots([complex(i) for i in Eq._cubic(Re(1),Re(-6),Re(11),Re(-6))],[1,2,3])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,48 @@
+# test_kronecker.py
+# tests of multiplying dense lines by kronecker substitution
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Li = aq.Li
+
+
+# KroneckerTest
+class KroneckerTest(unittest.TestCase):
+	"""Tests of Line._kronecker against the sparse path."""
+	
+	def sparse(self,a,b):
+		"""Multiply two lines without kronecker substitution."""
+		
+		# raise threshold beyond reach
+		t = Li.threshold
+		Li.threshold = float('inf')
+		try:
+			c = a.multiply(b)
+		finally:
+			Li.threshold = t
+			
+		return c
+		
+	def test_dense(self):
+		"""Dense products agree exactly with the sparse path."""
+		
+		# dense lines in two variables, with fractions, imaginary and negative powers
+		a = Li(' + '.join(['%d/%di x%d y%d' % (i + 1,i % 5 + 2,i % 11 - 3,i // 11) for i in range(40)]))
+		b = Li(' + '.join(['-%d/%d x%d y%d' % (2 * i + 3,i % 7 + 1,i % 9,i // 9 - 2) for i in range(40)]))
+		self.assertGreaterEqual(len(a) * len(b),Li.threshold)
+		self.assertEqual(Li(Li._kronecker(list(a),list(b))),self.sparse(a,b))
+		self.assertEqual(a.multiply(b),self.sparse(a,b))
+		
+	def test_sparse(self):
+		"""Lines too sparse to pack are left to the sparse path."""
+		
+		# far apart exponents
+		a = list(Li('x1000 + 1'))
+		self.assertIsNone(Li._kronecker(a,a))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,51 @@
+# test_many.py
+# tests of substituting for several variables at once
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Li = aq.Li
+Ex = aq.Ex
+Gr = aq.Group
+
+
+# ManyTest
+class ManyTest(unittest.TestCase):
+	"""Tests of substitute_many for lines, expressions, and groups."""
+	
+	def test_simultaneous(self):
+		"""Substitutions are made at once, so one does not feed another."""
+		
+		# x y + x with x = y + 1 and y = x
+		t,b = Li('x y + x').substitute_many({'x': 'y + 1','y': 'x'})
+		self.assertEqual(t,Li('x y + x + y + 1'))
+		self.assertEqual(b,Li(1))
+		
+	def test_denominator(self):
+		"""Quotients are expanded over a single common denominator."""
+		
+		# x w with x = y + 1 and w = (z - 1) / z
+		t,b = Li('x w').substitute_many({'x': 'y + 1','w': [Li('z - 1'),Li('z')]})
+		self.assertEqual(t,Li('y z - y + z - 1'))
+		self.assertEqual(b,Li('z'))
+		
+	def test_expression(self):
+		"""Expressions and groups swap variables."""
+		
+		# (x + y) / x with x and y swapped
+		self.assertEqual(Ex('x + y','x').substitute_many({'x': 'y','y': 'x'}),Ex('x + y','y'))
+		g = Gr(Ex('x'),Ex('y')).substitute_many({'x': 'y','y': 'x'})
+		self.assertEqual(g[0],Ex('y'))
+		self.assertEqual(g[1],Ex('x'))
+		
+	def test_single(self):
+		"""One substitution agrees with substitute."""
+		
+		# x^2 + x with x = y + 1
+		self.assertEqual(Li('x2 + x').substitute_many({'x': 'y + 1'}),Li('x2 + x').substitute('y + 1','x'))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,49 @@
+# test_multiply.py
+# tests of multiplying lines
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Te = aq.Term
+Li = aq.Li
+Ex = aq.Ex
+
+
+# MultiplyTest
+class MultiplyTest(unittest.TestCase):
+	"""Tests of Line.multiply."""
+	
+	def test_product(self):
+		"""Products collect like terms and keep their order."""
+		
+		# (x + y)(x - y)
+		self.assertEqual(Li('x + y').multiply(Li('x - y')),Li('x2 - y2'))
+		
+		# (x + i)(x - i)
+		self.assertEqual(Li('x + i').multiply(Li('x - i')),Li('x2 + 1'))
+		
+		# fractions
+		self.assertEqual(Li('1/2x + 1/3').multiply(Li('2x - 3')),Li('x2 - 5/6x - 1'))
+		
+	def test_value(self):
+		"""A product evaluates to the product of the values."""
+		
+		# two lines in three variables
+		a = Li('x2 y + 3/4 i z - 2x + 5')
+		b = Li('y3 - x z + 2i - 1/3 y')
+		c = a.multiply(b)
+		d = {'x': 0.7,'y': -1.3 + 0.2j,'z': 2.1}
+		u = Ex(a).evaluate(**d)[0] * Ex(b).evaluate(**d)[0]
+		self.assertAlmostEqual(abs(Ex(c).evaluate(**d)[0] - u),0)
+		
+	def test_zero(self):
+		"""Multiplying by zero gives an empty line."""
+		
+		# empty line
+		self.assertEqual(len(Li('x + 1').multiply(Li(0))),0)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,44 @@
+# test_order.py
+# tests of the order of terms in lines
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Te = aq.Term
+Li = aq.Li
+
+
+# OrderTest
+class OrderTest(unittest.TestCase):
+	"""Tests of the graded reverse lexicographic order of lines, and of merging on add."""
+	
+	def test_order(self):
+		"""Terms are kept by total degree, then in reverse lexicographic order."""
+		
+		# x + y^2 + x^2 + 1 + x y
+		l = Li('x + y2 + x2 + 1 + x y')
+		self.assertEqual(list(l),[Te('x2'),Te('x y'),Te('y2'),Te('x'),Te('1')])
+		
+	def test_add(self):
+		"""Adding merges two ordered lines."""
+		
+		# (x + y) + (2 - x)
+		l = Li('x + y').add(Li('2 - x'))
+		self.assertEqual(list(l),[Te('y'),Te('2')])
+		
+		# result stays ordered
+		l = Li('x2 + 1').add(Li('x y + x'))
+		self.assertEqual(list(l),[Te('x2'),Te('x y'),Te('x'),Te('1')])
+		
+	def test_compare(self):
+		"""Lines written in any order compare equal."""
+		
+		# x + y and y + x
+		self.assertEqual(Li('x + y'),Li('y + x'))
+		self.assertNotEqual(Li('x + y'),Li('x - y'))
+
+
+if __name__ == '__main__':
+	unittest.main()
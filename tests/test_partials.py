@@ -0,0 +1,50 @@
+# test_partials.py
+# tests of applying functions to their partial derivatives
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Ex = aq.Ex
+Gr = aq.Group
+
+
+# PartialTest
+class PartialTest(unittest.TestCase):
+	"""Tests of Expression._build, Expression.apply, and Group.apply."""
+	
+	def test_build(self):
+		"""Mixed partials are the same in either order."""
+		
+		# partials of x^2 y^3
+		d = Ex._build('F',['Fxy','Fyx','Fx'],[],{'F': Ex('x2 y3')})
+		self.assertEqual(d['Fxy'],Ex('6x y2'))
+		self.assertEqual(d['Fyx'],Ex('6x y2'))
+		self.assertEqual(d['Fx'],Ex('2x y3'))
+		
+	def test_apply(self):
+		"""Applying a function replaces it and its partials."""
+		
+		# F = x^2 y^3
+		e = Ex('F + Fx + Fxy + Fyx').apply('F','x2 y3')
+		self.assertEqual(e,Ex('x2 y3 + 2x y3 + 12x y2'))
+		
+	def test_rule(self):
+		"""Derivative rules carry through chains of partials."""
+		
+		# F = e^u, with d(e^u)/dx = ux e^u
+		e = Ex('F + Fx + Fxx + Fxy').apply('F','eu','u',eux='ux eu')
+		self.assertEqual(e,Ex('eu + ux eu + uxx eu + ux2 eu + uxy eu + ux uy eu'))
+		
+	def test_group(self):
+		"""Groups apply to each expression."""
+		
+		# mixed partials cancel
+		g = Gr(Ex('Fx'),Ex('Fxy - Fyx')).apply('F','x2 y3')
+		self.assertEqual(g[0],Ex('2x y3'))
+		self.assertEqual(g[1],Ex(0))
+
+
+if __name__ == '__main__':
+	unittest.main()
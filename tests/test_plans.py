@@ -0,0 +1,65 @@
+# test_plans.py
+# tests of planning how keyword inputs are bound
+
+# import math
+import math
+
+# import unittest
+import unittest
+
+# import numpy
+import numpy as np
+
+# import alliquator
+import alliquator as aq
+Ex = aq.Ex
+
+
+# PlanTest
+class PlanTest(unittest.TestCase):
+	"""Tests of Expression._plan, _apply, and _sweep."""
+	
+	def setUp(self):
+		"""Make inputs of every kind."""
+		
+		# constant, functions of both variables, of one, and an expression
+		self.f = {'a': 2,'b': lambda x,y: x * y,'c': lambda x,y: math.sqrt(x * y),'d': lambda x: x + 1,'e': lambda x: math.sqrt(x),'g': Ex('x + y')}
+		
+	def test_plan(self):
+		"""Each input is planned by the first form that works."""
+		
+		# plan at a complex point, where math.sqrt needs real parts
+		w = Ex._plan(self.f,'x',4 + 0j,'y',1 + 0j)
+		k = {i: h for i,h,e in w}
+		self.assertEqual(k,{'a': 'constant','b': 'pair','c': 'real pair','d': 'single','e': 'real single','g': 'expression'})
+		
+		# apply plan at another point
+		d = Ex._apply(w,self.f,'x',9 + 0j,'y',1 + 0j)
+		self.assertEqual([d[i] for i in 'abcdeg'],[2,9,3,10,3,10])
+		
+	def test_sweep(self):
+		"""A plan binds whole arrays of points, calling functions point by point where they refuse arrays."""
+		
+		# sweep three points
+		o = np.array([1,4,9],dtype=complex)
+		w = Ex._plan(self.f,'x',o[0],'y',1 + 0j)
+		d,c = Ex._sweep(w,self.f,'x',o,list(o),'y',1 + 0j)
+		self.assertEqual(c['a'],2)
+		for i in 'bcdeg':
+			self.assertEqual(len(d[i]),3)
+		self.assertEqual(list(d['e']),[1,2,3])
+		
+	def test_sample(self):
+		"""Sampling with every kind of input agrees with evaluating point by point."""
+		
+		# sum of all inputs
+		e = Ex('a + b + c + d + e + g')
+		p = [1,4,9]
+		b = e.sample('x',p,'y',1,**self.f)
+		for i,j in zip(b,p):
+			u = Ex._reckon(self.f,'x',j,'y',1)
+			self.assertAlmostEqual(abs(i[0] - e.evaluate(**u)[0]),0)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,59 @@
+# test_power.py
+# tests of powers of lines
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Li = aq.Li
+
+
+# PowerTest
+class PowerTest(unittest.TestCase):
+	"""Tests of Line.power, by multinomial expansion and by repeated squaring."""
+	
+	def repeat(self,l,n):
+		"""Raise a line to a power by repeated multiplication."""
+		
+		# multiply n times
+		p = Li(1)
+		for i in range(n):
+			p = p.multiply(l)
+			
+		return p
+		
+	def test_binomial(self):
+		"""Binomials expand by their coefficients."""
+		
+		# (x + 1)^4
+		self.assertEqual(Li('x + 1').power(4),Li('x4 + 4x3 + 6x2 + 4x + 1'))
+		
+		# (x - i)^2
+		self.assertEqual(Li('x - i').power(2),Li('x2 - 2i x - 1'))
+		
+	def test_sparse(self):
+		"""Sparse lines agree with repeated multiplication."""
+		
+		# few terms in many variables
+		l = Li('1/2a b + c2 - 3d + 2i e')
+		self.assertEqual(l.power(5),self.repeat(l,5))
+		
+	def test_dense(self):
+		"""Dense lines agree with repeated multiplication."""
+		
+		# many terms in one variable
+		l = Li('x5 + 2x4 - x3 + 1/3x2 + x - 7')
+		self.assertEqual(l.power(6),self.repeat(l,6))
+		
+	def test_trivial(self):
+		"""Zeroth and first powers."""
+		
+		# one and itself
+		l = Li('x + y')
+		self.assertEqual(l.power(0),Li(1))
+		self.assertEqual(l.power(1),l)
+
+
+if __name__ == '__main__':
+	unittest.main()
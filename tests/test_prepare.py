@@ -0,0 +1,67 @@
+# test_prepare.py
+# tests of solvers prepared once for many points
+
+# import unittest
+import unittest
+
+# import numpy
+import numpy as np
+
+# import alliquator
+import alliquator as aq
+Ex = aq.Ex
+Eq = aq.Eq
+
+
+# PrepareTest
+class PrepareTest(unittest.TestCase):
+	"""Tests of Equation.prepare and the solvers it makes."""
+	
+	def test_quadratic(self):
+		"""A quadratic is solved at all points at once."""
+		
+		# a x^2 - 1 at a = 1, 4
+		h = Eq('a x2 - 1').prepare('x')
+		self.assertEqual(h.degree,2)
+		self.assertEqual(h.variables,['a'])
+		r = h(np.array([1,4]))
+		self.assertEqual(r.shape,(2,2))
+		for i,a in zip(r,[1,4]):
+			self.assertAlmostEqual(abs(sorted(i.real)[0] + a ** -0.5),0)
+			self.assertAlmostEqual(abs(sorted(i.real)[1] - a ** -0.5),0)
+			
+	def test_cubic(self):
+		"""Roots of a cubic agree with numpy at every point."""
+		
+		# x^3 - a x + 1
+		h = Eq('x3 - a x + 1').prepare('x')
+		a = np.array([-1.0,0.5,3.0])
+		r = h(a)
+		for i,j in zip(r,a):
+			for k in np.roots([1,0,-j,1]):
+				self.assertAlmostEqual(min(abs(i - k)),0)
+				
+	def test_poles(self):
+		"""Roots of the top where the bottom vanishes are left out as nan."""
+		
+		# x (x - 1)(x + 1) / (x - 1) has a pole at 1 when a = 1
+		h = Eq(Ex('x3 - a x','x - 1')).prepare('x')
+		r = h(np.array([1,4]))
+		self.assertEqual(int(np.isnan(r[0]).sum()),1)
+		self.assertEqual(int(np.isnan(r[1]).sum()),0)
+		
+		# x (x^2 - a) / (x^2 - a) keeps only 0
+		r = Eq(Ex('x3 - a x','x2 - a')).prepare('x')(4)
+		self.assertEqual(int(np.isnan(r).sum()),2)
+		self.assertAlmostEqual(abs(r[0][np.isfinite(r[0])][0]),0)
+		
+	def test_negative(self):
+		"""Negative powers of x cannot be prepared."""
+		
+		# x + x^-1
+		with self.assertRaises(ValueError):
+			Eq('x + x-1 - a').prepare('x')
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,75 @@
+# test_quadrature.py
+# tests of numerical integration
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Ex = aq.Ex
+Eq = aq.Eq
+Gr = aq.Group
+Ch = aq.Chain
+
+
+# QuadratureTest
+class QuadratureTest(unittest.TestCase):
+	"""Tests of Book.integrate and of adaptive integration through the _tolerance keyword."""
+	
+	def test_midpoints(self):
+		"""A drawn book integrates by the midpoint rule."""
+		
+		# x^2 from 0 to 1 in 64 steps, off by (1/64)^2 / 12
+		b = Ex('x2').draw('x',0,1,64,False)
+		r = b.integrate()
+		self.assertAlmostEqual(r[0].real,1 / 3 - 1 / 64 ** 2 / 12,12)
+		
+		# too few points
+		self.assertIsNone(b.slice(0,0).integrate())
+		
+	def test_steps(self):
+		"""Without a tolerance, the integral is taken over the drawn steps."""
+		
+		# x^2 y with y a function
+		r = Ex('x2 y').integrate('x',0,1,64,False,y=lambda x: 1)
+		self.assertAlmostEqual(r[0].real,1 / 3,4)
+		
+	def test_adaptive(self):
+		"""Given a tolerance, the integral is found adaptively within it."""
+		
+		# x^2 y with y a function
+		r = Ex('x2 y').integrate('x',0,1,_tolerance=1e-10,y=lambda x: 1)
+		self.assertAlmostEqual(r[0].real,1 / 3,10)
+		self.assertLessEqual(r.errors[0],1e-10)
+		
+		# reversed limits change the sign
+		r = Ex('x2 y').integrate('x',1,0,_tolerance=1e-10,y=lambda x: 1)
+		self.assertAlmostEqual(r[0].real,-1 / 3,10)
+		
+	def test_equation(self):
+		"""Each branch of an equation is integrated adaptively."""
+		
+		# y = +/- sqrt(x)
+		r = Eq('y2 - x').integrate('y','x',0,1,_tolerance=1e-10)
+		self.assertEqual(len(r),2)
+		for i in r:
+			self.assertAlmostEqual(abs(i.real),2 / 3,8)
+		for i in r.errors:
+			self.assertLessEqual(i,1e-10)
+			
+	def test_group(self):
+		"""Groups and chains integrate each expression."""
+		
+		# x^2 and x^3
+		r = Gr(Ex('x2'),Ex('x3')).integrate('x',0,1,_tolerance=1e-10)
+		self.assertAlmostEqual(r[0][0].real,1 / 3,10)
+		self.assertAlmostEqual(r[1][0].real,1 / 4,10)
+		
+		# a = x, b = a^2
+		r = Ch(Gr(Ex('a - x'),Ex('a2',1,'b'))).integrate('a','x',0,1,_tolerance=1e-10)
+		self.assertAlmostEqual(r[0][0].real,1 / 2,10)
+		self.assertAlmostEqual(r[1][0].real,1 / 3,10)
+
+
+if __name__ == '__main__':
+	unittest.main()
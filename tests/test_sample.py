@@ -0,0 +1,58 @@
+# test_sample.py
+# tests of sampling expressions over arrays of points
+
+# import unittest
+import unittest
+
+# import numpy
+import numpy as np
+
+# import alliquator
+import alliquator as aq
+Ex = aq.Ex
+Re = aq.Re
+
+
+# SampleTest
+class SampleTest(unittest.TestCase):
+	"""Tests of Expression.sample and the arrays kept by books."""
+	
+	def test_points(self):
+		"""Sampling agrees with evaluating at each point."""
+		
+		# x^2 + y with y constant
+		e = Ex('x2 + y')
+		p = [1,2.5,3j]
+		b = e.sample('x',p,y=2)
+		self.assertEqual(b.axis,'x')
+		self.assertEqual(b.values.shape,(3,1))
+		for i,j in zip(b,p):
+			self.assertAlmostEqual(abs(i[0] - e.evaluate(x=j,y=2)[0]),0)
+			self.assertEqual(i.inputs['x'],j)
+			
+	def test_second(self):
+		"""A second variable and constants are kept as common inputs."""
+		
+		# x^2 y + z
+		b = Ex('x2 y + z').sample('x',[1,2],'y',3,z=2)
+		self.assertEqual(b.inputs['y'],3)
+		self.assertEqual(b.inputs['z'],2)
+		self.assertEqual([i[0] for i in b],[5,14])
+		
+	def test_copy(self):
+		"""Copies leave out the arrays, and changing a copy leaves the original alone."""
+		
+		# copy a book
+		b = Ex('x2').sample('x',[1,2,3])
+		c = b.copy()
+		self.assertIsNone(c.values)
+		self.assertIsNone(c.points)
+		
+		# change the copy
+		c[0][0] = Re(99)
+		self.assertEqual(b[0][0],1)
+		self.assertEqual(b.values[0][0],1)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,59 @@
+# test_sculpt.py
+# tests of sculpting expressions over grids
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Ex = aq.Ex
+Re = aq.Re
+
+
+# SculptTest
+class SculptTest(unittest.TestCase):
+	"""Tests of Expression.sculpt and the arrays kept by shelves."""
+	
+	def test_real(self):
+		"""Two real variables are evaluated over the whole grid."""
+		
+		# x y + a over a 4 by 3 grid
+		f = {'a': 3}
+		e = Ex('x y + a')
+		s = e.sculpt('x','y',(0,0),(1,2),4,3,False,**f)
+		self.assertEqual(s.second,'y')
+		self.assertEqual(s.values.shape,(3,4))
+		self.assertEqual((len(s),len(s[0])),(3,4))
+		for b in s:
+			for p in b:
+				self.assertAlmostEqual(abs(p[0] - e.evaluate(x=p.inputs['x'],y=p.inputs['y'],a=3)[0]),0)
+				
+		# inputs left alone
+		self.assertEqual(f,{'a': 3})
+		
+	def test_complex(self):
+		"""One variable is evaluated over the complex plane."""
+		
+		# x^2 over a 3 by 3 grid
+		s = Ex('x2').sculpt('x',(-1,-1),(1,1),3,3,False)
+		self.assertEqual((len(s),len(s[0])),(3,3))
+		for b in s:
+			for p in b:
+				self.assertAlmostEqual(abs(p[0] - p.inputs['x'] ** 2),0)
+				
+	def test_copy(self):
+		"""Copies of shelves leave out the arrays, and changing a copy leaves the original alone."""
+		
+		# copy and change
+		s = Ex('x2').sculpt('x',(-1,-1),(1,1),3,3,False)
+		c = s.copy()
+		self.assertIsNone(c.values)
+		self.assertIsNone(c.points)
+		v = s[0][1][0]
+		c[0][1][0] = Re(99)
+		self.assertEqual(s[0][1][0],v)
+		self.assertEqual(s.values[0][1],v)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,106 @@
+# test_sketches.py
+# tests of lazily built expressions
+
+# import garbage collection
+import gc
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Ex = aq.Ex
+Sk = aq.Sk
+Gr = aq.Group
+Ch = aq.Chain
+
+
+# SketchTest
+class SketchTest(unittest.TestCase):
+	"""Tests of Sketch and Chain.sketch."""
+	
+	def test_consing(self):
+		"""The same operation on the same operands is made only once."""
+		
+		# same leaves, same sums and products either way round
+		a = Sk('x + 1')
+		b = Sk('y')
+		self.assertIs(Sk('x + 1'),a)
+		self.assertIs(a.add(b),b.add(a))
+		self.assertIs(a.multiply(b),b.multiply(a))
+		self.assertIs(a.power(3),a.power(3))
+		
+		# trivial operations
+		self.assertIs(a.add(0),a)
+		self.assertIs(a.multiply(1),a)
+		self.assertIs(a.multiply(0),Sk.zero)
+		
+	def test_forgetting(self):
+		"""Sketches no longer in use leave the table."""
+		
+		# make and drop a sketch
+		n = len(Sk.table)
+		a = Sk('q5 + 17').power(9)
+		self.assertGreater(len(Sk.table),n)
+		del a
+		gc.collect()
+		self.assertEqual(len(Sk.table),n)
+		
+	def test_variables(self):
+		"""Variables are kept from when each sketch is made."""
+		
+		# substitution replaces variable
+		a = Sk('x2 + y')
+		b = a.substitute('z + w','y')
+		self.assertEqual(a.variables,frozenset(['x','y']))
+		self.assertEqual(b.scan(),['w','x','z'])
+		
+		# substituting for an absent variable changes nothing
+		self.assertIs(b.substitute(5,'y'),b)
+		
+	def test_expand(self):
+		"""Expanding agrees with the same operations on Expressions."""
+		
+		# (x + 1)^3 (x - 1) / y, then y = x + 2
+		a = Sk('x + 1').power(3).multiply('x - 1').divide('y').substitute('x + 2','y')
+		b = Ex('x + 1').power(3).multiply(Ex('x - 1')).divide(Ex('y')).substitute(Ex('x + 2'),'y')
+		self.assertEqual(a.expand(),b)
+		
+		# powers of variables are substituted at once
+		c = Sk('x4 + x').substitute('y','x2')
+		self.assertEqual(c.expand(),Ex('x4 + x').substitute('y','x2'))
+		
+	def test_sample(self):
+		"""Sampling and deriving agree with the expanded expression."""
+		
+		# sketch with shared part
+		a = Sk('x + 2')
+		s = a.power(4).subtract(a.multiply('x')).divide(a)
+		e = s.expand()
+		p = [0.5,1.0,1.5j]
+		b = s.sample('x',p)
+		c = e.sample('x',p)
+		for i,j in zip(b,c):
+			self.assertAlmostEqual(abs(i[0] - j[0]),0)
+			
+		# derivative
+		d = s.derive('x')
+		for i in p:
+			self.assertAlmostEqual(abs(d.evaluate(x=i)[0] - e.derive('x').evaluate(x=i)[0]),0)
+			
+	def test_chain(self):
+		"""A chain is sketched with the expressions above substituted for their names."""
+		
+		# (a^2 x - 1) = 0, b = a + x, c = b^2
+		c = Ch(Gr(Ex('a2 x - 1'),Ex('a + x',1,'b'),Ex('b2',1,'c')))
+		s = c.sketch()
+		self.assertEqual(len(s),3)
+		self.assertEqual(s[2].scan(),['a','x'])
+		self.assertEqual(s[2].expand(),Ex('a2 + 2a x + x2'))
+		
+		# evaluate without expanding
+		self.assertAlmostEqual(abs(s[2].evaluate(a=1,x=2)[0] - 9),0)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,60 @@
+# test_substitute.py
+# tests of substituting into lines and expressions
+
+# import unittest
+import unittest
+
+# import alliquator
+import alliquator as aq
+Li = aq.Li
+Ex = aq.Ex
+
+
+# SubstituteTest
+class SubstituteTest(unittest.TestCase):
+	"""Tests of Line.substitute and Expression.substitute."""
+	
+	def test_line(self):
+		"""A line substitutes for a variable."""
+		
+		# x^2 + x with x = y + 1
+		t,b = Li('x2 + x').substitute('y + 1','x')
+		self.assertEqual(t,Li('y2 + 3y + 2'))
+		self.assertEqual(b,Li(1))
+		
+	def test_fraction(self):
+		"""A quotient of lines substitutes over a common denominator."""
+		
+		# x^2 + x with x = (z - 1) / z
+		t,b = Li('x2 + x').substitute([Li('z - 1'),Li('z')],'x')
+		self.assertEqual(t,Li('2z2 - 3z + 1'))
+		self.assertEqual(b,Li('z2'))
+		
+	def test_power(self):
+		"""Substituting for a power of a variable leaves the remainder."""
+		
+		# x^3 + x^2 with x^2 = y
+		t,b = Li('x3 + x2').substitute('y','x2')
+		self.assertEqual(t,Li('x y + y'))
+		
+	def test_shared(self):
+		"""Tables of powers are kept in a dictionary shared between calls."""
+		
+		# substitute twice with one table
+		c = {}
+		a = Li('x3 + 1').substitute('y + 1','x',c)
+		self.assertGreater(len(c),0)
+		b = Li('x2 - x').substitute('y + 1','x',c)
+		self.assertEqual(a[0],Li('y3 + 3y2 + 3y + 2'))
+		self.assertEqual(b[0],Li('y2 + y'))
+		
+	def test_expression(self):
+		"""Expressions substitute into top and bottom."""
+		
+		# (x^2 + 1) / x with x = y + 1
+		e = Ex('x2 + 1','x').substitute('y + 1','x')
+		self.assertEqual(e,Ex('y2 + 2y + 2','y + 1'))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,61 @@
+# test_terms.py
+# tests of terms
+
+# import unittest
+import unittest
+
+# import fractions
+from fractions import Fraction
+
+# import alliquator
+import alliquator as aq
+Te = aq.Term
+Li = aq.Li
+
+
+# TermTest
+class TermTest(unittest.TestCase):
+	"""Tests of the core of Term: its coefficient, unit, and monomial."""
+	
+	def test_core(self):
+		"""A term is parsed into a fractional coefficient, a power of i, and a sorted monomial."""
+		
+		# 3/4 x^2 y
+		t = Te('3/4x2 y')
+		self.assertEqual(t.coefficient,Fraction(3,4))
+		self.assertEqual(t.unit,0)
+		self.assertEqual(t.monomial,(('x',2),('y',1)))
+		
+		# imaginary and negative terms
+		self.assertEqual(Te('2i x').unit,1)
+		self.assertEqual(Te('-x').coefficient,-1)
+		
+	def test_hash(self):
+		"""Equal terms hash alike, whatever the order of their variables."""
+		
+		# same term written two ways
+		a = Te('3/4x2 y')
+		b = Te('3/4y x2')
+		self.assertEqual(a,b)
+		self.assertEqual(hash(a),hash(b))
+		self.assertEqual({a: 1}[b],1)
+		self.assertNotEqual(a,Te('3/4x y2'))
+		
+	def test_immutable(self):
+		"""Terms cannot be changed in place."""
+		
+		# try to set an exponent
+		t = Te('x2')
+		with self.assertRaises(TypeError):
+			t['x'] = 5
+		self.assertEqual(t.monomial,(('x',2),))
+		
+	def test_scan(self):
+		"""Lines find their variables from the monomials."""
+		
+		# variables
+		self.assertEqual(Li('x y + 2x y + z').scan(),['x','y','z'])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,50 @@
+# test_trace.py
+# tests of tracing roots along sample paths
+
+# import unittest
+import unittest
+
+# import numpy
+import numpy as np
+
+# import alliquator
+import alliquator as aq
+Eq = aq.Eq
+
+
+# TraceTest
+class TraceTest(unittest.TestCase):
+	"""Tests of Equation.trace and Equation._match."""
+	
+	def test_crossing(self):
+		"""Branches that cross stay on their lines."""
+		
+		# y^2 = x^2 from x = -1 to 1
+		p = list(np.linspace(-1,1,21))
+		b = Eq('y2 - x2').trace('y','x',p)
+		self.assertEqual(b.axis,'x')
+		for k in range(2):
+			s = np.sign(complex(b[0][k]).real * p[0])
+			for g,x in zip(b,p):
+				self.assertAlmostEqual(abs(complex(g[k]) - s * x),0)
+				
+	def test_cubic(self):
+		"""Every traced root solves the equation, and branches move smoothly."""
+		
+		# y^3 - x y - 1/5, crisped
+		p = list(np.linspace(-1,1,41))
+		b = Eq('y3 - x y - 1/5').trace('y','x',p,True)
+		self.assertEqual(b.values.shape,(41,3))
+		self.assertLess(b.residuals.max(),1e-12)
+		self.assertLess(abs(np.diff(b.values,axis=0)).max(),0.2)
+		
+	def test_match(self):
+		"""Roots are matched to the nearest predictions."""
+		
+		# shuffled roots
+		r = Eq._match(np.array([1,2,3],dtype=complex),np.array([2.9,1.1,2.2],dtype=complex))
+		self.assertEqual(list(r),[1.1,2.2,2.9])
+
+
+if __name__ == '__main__':
+	unittest.main()